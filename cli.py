@@ -10,14 +10,14 @@ from src.utils.logger import logger
 from src.utils.config import config
 
 
-async def dump_news(from_days_ago: int = 1):
+async def dump_news(from_days_ago: int = 1, full: bool = False):
     """Dump news from Telegram channel."""
     logger.info(f"Dumping news from {from_days_ago} days ago")
     
     dumper = TelegramDumper()
     from_date = datetime.now() - timedelta(days=from_days_ago)
     
-    success = await dumper.dump_news(from_date)
+    success = await dumper.dump_news(from_date, incremental=not full)
     if success:
         logger.info("News dump completed successfully")
     else:
@@ -69,15 +69,84 @@ async def show_news_stats():
     print(f"Total news items: {total_count}")
     
     # Show recent news items
-    all_news = dumper.get_all_news()
-    if all_news:
+    recent_news = dumper.get_recent_news(5)
+    if recent_news:
         print(f"\nMost recent news items:")
-        for i, item in enumerate(all_news[-5:], 1):  # Show last 5 items
+        for i, item in enumerate(recent_news, 1):  # Show last 5 items
             print(f"{i}. [{item.date.strftime('%Y-%m-%d %H:%M')}] {item.text[:100]}...")
     else:
         print("No news items found")
 
 
+async def archive_news(older_than_days: int = 7):
+    """Move closed news days to the compact archive format."""
+    logger.info(f"Archiving news days older than {older_than_days} days")
+    
+    dumper = TelegramDumper()
+    archived = dumper.archive_closed_days(older_than_days)
+    print(f"✅ Archived {archived} news days")
+
+
+async def redis_report(sample_size: int = 20, apply_ttl: bool = False):
+    """Report Redis key counts and memory usage per key family."""
+    from src.utils.redis_client import redis_client
+    from src.utils.redis_keys import key_usage_report
+    
+    rows = key_usage_report(redis_client, sample_size=sample_size, apply_ttl=apply_ttl)
+    if not rows:
+        print("ℹ️  No keys found in Redis")
+        return
+    
+    print(f"{'Pattern':<26} {'TTL':>9} {'Keys':>8} {'Est. memory':>13} {'No TTL':>7}")
+    for row in rows:
+        ttl = f"{row['ttl'] // 86400}d" if row["ttl"] else "-"
+        print(
+            f"{row['pattern']:<26} {ttl:>9} {row['keys']:>8} "
+            f"{row['estimated_bytes'] / 1024:>10.1f} KB {row['missing_ttl']:>7}"
+        )
+    
+    total = sum(row["estimated_bytes"] for row in rows)
+    print(f"\nEstimated total: {total / 1024:.1f} KB (MEMORY USAGE sampled on up to {sample_size} keys per pattern)")
+    
+    missing_ttl = sum(row["missing_ttl"] for row in rows)
+    if missing_ttl and apply_ttl:
+        print(f"✅ Applied the declared TTL to {missing_ttl} keys")
+    elif missing_ttl:
+        print(f"⚠️  {missing_ttl} keys lack their declared TTL; rerun with --apply-ttl to set it")
+
+
+def print_timings(rows: list):
+    """Print a timing table, slowest total first."""
+    if not rows:
+        print("ℹ️  No timings recorded")
+        return
+    
+    print(f"{'Name':<60} {'Calls':>7} {'Errors':>7} {'Total s':>10} {'Avg ms':>10} {'Max ms':>10}")
+    for row in rows:
+        print(
+            f"{row['name']:<60} {row['calls']:>7} {row['errors']:>7} {row['total']:>10.3f} "
+            f"{row['avg'] * 1000:>10.2f} {row['max'] * 1000:>10.2f}"
+        )
+
+
+async def show_timings(url: str = None, reset: bool = False):
+    """Show timings recorded by the running API server."""
+    import httpx
+    
+    url = (url or f"http://localhost:{config.PORT}").rstrip("/")
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(f"{url}/timings")
+            response.raise_for_status()
+            print_timings(response.json()["timings"])
+            
+            if reset:
+                (await client.delete(f"{url}/timings")).raise_for_status()
+                print("✅ Timings reset")
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to fetch timings from {url}: {e}")
+
+
 async def run_daily_job():
     """Run both daily jobs manually."""
     logger.info("Running both daily jobs manually")
@@ -108,9 +177,13 @@ async def clear_latest_summary():
     
     try:
         from src.utils.redis_client import redis_client
+        from src.utils.summary_cache import SummaryCache
+        
+        from src.utils.redis_keys import LATEST_SUMMARY
         
-        # Clear latest summary
-        result = redis_client.delete("latest_summary")
+        # Clear latest summary and drop it from running processes' summary caches
+        result = redis_client.delete(LATEST_SUMMARY.key())
+        redis_client.publish(SummaryCache.CHANNEL, SummaryCache.invalidation_message([LATEST_SUMMARY.key()]))
         
         if result:
             logger.info("✅ Latest summary cleared successfully")
@@ -133,16 +206,18 @@ async def clear_summary_by_date(target_date: str = None):
     try:
         from datetime import datetime
         from src.utils.redis_client import redis_client
+        from src.utils.redis_keys import summary_key
+        from src.utils.summary_cache import SummaryCache
         
         # Parse date
         date_obj = datetime.strptime(target_date, "%Y-%m-%d")
-        date_str = date_obj.strftime('%Y%m%d')
         
         logger.info(f"Clearing summary for {target_date}...")
         
-        # Clear summary for specific date
-        redis_key = f"summary:{date_str}"
+        # Clear summary for specific date and drop it from running processes' summary caches
+        redis_key = summary_key(date_obj)
         result = redis_client.delete(redis_key)
+        redis_client.publish(SummaryCache.CHANNEL, SummaryCache.invalidation_message([redis_key]))
         
         if result:
             logger.info(f"✅ Summary for {target_date} cleared successfully")
@@ -228,6 +303,8 @@ async def preview_summarization(days_ago: int = 1):
                 print(f"📊 News count: {data['news_count']}")
                 print(f"📝 Text count: {data['text_count']}")
                 print(f"📏 Total text length: {data['total_text_length']}")
+                print(f"🧩 Mode: {data['mode']} ({data['chunk_count']} chunks, {data['included_count']} texts)")
+                print(f"🔢 Prompt tokens: {data['prompt_tokens']}")
                 print(f"✂️  Truncated: {'Yes' if data['truncated'] else 'No'}")
                 
                 print("\n📰 Sample News:")
@@ -264,38 +341,37 @@ async def clear_news_data():
     
     try:
         import os
+        import shutil
         from src.utils.config import config
         from src.utils.redis_client import redis_client
         
-        # Clear the news file
-        news_file = os.path.join(config.DATA_DIR, "all_news.json")
-        if os.path.exists(news_file):
+        # Clear the news store
+        store_dir = os.path.join(config.DATA_DIR, "news")
+        if os.path.exists(store_dir):
             # Create backup
-            backup_file = news_file + ".backup"
-            os.rename(news_file, backup_file)
-            logger.info(f"Backed up news file to {backup_file}")
+            backup_dir = store_dir + ".backup"
+            if os.path.exists(backup_dir):
+                shutil.rmtree(backup_dir)
+            os.rename(store_dir, backup_dir)
+            logger.info(f"Backed up news store to {backup_dir}")
         
-        # Recreate empty news file
+        # Recreate empty news store
         from src.dumper.telegram_dumper import TelegramDumper
-        dumper = TelegramDumper()
-        dumper._initialize_news_file()
+        TelegramDumper()
         
         # Clear Redis data
         logger.info("Clearing Redis cache...")
+        from src.utils import redis_keys
         redis_keys_to_clear = [
-            "all_news",                    # Main news data
-            "latest_news_timestamp",       # Latest news timestamp
-            "latest_summary",              # Latest summary
+            redis_keys.LEGACY_ALL_NEWS.key(),        # Legacy news blob
+            redis_keys.LATEST_NEWS_TIMESTAMP.key(),  # Latest news timestamp
+            redis_keys.LATEST_SUMMARY.key(),         # Latest summary
+            redis_keys.STATS.key(),                  # Stats snapshot, rebuilt on next read
         ]
         
-        # Clear summary keys (format: summary:YYYYMMDD)
-        # We'll get all keys matching the pattern and delete them
-        try:
-            # Get all keys matching summary pattern
-            all_keys = redis_client.redis_client.keys("summary:*")
-            redis_keys_to_clear.extend(all_keys)
-        except Exception as e:
-            logger.warning(f"Could not get summary keys from Redis: {e}")
+        # Clear dated summary keys and per-day news hashes, found with SCAN
+        redis_keys_to_clear.extend(redis_client.scan_keys(redis_keys.SUMMARY.glob))
+        redis_keys_to_clear.extend(redis_client.scan_keys(redis_keys.NEWS_DAY.glob))
         
         # Delete all identified keys
         cleared_count = 0
@@ -306,9 +382,13 @@ async def clear_news_data():
         
         logger.info(f"Cleared {cleared_count} keys from Redis")
         
+        # Drop cleared summaries from running processes' summary caches
+        from src.utils.summary_cache import SummaryCache
+        redis_client.publish(SummaryCache.CHANNEL, SummaryCache.invalidation_message())
+        
         logger.info("✅ All news data cleared successfully")
         print("✅ All news data cleared successfully")
-        print("ℹ️  News file backed up before clearing")
+        print("ℹ️  News store backed up before clearing")
         print(f"ℹ️  Cleared {cleared_count} keys from Redis cache")
         
     except Exception as e:
@@ -316,8 +396,8 @@ async def clear_news_data():
         print(f"❌ Failed to clear news data: {e}")
 
 
-async def generate_fresh_summary(days_ago: int = 1):
-    """Generate fresh summary without caching."""
+async def generate_fresh_summary(days_ago: int = 1, refresh: bool = False):
+    """Generate fresh summary without caching; ``refresh`` also skips cached LLM replies."""
     logger.info(f"Generating fresh summary for {days_ago} days ago")
     
     try:
@@ -328,7 +408,7 @@ async def generate_fresh_summary(days_ago: int = 1):
         host = "localhost" if config.HOST == "0.0.0.0" else config.HOST
         response = requests.post(
             f"http://{host}:{config.PORT}/news/generate-summary",
-            params={"days_ago": days_ago},
+            params={"days_ago": days_ago, "refresh": refresh},
             timeout=60
         )
         
@@ -390,7 +470,8 @@ async def test_bot():
         
         # Get subscriber count
         from src.utils.redis_client import redis_client
-        subscribers = redis_client.get_set_members("subscribers")
+        from src.utils.redis_keys import SUBSCRIBERS
+        subscribers = redis_client.get_set_members(SUBSCRIBERS.key())
         logger.info(f"Current subscribers: {len(subscribers)}")
         
         # Wait a bit for testing
@@ -443,6 +524,12 @@ def main():
     parser = argparse.ArgumentParser(description="MarketTwits Summarizer CLI")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the timing table of this run after the command finishes"
+    )
+    
     # Dump news command
     dump_parser = subparsers.add_parser("dump", help="Dump news from Telegram")
     dump_parser.add_argument(
@@ -451,6 +538,11 @@ def main():
         default=1, 
         help="Number of days ago to start dumping from"
     )
+    dump_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the stored watermark and fetch from --days-ago"
+    )
     
     # Create summary command
     summary_parser = subparsers.add_parser("summary", help="Create summary")
@@ -468,6 +560,42 @@ def main():
     # Show news stats command
     subparsers.add_parser("stats", help="Show news statistics")
     
+    # Archive news command
+    archive_parser = subparsers.add_parser("archive-news", help="Move closed news days to the compact archive")
+    archive_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=7,
+        help="Archive days older than this many days (default: 7)"
+    )
+    
+    # Redis memory report command
+    redis_report_parser = subparsers.add_parser("redis-report", help="Show Redis key counts and memory usage")
+    redis_report_parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=20,
+        help="Keys per pattern to sample with MEMORY USAGE (default: 20)"
+    )
+    redis_report_parser.add_argument(
+        "--apply-ttl",
+        action="store_true",
+        help="Set the declared TTL on keys that have none"
+    )
+    
+    # Timings command
+    timings_parser = subparsers.add_parser("timings", help="Show timings recorded by the running server and dumper runs")
+    timings_parser.add_argument(
+        "--url",
+        type=str,
+        help="Base URL of the API server (default: http://localhost:PORT)"
+    )
+    timings_parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Reset the server's timings after printing them"
+    )
+    
     # Test bot command
     subparsers.add_parser("test-bot", help="Test Telegram bot functionality")
     
@@ -521,11 +649,16 @@ def main():
         default=1,
         help="Number of days ago to generate summary for (default: 1)"
     )
+    generate_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ask the model again instead of reusing cached replies for unchanged news"
+    )
     
     args = parser.parse_args()
     
     if args.command == "dump":
-        asyncio.run(dump_news(args.days_ago))
+        asyncio.run(dump_news(args.days_ago, args.full))
     elif args.command == "summary":
         asyncio.run(create_summary(args.date))
     elif args.command == "daily-job":
@@ -536,6 +669,12 @@ def main():
         asyncio.run(run_push_job())
     elif args.command == "stats":
         asyncio.run(show_news_stats())
+    elif args.command == "archive-news":
+        asyncio.run(archive_news(args.older_than_days))
+    elif args.command == "redis-report":
+        asyncio.run(redis_report(args.sample_size, args.apply_ttl))
+    elif args.command == "timings":
+        asyncio.run(show_timings(args.url, args.reset))
     elif args.command == "test-bot":
         asyncio.run(test_bot())
     elif args.command == "send-test":
@@ -551,9 +690,13 @@ def main():
     elif args.command == "clear-news":
         asyncio.run(clear_news_data())
     elif args.command == "generate":
-        asyncio.run(generate_fresh_summary(args.days_ago))
+        asyncio.run(generate_fresh_summary(args.days_ago, args.refresh))
     else:
         parser.print_help()
+    
+    if args.profile and args.command != "timings":
+        from src.utils.timing import timings
+        print_timings(timings.snapshot())
 
 
 if __name__ == "__main__":
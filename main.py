@@ -10,6 +10,8 @@ from fastapi import FastAPI
 
 from src.utils.config import config
 from src.utils.logger import logger
+from src.utils.redis_client import async_redis_client, redis_client
+from src.utils.summary_cache import summary_cache
 from src.telegram_server.api import app
 from src.scheduler.daily_job import scheduler
 from src.telegram_bot.bot import bot
@@ -26,6 +28,10 @@ async def lifespan(app: FastAPI):
         config.validate()
         logger.info("Configuration validated successfully")
         
+        # Connect to Redis up front so a missing server fails startup
+        redis_client.connect()
+        await async_redis_client.connect()
+        
         # Start scheduler
         scheduler.start_scheduler()
         logger.info("Scheduler started successfully")
@@ -39,6 +45,9 @@ async def lifespan(app: FastAPI):
         await bot.start_bot()
         logger.info("Telegram bot started successfully")
         
+        # Keep the summary cache in sync with summaries written by other processes
+        cache_listener = asyncio.create_task(summary_cache.listen())
+        
         yield
         
     except Exception as e:
@@ -47,8 +56,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down MarketTwits Summarizer application")
+    cache_listener.cancel()
     await bot.stop_bot()
     scheduler.stop_scheduler()
+    await async_redis_client.close()
     
     # Close dumper connection
     # from src.dumper.telegram_dumper import TelegramDumper
@@ -56,6 +67,8 @@ async def lifespan(app: FastAPI):
     # # await dumper.close()
     
     logger.info("Application shutdown complete")
+    # Flush messages still queued for the background log writer
+    await logger.complete()
 
 
 # Set the lifespan
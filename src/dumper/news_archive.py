@@ -0,0 +1,147 @@
+"""Compact columnar archive format for closed news days."""
+
+import mmap
+import struct
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from ..utils.atomic_io import atomic_write
+
+# Layout of a day archive file:
+#   header   magic, version, item count, raw and compressed text blob sizes
+#   columns  message_id (int64), date as UTC epoch microseconds (int64),
+#            UTC offset in minutes (int16, NAIVE_OFFSET for naive dates),
+#            views and forwards (int64, MISSING for None), text end offsets (uint32)
+#   text     zlib-compressed UTF-8 texts, concatenated
+MAGIC = b"MTNA"
+VERSION = 1
+HEADER = struct.Struct("<4sH2xIII")
+MISSING = -1
+NAIVE_OFFSET = -32768
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class DayArchive:
+    """Reader and writer for a single archived news day.
+
+    Records are the same dictionaries the segment store yields, so archived
+    and live days can be read interchangeably. Files are memory-mapped, so
+    reading a slice of a day only touches that slice's columns and the
+    prefix of the text blob it needs, and worker processes share the page
+    cache instead of each holding a decoded copy.
+    """
+
+    COLUMNS = (("message_id", 'q'), ("date", 'q'), ("views", 'q'),
+               ("forwards", 'q'), ("text_end", 'I'), ("offset", 'h'))
+
+    def __init__(self, path: str):
+        """Memory-map an archive file and read its header."""
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count, self._text_size, self._compressed_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported news archive {path}")
+
+        # Byte position of every column, followed by the compressed text blob
+        self._positions = {}
+        position = HEADER.size
+        for name, typecode in self.COLUMNS:
+            self._positions[name] = position
+            position += array(typecode).itemsize * self.count
+        self._text_position = position
+
+    def close(self):
+        """Release the memory map."""
+        self._mmap.close()
+
+    def __enter__(self) -> "DayArchive":
+        """Use the archive as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Release the memory map when leaving the context."""
+        self.close()
+
+    @staticmethod
+    def _pack_date(value: str):
+        """Split an ISO date string into UTC epoch microseconds and offset minutes."""
+        date = datetime.fromisoformat(value)
+        if date.tzinfo is None:
+            return (date.replace(tzinfo=timezone.utc) - EPOCH) // timedelta(microseconds=1), NAIVE_OFFSET
+        offset = date.utcoffset() // timedelta(minutes=1)
+        return (date - EPOCH) // timedelta(microseconds=1), offset
+
+    @staticmethod
+    def _unpack_date(micros: int, offset: int) -> str:
+        """Rebuild the stored date string from its packed columns."""
+        date = EPOCH + timedelta(microseconds=micros)
+        if offset == NAIVE_OFFSET:
+            return str(date.replace(tzinfo=None))
+        return str(date.astimezone(timezone(timedelta(minutes=offset))))
+
+    @classmethod
+    def write(cls, path: str, records: List[dict]):
+        """Write records to an archive file, atomically replacing any previous version."""
+        message_ids, dates, offsets = array('q'), array('q'), array('h')
+        views, forwards, text_ends = array('q'), array('q'), array('I')
+        texts = []
+        text_size = 0
+
+        for record in records:
+            micros, offset = cls._pack_date(record["date"])
+            encoded = record["text"].encode('utf-8')
+            text_size += len(encoded)
+
+            message_ids.append(record["message_id"])
+            dates.append(micros)
+            offsets.append(offset)
+            views.append(MISSING if record.get("views") is None else record["views"])
+            forwards.append(MISSING if record.get("forwards") is None else record["forwards"])
+            text_ends.append(text_size)
+            texts.append(encoded)
+
+        compressed = zlib.compress(b"".join(texts), 9)
+        parts = [HEADER.pack(MAGIC, VERSION, len(records), text_size, len(compressed))]
+        parts.extend(column.tobytes() for column in (message_ids, dates, views, forwards, text_ends, offsets))
+        parts.append(compressed)
+        atomic_write(path, b"".join(parts))
+
+    def _column(self, name: str, typecode: str, start: int, stop: int) -> array:
+        """Read rows ``start:stop`` of one column."""
+        column = array(typecode)
+        position = self._positions[name]
+        column.frombytes(self._mmap[position + column.itemsize * start:position + column.itemsize * stop])
+        return column
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> List[dict]:
+        """Decode records ``start:stop`` of the day."""
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return []
+
+        columns = {name: self._column(name, typecode, start, stop) for name, typecode in self.COLUMNS}
+        text_start = self._column("text_end", 'I', start - 1, start)[0] if start else 0
+
+        # Inflate only the prefix of the text blob that covers the requested rows
+        with memoryview(self._mmap) as view:
+            compressed = view[self._text_position:self._text_position + self._compressed_size]
+            text = zlib.decompressobj().decompress(compressed, columns["text_end"][-1])
+            compressed.release()
+
+        records = []
+        for i in range(stop - start):
+            text_end = columns["text_end"][i]
+            records.append({
+                "message_id": columns["message_id"][i],
+                "text": text[text_start:text_end].decode('utf-8'),
+                "date": self._unpack_date(columns["date"][i], columns["offset"][i]),
+                "views": None if columns["views"][i] == MISSING else columns["views"][i],
+                "forwards": None if columns["forwards"][i] == MISSING else columns["forwards"][i]
+            })
+            text_start = text_end
+        return records
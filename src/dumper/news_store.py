@@ -0,0 +1,539 @@
+"""Append-only, day-segmented storage for dumped news items."""
+
+import fcntl
+import json
+import os
+from array import array
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from ..models.schemas import NewsItem
+from ..utils.atomic_io import append_synced, atomic_write
+from ..utils.logger import logger
+from .news_archive import DayArchive
+
+
+class NewsRecord(NamedTuple):
+    """Lightweight, unvalidated view of a stored news item."""
+    message_id: int
+    date: datetime
+    views: Optional[int]
+    forwards: Optional[int]
+    text: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NewsRecord":
+        """Build a record from a stored item dictionary."""
+        return cls(
+            data["message_id"],
+            datetime.fromisoformat(data["date"]),
+            data.get("views"),
+            data.get("forwards"),
+            data["text"]
+        )
+
+
+class MessageIdIndex:
+    """Persistent membership index of stored Telegram message ids.
+
+    Ids are appended to a compact binary file (8 bytes per id) and kept in
+    memory as a sorted array. Telegram ids grow monotonically, so new ids are
+    almost always appended at the end and lookups are a binary search.
+    """
+
+    def __init__(self, path: str):
+        """Load the index from the given file."""
+        self.path = path
+        self._ids = array('q')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self._ids.frombytes(f.read())
+            if any(a > b for a, b in zip(self._ids, self._ids[1:])):
+                self._ids = array('q', sorted(self._ids))
+
+    def __contains__(self, message_id: int) -> bool:
+        """Check whether a message id is already stored."""
+        position = bisect_left(self._ids, message_id)
+        return position < len(self._ids) and self._ids[position] == message_id
+
+    def __len__(self) -> int:
+        """Return the number of stored ids."""
+        return len(self._ids)
+
+    @property
+    def max_id(self) -> Optional[int]:
+        """Return the highest stored message id."""
+        return self._ids[-1] if self._ids else None
+
+    def exists(self) -> bool:
+        """Check whether the index file has been written."""
+        return os.path.exists(self.path)
+
+    def add_many(self, message_ids: List[int]):
+        """Persist new message ids and add them to the in-memory index."""
+        new_ids = array('q', message_ids)
+        append_synced(self.path, new_ids.tobytes())
+        for message_id in new_ids:
+            if not self._ids or message_id > self._ids[-1]:
+                self._ids.append(message_id)
+            else:
+                insort(self._ids, message_id)
+
+
+class NewsStore:
+    """Stores news items as per-day JSONL segments described by a small manifest.
+
+    Each day (as seen in the item's own timezone) gets its own segment file
+    under ``segments/`` plus an append-only ``.idx`` file holding the byte
+    range of every record. A dump only appends to the segments it touches and
+    rewrites the manifest, so the cost of a save scales with the batch, and a
+    single-day lookup reads only that day's records. Closed days can be moved
+    to the compact ``archive/`` format and are read back transparently.
+
+    Every batch is first written to a ``pending.wal`` log, and the manifest is
+    replaced atomically once the batch is on disk, so a crash mid-dump is
+    replayed on the next start instead of losing or corrupting history.
+    Writes hold an exclusive lock on ``store.lock``; the log is only replayed
+    by a process holding that lock, so a batch another process is still
+    writing is never mistaken for an interrupted one.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, root_dir: str):
+        """Initialize the store rooted at the given directory."""
+        self.root_dir = root_dir
+        self.segments_dir = os.path.join(root_dir, "segments")
+        self.archive_dir = os.path.join(root_dir, "archive")
+        self.manifest_file = os.path.join(root_dir, "manifest.json")
+        self.pending_file = os.path.join(root_dir, "pending.wal")
+        self.lock_file = os.path.join(root_dir, "store.lock")
+        self._lock_depth = 0
+        os.makedirs(self.segments_dir, exist_ok=True)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self.message_ids = MessageIdIndex(os.path.join(root_dir, "message_ids.bin"))
+        if os.path.exists(self.pending_file):
+            # Replay only if no live writer holds the lock; otherwise the batch is in progress
+            with self._write_lock(blocking=False) as locked:
+                if not locked:
+                    logger.info("News store is being written by another process, not replaying its batch")
+        if not self.message_ids.exists() and self.count():
+            self._rebuild_message_ids()
+
+    @contextmanager
+    def _write_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """Hold the store's exclusive write lock, reentrantly, and catch up with disk.
+
+        Another process may have written since this store was opened, so the
+        manifest and id index are reloaded, and a batch left behind by a
+        crashed writer is replayed. Yields False if ``blocking`` is off and
+        another process holds the lock.
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield True
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with open(self.lock_file, 'a+b') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+
+            self._lock_depth = 1
+            try:
+                self.reload_manifest()
+                self.message_ids = MessageIdIndex(self.message_ids.path)
+                if os.path.exists(self.pending_file):
+                    self._replay_pending_batch()
+                yield True
+            finally:
+                self._lock_depth = 0
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def day_key(value) -> str:
+        """Return the partition key (YYYY-MM-DD) for a date or datetime."""
+        return value.strftime('%Y-%m-%d')
+
+    def _empty_manifest(self) -> dict:
+        """Return the manifest of an empty store."""
+        return {
+            "version": self.MANIFEST_VERSION,
+            "days": {},
+            "last_updated": None,
+            "total_count": 0,
+            "watermark": None
+        }
+
+    def _load_manifest(self) -> dict:
+        """Load the manifest from disk, or start a new one."""
+        if not os.path.exists(self.manifest_file):
+            return self._empty_manifest()
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load news manifest: {e}")
+            return self._empty_manifest()
+
+    def reload_manifest(self):
+        """Pick up counts written to disk by other processes since the store was opened."""
+        self.manifest = self._load_manifest()
+
+    def _save_manifest(self):
+        """Atomically write the manifest to disk."""
+        atomic_write(self.manifest_file, json.dumps(self.manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def _rebuild_message_ids(self):
+        """Build the message id index from the stored segments."""
+        self.message_ids.add_many([record["message_id"] for record in self.iter_records()])
+        logger.info(f"Rebuilt message id index with {len(self.message_ids)} ids")
+
+    def _segment_path(self, day: str) -> str:
+        """Return the segment file path for a day."""
+        return os.path.join(self.segments_dir, f"{day}.jsonl")
+
+    def _index_path(self, day: str) -> str:
+        """Return the offset index file path for a day."""
+        return os.path.join(self.segments_dir, f"{day}.idx")
+
+    def _load_index(self, day: str) -> array:
+        """Load a day's offset index as flat (start, end) byte pairs.
+
+        Indexes missing for segments written before the index existed are
+        rebuilt from the segment once and persisted.
+        """
+        offsets = array('Q')
+        index_path = self._index_path(day)
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                offsets.frombytes(f.read())
+            return offsets
+
+        segment_path = self._segment_path(day)
+        if not os.path.exists(segment_path):
+            return offsets
+
+        position = 0
+        with open(segment_path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    offsets.extend((position, position + len(line)))
+                position += len(line)
+
+        atomic_write(index_path, offsets.tobytes())
+        logger.info(f"Rebuilt offset index for news segment {day}")
+        return offsets
+
+    def _read_segment(self, day: str, start: int = 0, stop: Optional[int] = None) -> Iterator[dict]:
+        """Yield raw item dictionaries stored in a day's segment.
+
+        Only the byte range covering records ``start:stop`` is read.
+        """
+        offsets = self._load_index(day)
+        count = len(offsets) // 2
+        stop = count if stop is None else min(stop, count)
+        if start >= stop:
+            return
+
+        first = offsets[start * 2]
+        with open(self._segment_path(day), 'rb') as f:
+            f.seek(first)
+            chunk = f.read(offsets[stop * 2 - 1] - first)
+
+        for i in range(start, stop):
+            record = chunk[offsets[i * 2] - first:offsets[i * 2 + 1] - first]
+            try:
+                yield json.loads(record)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping corrupt record in segment {day}: {e}")
+
+    def _archive_path(self, day: str) -> str:
+        """Return the archive file path for a day."""
+        return os.path.join(self.archive_dir, f"{day}.mtna")
+
+    def is_archived(self, day: str) -> bool:
+        """Check whether a day has been moved to the compact archive format."""
+        return self.manifest["days"].get(day, {}).get("archived", False)
+
+    def _read_records(self, day: str, start: int = 0, stop: Optional[int] = None) -> Iterator[dict]:
+        """Yield records ``start:stop`` of a day from its archive or segment."""
+        if self.is_archived(day):
+            with DayArchive(self._archive_path(day)) as archive:
+                records = archive.read(start, stop)
+            yield from records
+        else:
+            yield from self._read_segment(day, start, stop)
+
+    @staticmethod
+    def _serialize(item: NewsItem) -> bytes:
+        """Serialize a news item as a single JSONL line."""
+        return (json.dumps(item.model_dump(), default=str, ensure_ascii=False) + "\n").encode('utf-8')
+
+    def _write_pending_batch(
+        self,
+        items: List[NewsItem],
+        by_day: Dict[str, List[NewsItem]],
+        last_updated: Optional[datetime]
+    ):
+        """Durably record a batch and the state it starts from before writing it.
+
+        If the process dies mid-append, ``_replay_pending_batch`` truncates the
+        touched files back to these sizes, restores the manifest counts and
+        applies the batch again.
+        """
+        checkpoint = {
+            "message_ids": self._file_size(self.message_ids.path),
+            "segments": {},
+            "day_counts": {},
+            "total_count": self.manifest["total_count"],
+            "watermark": self.manifest["watermark"]
+        }
+        for day in by_day:
+            checkpoint["segments"][day] = [
+                self._file_size(self._segment_path(day)),
+                self._file_size(self._index_path(day))
+            ]
+            day_info = self.manifest["days"].get(day)
+            checkpoint["day_counts"][day] = day_info["count"] if day_info else None
+
+        pending = {
+            "checkpoint": checkpoint,
+            "last_updated": last_updated.isoformat() if last_updated is not None else None,
+            "items": [item.model_dump() for item in items]
+        }
+        atomic_write(self.pending_file, json.dumps(pending, default=str, ensure_ascii=False).encode('utf-8'))
+
+    def _replay_pending_batch(self):
+        """Roll back and re-apply a batch whose append was interrupted."""
+        try:
+            with open(self.pending_file, 'r', encoding='utf-8') as f:
+                pending = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # The log is written atomically, so an unreadable one means nothing was appended yet
+            logger.error(f"Discarding unreadable pending news batch: {e}")
+            os.remove(self.pending_file)
+            return
+
+        checkpoint = pending["checkpoint"]
+        for day, (segment_size, index_size) in checkpoint["segments"].items():
+            for path, size in ((self._segment_path(day), segment_size), (self._index_path(day), index_size)):
+                if os.path.exists(path):
+                    os.truncate(path, size)
+        if os.path.exists(self.message_ids.path):
+            os.truncate(self.message_ids.path, checkpoint["message_ids"])
+        self.message_ids = MessageIdIndex(self.message_ids.path)
+
+        # The manifest may have been saved before the log was removed, so
+        # restore the counts the batch started from before applying it again
+        if "total_count" in checkpoint:
+            for day, count in checkpoint["day_counts"].items():
+                if count is None:
+                    self.manifest["days"].pop(day, None)
+                else:
+                    self.manifest["days"].setdefault(day, {})["count"] = count
+            self.manifest["total_count"] = checkpoint["total_count"]
+            self.manifest["watermark"] = checkpoint["watermark"]
+
+        items = [NewsItem(**item_data) for item_data in pending["items"]]
+        last_updated = datetime.fromisoformat(pending["last_updated"]) if pending["last_updated"] else None
+        written = self._append(items, last_updated=last_updated)
+        logger.warning(f"Replayed interrupted news batch: {written} items written")
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        """Return a file's size, or 0 if it does not exist."""
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def _record_written(self, day: str, message_ids: List[int]):
+        """Register newly written message ids in the id index and day count."""
+        self.message_ids.add_many(message_ids)
+        day_info = self.manifest["days"].setdefault(day, {"count": 0})
+        day_info["count"] += len(message_ids)
+
+    def append(self, items: List[NewsItem], last_updated: Optional[datetime] = None) -> int:
+        """Append new items to their day segments, skipping known message ids.
+
+        Returns the number of items actually written.
+        """
+        with self._write_lock():
+            return self._append(items, last_updated)
+
+    def _append(self, items: List[NewsItem], last_updated: Optional[datetime]) -> int:
+        """Append a batch; the caller holds the write lock."""
+        by_day: Dict[str, List[NewsItem]] = {}
+        for item in items:
+            by_day.setdefault(self.day_key(item.date), []).append(item)
+
+        for day in by_day:
+            # Index pre-index segments first so the checkpoint covers their index too
+            if os.path.exists(self._segment_path(day)) and not os.path.exists(self._index_path(day)):
+                self._load_index(day)
+
+        self._write_pending_batch(items, by_day, last_updated)
+
+        written = 0
+        batch_ids = set()
+        for day, day_items in by_day.items():
+            lines = []
+            new_ids = []
+            for item in day_items:
+                if item.message_id in batch_ids or item.message_id in self.message_ids:
+                    continue
+                batch_ids.add(item.message_id)
+                new_ids.append(item.message_id)
+                lines.append(self._serialize(item))
+
+            if not lines:
+                continue
+
+            if self.is_archived(day):
+                # Late messages for a closed day: rewrite that day's archive. A
+                # replayed batch may already be in it, so dedup against its ids too.
+                with DayArchive(self._archive_path(day)) as archive:
+                    records = archive.read()
+                archived_ids = {record["message_id"] for record in records}
+                records.extend(
+                    record for record in map(json.loads, lines)
+                    if record["message_id"] not in archived_ids
+                )
+                DayArchive.write(self._archive_path(day), records)
+                self.message_ids.add_many(new_ids)
+                day_info = self.manifest["days"][day]
+                written += len(records) - day_info["count"]
+                day_info["count"] = len(records)
+                continue
+
+            segment_path = self._segment_path(day)
+            position = self._file_size(segment_path)
+            new_offsets = array('Q')
+            for line in lines:
+                new_offsets.extend((position, position + len(line)))
+                position += len(line)
+
+            append_synced(segment_path, b"".join(lines))
+            append_synced(self._index_path(day), new_offsets.tobytes())
+            self._record_written(day, new_ids)
+            written += len(lines)
+
+        self.manifest["total_count"] += written
+        self.manifest["watermark"] = self.message_ids.max_id
+        if last_updated is not None:
+            self.manifest["last_updated"] = last_updated.isoformat()
+        self._save_manifest()
+        os.remove(self.pending_file)
+
+        return written
+
+    def days(self) -> List[str]:
+        """Return all stored days in chronological order."""
+        return sorted(self.manifest["days"])
+
+    def read_day(self, day: str, limit: Optional[int] = None) -> List[dict]:
+        """Return the raw item dictionaries stored for a day.
+
+        The day's offset index is used to read just that day's records, or
+        only the first ``limit`` of them.
+        """
+        if day not in self.manifest["days"]:
+            return []
+        return list(self._read_records(day, stop=limit))
+
+    def count_day(self, day: str) -> int:
+        """Return the number of items stored for a day without reading them."""
+        return self.manifest["days"].get(day, {}).get("count", 0)
+
+    def iter_day(self, day: str) -> Iterator[dict]:
+        """Yield the raw item dictionaries stored for a day, one at a time."""
+        if day in self.manifest["days"]:
+            yield from self._read_records(day)
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield every stored item dictionary, day by day."""
+        for day in self.days():
+            yield from self._read_records(day)
+
+    def archive_day(self, day: str) -> bool:
+        """Convert a closed day's segment into the compact archive format."""
+        with self._write_lock():
+            return self._archive_day(day)
+
+    def _archive_day(self, day: str) -> bool:
+        """Archive a day; the caller holds the write lock."""
+        if day not in self.manifest["days"] or self.is_archived(day):
+            return False
+
+        records = list(self._read_segment(day))
+        DayArchive.write(self._archive_path(day), records)
+
+        self.manifest["days"][day]["archived"] = True
+        self._save_manifest()
+
+        for path in (self._segment_path(day), self._index_path(day)):
+            if os.path.exists(path):
+                os.remove(path)
+
+        logger.info(f"Archived {len(records)} news items for {day}")
+        return True
+
+    def archive_days_before(self, day: str) -> int:
+        """Archive every live day strictly before the given day. Returns the number archived."""
+        return sum(1 for stored_day in self.days() if stored_day < day and self.archive_day(stored_day))
+
+    def contains(self, message_id: int) -> bool:
+        """Check whether a message is already stored."""
+        return message_id in self.message_ids
+
+    def count(self) -> int:
+        """Return the total number of stored items."""
+        return self.manifest.get("total_count", 0)
+
+    @property
+    def watermark(self) -> Optional[int]:
+        """Return the highest stored message id, used for incremental fetches."""
+        return self.manifest.get("watermark") or self.message_ids.max_id
+
+    @property
+    def last_updated(self) -> Optional[str]:
+        """Return the ISO timestamp of the last saved batch."""
+        return self.manifest.get("last_updated")
+
+    def migrate_legacy_file(self, legacy_file: str) -> int:
+        """Import items from the legacy single-file ``all_news.json`` store.
+
+        The legacy file is renamed with a ``.migrated`` suffix afterwards so
+        the migration only ever runs once. Returns the number of imported items.
+        """
+        if not os.path.exists(legacy_file):
+            return 0
+
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read legacy news file {legacy_file}: {e}")
+            return 0
+
+        items = []
+        for item_data in data.get("news_items", []):
+            try:
+                items.append(NewsItem(**item_data))
+            except Exception as e:
+                logger.warning(f"Failed to parse legacy news item: {e}")
+
+        last_updated = None
+        if data.get("last_updated"):
+            last_updated = datetime.fromisoformat(data["last_updated"])
+
+        migrated = self.append(items, last_updated=last_updated)
+        os.replace(legacy_file, legacy_file + ".migrated")
+        logger.info(f"Migrated {migrated} news items from {legacy_file} to segmented store")
+        return migrated
@@ -1,10 +1,10 @@
 """Telegram channel dumper for MarketTwits news using Telethon."""
 
-import json
 import os
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Union
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
@@ -12,7 +12,12 @@ from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
 from ..models.schemas import NewsItem, NewsBatch
 from ..utils.config import config
 from ..utils.logger import logger
+from ..utils.metrics import DUMPER_FETCH_DURATION, DUMPER_MESSAGES
+from ..utils.timing import mark_error, timed
 from ..utils.redis_client import redis_client
+from ..utils.redis_keys import LATEST_NEWS_TIMESTAMP, NEWS_DAY, news_day_key
+from ..utils.stats_snapshot import stats_snapshot
+from .news_store import NewsRecord, NewsStore
 
 
 class TelegramDumper:
@@ -25,6 +30,7 @@ class TelegramDumper:
         self.channel_username = config.TELEGRAM_CHANNEL_USERNAME
         self.data_dir = config.DATA_DIR
         self.news_file = os.path.join(self.data_dir, "all_news.json")
+        self.store_dir = os.path.join(self.data_dir, "news")
         
         # Always use StringSession to avoid SQLite database locking issues
         logger.info("Using StringSession for Telegram client (no SQLite file)")
@@ -37,38 +43,13 @@ class TelegramDumper:
         self._is_connected = False
         self._connection_lock = asyncio.Lock()
         os.makedirs(self.data_dir, exist_ok=True)
-        self._initialize_news_file()
+        self.store = NewsStore(self.store_dir)
+        self._initialize_news_store()
     
-    def _initialize_news_file(self):
-        """Initialize the news file if it doesn't exist."""
-        if not os.path.exists(self.news_file):
-            initial_data = {
-                "news_items": [],
-                "last_updated": None,
-                "total_count": 0
-            }
-            with open(self.news_file, 'w', encoding='utf-8') as f:
-                json.dump(initial_data, f, default=str, ensure_ascii=False, indent=2)
-            logger.info(f"Initialized news file at {self.news_file}")
-    
-    def _load_news_data(self) -> dict:
-        """Load all news data from the JSON file."""
-        try:
-            with open(self.news_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to load news data: {e}")
-            return {"news_items": [], "last_updated": None, "total_count": 0}
-    
-    def _save_news_data(self, data: dict) -> bool:
-        """Save all news data to the JSON file."""
-        try:
-            with open(self.news_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, default=str, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save news data: {e}")
-            return False
+    def _initialize_news_store(self):
+        """Migrate the legacy single-file store into the segmented store if present."""
+        if os.path.exists(self.news_file):
+            self.store.migrate_legacy_file(self.news_file)
     
     def _parse_media(self, media) -> Optional[dict]:
         """Parse media information from message."""
@@ -143,16 +124,27 @@ class TelegramDumper:
         """Close the dumper and disconnect from Telegram."""
         await self.disconnect()
     
+    @timed
     async def get_channel_messages(
         self, 
         from_date: Optional[datetime] = None, 
-        limit: int = 100
+        limit: Optional[int] = 100,
+        stop_at_seen: bool = False,
+        min_id: Optional[int] = None
     ) -> List[NewsItem]:
-        """Get messages from the Telegram channel."""
+        """Get messages from the Telegram channel.
+        
+        Messages are iterated newest first, so with ``stop_at_seen`` the
+        pagination stops at the first message that is already stored. With
+        ``min_id`` only messages strictly newer than that id are fetched,
+        oldest first, and ``from_date`` is ignored.
+        """
+        started = time.perf_counter()
         try:
             # Ensure we're connected
             if not await self.ensure_connected():
                 logger.error("Failed to connect to Telegram")
+                mark_error()
                 return []
             
             logger.info(f"Fetching messages from {self.channel_username}")
@@ -162,17 +154,27 @@ class TelegramDumper:
                 channel = await self.client.get_entity(self.channel_username)
             except Exception as e:
                 logger.error(f"Failed to get channel entity: {e}")
+                mark_error()
                 return []
             
             messages = []
             message_count = 0
             
             # Fetch messages
+            if min_id is not None:
+                iter_kwargs = {"min_id": min_id, "reverse": True}
+            else:
+                iter_kwargs = {"offset_date": from_date}
+            
             async for message in self.client.iter_messages(
                 channel,
-                offset_date=from_date,
-                limit=limit
+                limit=limit,
+                **iter_kwargs
             ):
+                if stop_at_seen and self.store.contains(message.id):
+                    logger.info(f"Reached already stored message {message.id}, stopping")
+                    break
+                
                 if message.text:  # Only process messages with text
                     # Parse media information
                     media_info = self._parse_media(message.media)
@@ -189,52 +191,73 @@ class TelegramDumper:
                     messages.append(news_item)
                     message_count += 1
                     
-                    if message_count >= limit:
+                    if limit is not None and message_count >= limit:
                         break
             
+            DUMPER_FETCH_DURATION.observe(time.perf_counter() - started, status="ok")
+            DUMPER_MESSAGES.inc(len(messages))
             logger.info(f"Successfully fetched {len(messages)} messages")
             return messages
             
         except Exception as e:
+            DUMPER_FETCH_DURATION.observe(time.perf_counter() - started, status="error")
             logger.error(f"Failed to get channel messages: {e}")
+            mark_error()
             return []
     
+    @staticmethod
+    def _news_redis_key(target_date) -> str:
+        """Return the Redis hash key holding one day's news items."""
+        return news_day_key(target_date)
+    
+    def _cache_news_in_redis(self, items: List[NewsItem]):
+        """Store news items in per-day Redis hashes keyed by message_id."""
+        by_day = {}
+        for item in items:
+            key = self._news_redis_key(item.date)
+            by_day.setdefault(key, {})[str(item.message_id)] = item.model_dump_json()
+        
+        for key, mapping in by_day.items():
+            redis_client.set_hash(key, mapping)
+            redis_client.expire(key, NEWS_DAY.ttl)
+    
+    def _get_news_from_redis(self, target_date) -> List[NewsItem]:
+        """Get one day's news items from Redis in message id order.
+        
+        Returns nothing unless the hash holds exactly the items the store
+        has for the day, so a partly evicted or stale hash is not mistaken
+        for the whole day.
+        """
+        cached = redis_client.get_hash(self._news_redis_key(target_date))
+        if not cached or len(cached) != self.store.count_day(NewsStore.day_key(target_date)):
+            return []
+        items = [NewsItem.model_validate_json(value) for value in cached.values()]
+        items.sort(key=lambda item: item.message_id)
+        return items
+    
     def save_news_batch(self, news_batch: NewsBatch) -> bool:
-        """Save news batch to the unified JSON file and Redis."""
+        """Append a news batch to the segmented news store."""
         try:
-            # Load existing data
-            data = self._load_news_data()
-            
-            # Convert NewsItem objects to dictionaries
-            new_items = [item.model_dump() for item in news_batch.items]
-            
-            # Add new items to existing data
-            data["news_items"].extend(new_items)
-            data["last_updated"] = news_batch.end_date.isoformat()
-            data["total_count"] = len(data["news_items"])
-            
-            # Remove duplicates based on message_id
-            seen_ids = set()
-            unique_items = []
-            for item in data["news_items"]:
-                if item["message_id"] not in seen_ids:
-                    seen_ids.add(item["message_id"])
-                    unique_items.append(item)
-            
-            data["news_items"] = unique_items
-            data["total_count"] = len(unique_items)
-            
-            # Save to file
-            if not self._save_news_data(data):
-                return False
+            # Append in message id order so a day's segment stays chronological
+            items = sorted(news_batch.items, key=lambda item: item.message_id)
+            written = self.store.append(items, last_updated=news_batch.end_date)
             
-            logger.info(f"Saved {len(new_items)} news items to unified file. Total: {data['total_count']}")
+            logger.info(
+                f"Saved {written} new news items ({len(news_batch.items) - written} duplicates skipped). "
+                f"Total: {self.store.count()}"
+            )
+            
+            # Mirror the batch into per-day Redis hashes for quick access
+            self._cache_news_in_redis(news_batch.items)
+            
+            # Refresh the stats snapshot for the touched days
+            self.refresh_stats_snapshot({NewsStore.day_key(item.date) for item in news_batch.items})
             
-            # Save to Redis for quick access
-            redis_client.set("all_news", data, expire=86400 * 7)  # 7 days
+            if config.NEWS_ARCHIVE_AFTER_DAYS > 0:
+                self.archive_closed_days(config.NEWS_ARCHIVE_AFTER_DAYS)
             
             # Update latest timestamp
-            redis_client.set("latest_news_timestamp", news_batch.end_date.isoformat())
+            redis_client.set(LATEST_NEWS_TIMESTAMP.key(), news_batch.end_date.isoformat())
             
             return True
             
@@ -242,18 +265,49 @@ class TelegramDumper:
             logger.error(f"Failed to save news batch: {e}")
             return False
     
+    def refresh_stats_snapshot(self, days: Optional[Iterable[str]] = None) -> bool:
+        """Write news totals and the given days' counts (all days if None) to the stats snapshot."""
+        try:
+            # Long-lived dumpers (the bot's) would otherwise report counts from when they started
+            self.store.reload_manifest()
+            if days is None:
+                days = self.store.days()
+            last_updated = self.store.last_updated
+            
+            return stats_snapshot.record_news(
+                {day: self.store.count_day(day) for day in days},
+                total_count=self.store.count(),
+                last_updated=datetime.fromisoformat(last_updated) if last_updated else None,
+                last_news_date=self.get_last_news_date()
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to refresh stats snapshot: {e}")
+            return False
+    
+    def archive_closed_days(self, older_than_days: int) -> int:
+        """Move days older than the given number of days to the compact archive format."""
+        try:
+            cutoff_day = NewsStore.day_key(datetime.now() - timedelta(days=older_than_days))
+            archived = self.store.archive_days_before(cutoff_day)
+            if archived:
+                logger.info(f"Archived {archived} closed news days before {cutoff_day}")
+            return archived
+        except Exception as e:
+            logger.error(f"Failed to archive closed news days: {e}")
+            return 0
+    
     def load_latest_timestamp(self) -> Optional[datetime]:
         """Load the latest processed timestamp from Redis or file."""
         try:
             # Try Redis first
-            timestamp_str = redis_client.get("latest_news_timestamp")
+            timestamp_str = redis_client.get(LATEST_NEWS_TIMESTAMP.key())
             if timestamp_str:
                 return datetime.fromisoformat(timestamp_str)
             
-            # Fallback to file system
-            data = self._load_news_data()
-            if data.get("last_updated"):
-                return datetime.fromisoformat(data["last_updated"])
+            # Fallback to the news store
+            if self.store.last_updated:
+                return datetime.fromisoformat(self.store.last_updated)
             
             # Default to last month if no data
             return datetime.now() - timedelta(days=10)
@@ -262,16 +316,25 @@ class TelegramDumper:
             logger.error(f"Failed to load latest timestamp: {e}")
             return datetime.now() - timedelta(days=10)
     
-    async def dump_news(self, from_date: Optional[datetime] = None) -> bool:
-        """Main method to dump news from Telegram channel."""
+    @timed
+    async def dump_news(self, from_date: Optional[datetime] = None, incremental: bool = True) -> bool:
+        """Main method to dump news from Telegram channel.
+        
+        Once the store holds messages, only messages newer than the stored
+        watermark are fetched unless ``incremental`` is disabled.
+        """
         try:
             if from_date is None:
                 from_date = self.load_latest_timestamp()
             
-            logger.info(f"Starting news dump from {from_date}")
-            
             # Get messages (connection is handled internally)
-            messages = await self.get_channel_messages(from_date=from_date, limit=1000)
+            watermark = self.store.watermark if incremental else None
+            if watermark:
+                logger.info(f"Starting incremental news dump after message {watermark}")
+                messages = await self.get_channel_messages(limit=None, min_id=watermark)
+            else:
+                logger.info(f"Starting news dump from {from_date}")
+                messages = await self.get_channel_messages(from_date=from_date, limit=1000, stop_at_seen=True)
             
             if not messages:
                 logger.warning("No new messages found")
@@ -292,35 +355,29 @@ class TelegramDumper:
                 logger.info(f"Successfully dumped {len(messages)} news items")
             else:
                 logger.error("Failed to save news batch")
+                mark_error()
             
             return success
             
         except Exception as e:
             logger.error(f"Failed to dump news: {e}")
+            mark_error()
             return False
     
-    def get_news_for_date(self, target_date: datetime) -> Optional[NewsBatch]:
-        """Get news batch for a specific date."""
+    def get_news_for_date(self, target_date: datetime, limit: Optional[int] = None) -> Optional[NewsBatch]:
+        """Get news batch for a specific date, optionally only its first ``limit`` items.
+        
+        Items are in message id order. Limited reads go straight to the
+        store's offset index, which is cheaper than fetching the whole day
+        from Redis.
+        """
         try:
-            # Try Redis first
-            data = redis_client.get_json("all_news")
-            if not data:
-                # Fallback to file system
-                data = self._load_news_data()
-            
-            if not data or not data.get("news_items"):
-                return None
-            
-            # Filter news items for the target date
-            target_date_str = target_date.strftime('%Y-%m-%d')
-            filtered_items = []
-            
-            for item_data in data["news_items"]:
-                item_date = datetime.fromisoformat(item_data["date"]).strftime('%Y-%m-%d')
-                if item_date == target_date_str:
-                    # Convert dict back to NewsItem
-                    news_item = NewsItem(**item_data)
-                    filtered_items.append(news_item)
+            filtered_items = [] if limit is not None else self._get_news_from_redis(target_date)
+            if not filtered_items:
+                # Fallback to the news store
+                records = self.store.read_day(NewsStore.day_key(target_date), limit=limit)
+                filtered_items = [NewsItem(**item_data) for item_data in records]
+                filtered_items.sort(key=lambda item: item.message_id)
             
             if not filtered_items:
                 return None
@@ -337,16 +394,20 @@ class TelegramDumper:
             logger.error(f"Failed to get news for date {target_date}: {e}")
             return None
     
+    def get_news_count_for_date(self, target_date: datetime) -> int:
+        """Get number of news items for a specific date without loading them."""
+        try:
+            return self.store.count_day(NewsStore.day_key(target_date))
+        except Exception as e:
+            logger.error(f"Failed to get news count for date {target_date}: {e}")
+            return 0
+    
     def get_all_news(self) -> List[NewsItem]:
-        """Get all news items from the unified file."""
+        """Get all news items from the news store."""
         try:
-            data = self._load_news_data()
-            if not data or not data.get("news_items"):
-                return []
-            
             # Convert dict items back to NewsItem objects
             news_items = []
-            for item_data in data["news_items"]:
+            for item_data in self.store.iter_records():
                 try:
                     news_item = NewsItem(**item_data)
                     news_items.append(news_item)
@@ -363,8 +424,91 @@ class TelegramDumper:
     def get_news_count(self) -> int:
         """Get total number of news items."""
         try:
-            data = self._load_news_data()
-            return data.get("total_count", 0)
+            return self.store.count()
         except Exception as e:
             logger.error(f"Failed to get news count: {e}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    @staticmethod
+    def _align_datetime(bound: datetime, reference: datetime) -> datetime:
+        """Make a naive/aware bound comparable with a stored item date."""
+        if bound.tzinfo is None and reference.tzinfo is not None:
+            return bound.astimezone()
+        if bound.tzinfo is not None and reference.tzinfo is None:
+            return bound.astimezone().replace(tzinfo=None)
+        return bound
+    
+    def iter_news(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        as_tuples: bool = False
+    ) -> Iterator[Union[NewsItem, NewsRecord]]:
+        """Lazily yield stored news items with ``since <= date < until``.
+        
+        Only day segments that can overlap the range are read. With
+        ``as_tuples`` items are yielded as ``NewsRecord`` tuples, skipping
+        Pydantic validation.
+        """
+        # Allow one day of slack since segments are keyed in the items' own timezone
+        since_day = NewsStore.day_key(since - timedelta(days=1)) if since else None
+        until_day = NewsStore.day_key(until + timedelta(days=1)) if until else None
+        
+        for day in self.store.days():
+            if since_day and day < since_day:
+                continue
+            if until_day and day > until_day:
+                break
+            
+            for item_data in self.store.iter_day(day):
+                try:
+                    record = NewsRecord.from_dict(item_data)
+                except (KeyError, ValueError) as e:
+                    logger.warning(f"Failed to parse news item: {e}")
+                    continue
+                
+                if since and record.date < self._align_datetime(since, record.date):
+                    continue
+                if until and record.date >= self._align_datetime(until, record.date):
+                    continue
+                
+                yield record if as_tuples else NewsItem(**item_data)
+    
+    def count_news(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        """Count stored news items in a date range without materializing them."""
+        try:
+            if since is None and until is None:
+                return self.store.count()
+            return sum(1 for _ in self.iter_news(since=since, until=until, as_tuples=True))
+        except Exception as e:
+            logger.error(f"Failed to count news: {e}")
+            return 0
+    
+    def get_last_news_date(self) -> Optional[datetime]:
+        """Get the date of the newest stored news item."""
+        try:
+            days = self.store.days()
+            if not days:
+                return None
+            return max(
+                (NewsRecord.from_dict(item_data).date for item_data in self.store.iter_day(days[-1])),
+                default=None
+            )
+        except Exception as e:
+            logger.error(f"Failed to get last news date: {e}")
+            return None
+    
+    def get_recent_news(self, count: int = 5) -> List[NewsItem]:
+        """Get the newest ``count`` stored news items oldest first, reading only the newest days."""
+        try:
+            recent = []
+            for day in reversed(self.store.days()):
+                recent.extend(NewsItem(**item_data) for item_data in self.store.iter_day(day))
+                if len(recent) >= count:
+                    break
+            # Segments are in write order, so order by post date before picking the newest
+            recent.sort(key=lambda item: (item.date, item.message_id))
+            return recent[-count:] if count > 0 else []
+        except Exception as e:
+            logger.error(f"Failed to get recent news: {e}")
+            return []
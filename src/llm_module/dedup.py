@@ -0,0 +1,142 @@
+"""Near-duplicate collapsing of channel posts with SimHash fingerprints."""
+
+import hashlib
+import re
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+from ..models.schemas import NewsItem
+from ..utils.config import config
+from ..utils.logger import logger
+
+FINGERPRINT_BITS = 64
+
+# Figures are masked so that a post and its correction share a fingerprint
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase a post, mask links and figures, and split it into words."""
+    text = _URL.sub(" ", text.lower().replace("ё", "е"))
+    return _WORD.findall(_NUMBER.sub("0", text))
+
+
+def wording(text: str) -> FrozenSet[str]:
+    """Return the set of a post's words other than figures."""
+    return frozenset(word for word in normalize(text) if not word.isdigit())
+
+
+def _feature_hash(feature: str) -> int:
+    """Hash a feature to a 64-bit integer."""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, shingle_size: int = 1) -> int:
+    """Compute the SimHash fingerprint of a post over word shingles.
+
+    Single words are the default: channel posts are a sentence or two, too
+    short to share many longer shingles even when they report the same news.
+    """
+    words = normalize(text)
+    if len(words) < shingle_size:
+        features = words
+    else:
+        features = [" ".join(words[index:index + shingle_size]) for index in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        value = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(left: int, right: int) -> int:
+    """Count the bits in which two fingerprints differ."""
+    return bin(left ^ right).count("1")
+
+
+class NearDuplicateCollapser:
+    """Cluster near-identical posts of a day and keep one item per cluster."""
+
+    def __init__(self, max_distance: int = 8, min_words: int = 4):
+        """Initialize the collapser.
+
+        Posts whose fingerprints differ in at most ``max_distance`` bits are
+        clustered if one post's words, figures aside, all appear in the other;
+        posts shorter than ``min_words`` are never clustered since their
+        fingerprints are too coarse to compare.
+        """
+        self.max_distance = max_distance
+        self.min_words = min_words
+
+    def is_duplicate(self, left: Tuple[int, FrozenSet[str]], right: Tuple[int, FrozenSet[str]]) -> bool:
+        """Compare two (fingerprint, wording) signatures.
+
+        The fingerprint is only a coarse filter: templated releases such as
+        retail sales for two countries sit a few bits apart, so the wording
+        must also match up to figures and words added by an update.
+        """
+        if hamming_distance(left[0], right[0]) > self.max_distance:
+            return False
+        return left[1] <= right[1] or right[1] <= left[1]
+
+    def cluster(self, items: Sequence[NewsItem]) -> List[List[NewsItem]]:
+        """Group items into clusters of near-duplicates, in chronological order."""
+        clusters: List[List[NewsItem]] = []
+        signatures: List[List[Tuple[int, FrozenSet[str]]]] = []
+
+        for item in sorted(items, key=lambda item: item.date):
+            signature: Optional[Tuple[int, FrozenSet[str]]] = None
+            if len(normalize(item.text)) >= self.min_words:
+                signature = (simhash(item.text), wording(item.text))
+
+            match = None
+            if signature is not None:
+                # Compare with every member: a follow-up may only resemble the latest update
+                for index, members in enumerate(signatures):
+                    if any(self.is_duplicate(signature, other) for other in members):
+                        match = index
+                        break
+
+            if match is None:
+                clusters.append([item])
+                signatures.append([signature] if signature is not None else [])
+            else:
+                clusters[match].append(item)
+                signatures[match].append(signature)
+
+        return clusters
+
+    @staticmethod
+    def merge(cluster: Sequence[NewsItem]) -> NewsItem:
+        """Collapse a cluster into its latest post with the cluster's total reach.
+
+        The latest post carries the corrected or most complete figures; views
+        and forwards are summed so the relevance ranking sees the headline's
+        full engagement.
+        """
+        latest = cluster[-1]
+        if len(cluster) == 1:
+            return latest
+
+        views = [item.views for item in cluster if item.views is not None]
+        forwards = [item.forwards for item in cluster if item.forwards is not None]
+        return latest.model_copy(update={
+            "views": sum(views) if views else None,
+            "forwards": sum(forwards) if forwards else None
+        })
+
+    def collapse(self, items: Sequence[NewsItem]) -> List[NewsItem]:
+        """Replace each cluster of near-duplicates by one merged item, in chronological order."""
+        clusters = self.cluster(items)
+        if len(clusters) < len(items):
+            logger.info(f"Collapsed {len(items)} news items into {len(clusters)} distinct posts")
+        # A merged item carries its cluster's latest date, so clusters can change places
+        return sorted((self.merge(cluster) for cluster in clusters), key=lambda item: item.date)
+
+
+# Global near-duplicate collapser instance
+near_duplicates = NearDuplicateCollapser(max_distance=config.DEDUP_MAX_DISTANCE)
@@ -0,0 +1,109 @@
+"""Local relevance scoring that drops noise before news reaches the LLM."""
+
+import re
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from ..models.schemas import NewsItem
+from ..utils.config import config
+from ..utils.logger import logger
+
+
+class RelevanceRule(NamedTuple):
+    """A keyword pattern and the weight it adds to an item's score."""
+
+    name: str
+    pattern: "re.Pattern"
+    weight: float
+
+
+def _rule(name: str, pattern: str, weight: float) -> RelevanceRule:
+    """Compile a case-insensitive rule."""
+    return RelevanceRule(name, re.compile(pattern, re.IGNORECASE), weight)
+
+
+# Topics the summary prompt asks to focus on score up, the ones it asks to
+# exclude score down; an item can match several rules.
+RULES = (
+    _rule("central_banks", r"фрс|\bfed\b|federal reserve|пауэлл|powell|ецб|\becb\b|лагард|банк япони|\bboj\b|ставк|rate (cut|hike)", 2.0),
+    _rule("macro", r"инфляц|\bcpi\b|\bpce\b|\bввп\b|\bgdp\b|безработиц|payrolls|\bpmi\b|розничн\w* продаж", 1.5),
+    _rule("markets", r"s&p|nasdaq|\bdow\b|нефт|brent|\bwti\b|золот|\bgold\b|treasur|доходност|облигаци", 1.0),
+    _rule("corporate", r"отч[её]т|выручк|прибыл|earnings|guidance|\beps\b", 1.0),
+    _rule("geopolitics", r"трамп|trump|пошлин|tariff|санкци|китай|china|опек|opec", 1.0),
+    _rule("russia_domestic", r"мосбирж|imoex|\bртс\b|рубл|цб рф|банк росси|набиуллин|минфин рф|сбер|газпром|лукойл|роснефт|\bвтб\b|\bофз\b", -1.5),
+    _rule("crypto", r"биткоин|bitcoin|\bbtc\b|эфириум|ethereum|\beth\b|крипт|crypto|блокчейн|blockchain", -2.0),
+    _rule("meme", r"😂|🤣|\bмем|\bлол\b|шутк", -1.0),
+    _rule("ads", r"реклам|\berid\b|промокод|подписывайтесь", -5.0),
+)
+
+# Posts shorter than this are usually reactions rather than news
+SHORT_TEXT_LENGTH = 25
+SHORT_TEXT_WEIGHT = -1.0
+
+# Engagement adds up to +/- half of these weights, from the item's rank
+# among the day's posts so that days with higher overall reach compare fairly
+VIEWS_WEIGHT = 2.0
+FORWARDS_WEIGHT = 1.0
+
+
+def _rank(values: Sequence[Optional[float]]) -> List[Optional[float]]:
+    """Map values to their percentile (0 to 1) among the known ones."""
+    known = sorted(value for value in values if value is not None)
+    if len(known) < 2:
+        return [None] * len(values)
+    return [None if value is None else bisect_left(known, value) / (len(known) - 1) for value in values]
+
+
+class RelevanceFilter:
+    """Score a day's news with keyword rules and engagement, and drop the noise."""
+
+    def __init__(self, rules: Sequence[RelevanceRule] = RULES, min_score: float = 0.0):
+        """Initialize the filter."""
+        self.rules = tuple(rules)
+        self.min_score = min_score
+
+    def rule_score(self, text: str) -> float:
+        """Score a text by the rules it matches."""
+        score = sum(rule.weight for rule in self.rules if rule.pattern.search(text))
+        if len(text.strip()) < SHORT_TEXT_LENGTH:
+            score += SHORT_TEXT_WEIGHT
+        return score
+
+    def score(self, items: Sequence[NewsItem]) -> List[float]:
+        """Score each item against the rest of the day."""
+        views = _rank([item.views for item in items])
+        forward_rates = _rank([
+            item.forwards / item.views if item.views and item.forwards is not None else None
+            for item in items
+        ])
+
+        scores = []
+        for item, views_rank, forwards_rank in zip(items, views, forward_rates):
+            score = self.rule_score(item.text)
+            if views_rank is not None:
+                score += (views_rank - 0.5) * VIEWS_WEIGHT
+            if forwards_rank is not None:
+                score += (forwards_rank - 0.5) * FORWARDS_WEIGHT
+            scores.append(score)
+        return scores
+
+    def filter(self, items: Sequence[NewsItem]) -> Tuple[List[NewsItem], List[float]]:
+        """Keep the items scoring at least ``min_score``, in their original order.
+
+        Returns the kept items with their scores. If nothing passes, every
+        item is kept so a quiet day still gets a summary.
+        """
+        scores = self.score(items)
+        kept = [(item, score) for item, score in zip(items, scores) if score >= self.min_score]
+
+        if not kept:
+            logger.warning("Relevance filter would drop every news item, keeping all")
+            return list(items), scores
+
+        if len(kept) < len(items):
+            logger.info(f"Relevance filter dropped {len(items) - len(kept)} of {len(items)} news items")
+        return [item for item, _ in kept], [score for _, score in kept]
+
+
+# Global relevance filter instance
+relevance_filter = RelevanceFilter(min_score=config.RELEVANCE_MIN_SCORE)
@@ -0,0 +1,52 @@
+"""Content-addressed cache of LLM responses stored in Redis."""
+
+import hashlib
+import json
+from typing import Optional
+
+from ..utils.config import config
+from ..utils.logger import logger
+from ..utils.metrics import LLM_CACHE_REQUESTS
+from ..utils.redis_client import async_redis_client
+from ..utils.redis_keys import LLM_RESPONSE
+
+
+class LLMResponseCache:
+    """Reuse completions for requests identical in model, messages and parameters.
+
+    Requests are sent with temperature 0, so the same input gives the same
+    summary; regenerating a day whose news has not changed then costs a
+    Redis read instead of an API call.
+    """
+
+    def __init__(self, enabled: bool = True, ttl: Optional[int] = None):
+        """Initialize the cache."""
+        self.enabled = enabled
+        self.ttl = ttl
+
+    @staticmethod
+    def request_key(**request) -> str:
+        """Hash a chat completion request into its Redis key."""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return LLM_RESPONSE.key(digest=hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached completion."""
+        if not self.enabled:
+            return None
+        data = await async_redis_client.get_json(key)
+        content = data.get("content") if isinstance(data, dict) else None
+        LLM_CACHE_REQUESTS.inc(result="hit" if content is not None else "miss")
+        if content is not None:
+            logger.info("Using cached LLM response")
+        return content
+
+    async def set(self, key: str, content: str) -> bool:
+        """Cache a completion."""
+        if not self.enabled:
+            return False
+        return await async_redis_client.set(key, {"content": content}, expire=self.ttl)
+
+
+# Global LLM response cache instance
+llm_response_cache = LLMResponseCache(enabled=config.LLM_CACHE_ENABLED, ttl=LLM_RESPONSE.ttl)
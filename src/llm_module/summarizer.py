@@ -1,14 +1,32 @@
 """LLM-based news summarizer using OpenAI."""
 
+import asyncio
 import json
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from openai import AsyncOpenAI
 
-from ..models.schemas import NewsBatch, Summary
+from ..models.schemas import NewsBatch, NewsItem, Summary
 from ..utils.config import config
 from ..utils.logger import logger
+from ..utils.metrics import OPENAI_REQUEST_DURATION, OPENAI_TOKENS
+from ..utils.timing import mark_error, timed
 from ..utils.redis_client import redis_client
+from ..utils.redis_keys import LATEST_SUMMARY, SUMMARY, summary_key
+from ..utils.summary_cache import SummaryCache, summary_cache
+from .dedup import near_duplicates
+from .relevance import relevance_filter
+from .response_cache import llm_response_cache
+from .token_budget import token_budgeter
+
+
+class PromptPlan(NamedTuple):
+    """How a day's news is sent to the model, and how many items were left out before budgeting."""
+    mode: str
+    chunks: List[List[str]]
+    collapsed_count: int
+    filtered_count: int
 
 
 class NewsSummarizer:
@@ -65,43 +83,220 @@ class NewsSummarizer:
 """
         return prompt
     
-    async def summarize_news(self, news_batch: NewsBatch) -> Optional[Summary]:
-        """Summarize a batch of news items."""
+    def _create_chunk_prompt(self, news_items: List[str], last_date: str) -> str:
+        """Create a prompt that condenses one part of the day (map step)."""
+        all_news = "\n".join([f"• {item}" for item in news_items])
+        
+        prompt = f"""
+Сегодня {last_date}
+
+Ниже часть твитов за день из новостного канала о финансовых рынках. Выпиши все значимые новости о мировом рынке и политике из этой части в виде пронумерованного списка кратких пунктов, от самых важных к менее важным. Не используй российские внутренние новости, криптовалюты, мемы и спекуляции без содержания, кроме случаев, когда они важны для рынков.
+
+ВОТ твиты:
+"
+{all_news}
+"
+
+Ответь только списком на русском языке, без вступления.
+"""
+        return prompt
+    
+    def _create_reduce_prompt(self, partial_summaries: List[str], last_date: str) -> str:
+        """Create a prompt that merges partial summaries into the final one (reduce step)."""
+        all_parts = "\n\n".join([f"Часть {index}:\n{part}" for index, part in enumerate(partial_summaries, 1)])
+        
+        prompt = f"""
+Сегодня {last_date}
+
+Ниже краткие списки новостей по частям дня из новостного канала о финансовых рынках. Объедини их в одно резюме дня: убери повторы, оставь только основные новости о мировом рынке и политике.
+
+ВОТ части:
+"
+{all_parts}
+"
+
+Используй формат как пронумерованный список кратких новостей, отсортированных от самых важных к менее важным.
+
+Формат ответа в JSON:
+{{
+    "summary": "Краткий обзор самых важных рыночных событий",
+    "key_topics": [используй формат нумерованного списка с самой важной новстью к менее важной]
+}}
+
+Пиши на русском языке в формате пронумерованного списка.
+"""
+        return prompt
+    
+    async def _complete(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        refresh: bool = False,
+        expect_json: bool = False
+    ) -> str:
+        """Send a prompt to the chat model and return the reply text.
+        
+        Replies are cached by a hash of the whole request, so identical
+        prompts are answered from Redis. ``refresh`` skips the lookup but
+        still caches the new reply. Empty replies, and with ``expect_json``
+        replies that are not JSON, are never cached.
+        """
+        if max_tokens is None:
+            max_tokens = config.SUMMARY_MAX_TOKENS
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a professional financial news analyst."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0
+        }
+        cache_key = llm_response_cache.request_key(**request)
+        if not refresh:
+            cached = await llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        started = time.perf_counter()
         try:
-            logger.info(f"Summarizing {len(news_batch.items)} news items")
+            response = await self.client.chat.completions.create(**request)
+        except Exception:
+            OPENAI_REQUEST_DURATION.observe(time.perf_counter() - started, model=self.model, status="error")
+            raise
+        OPENAI_REQUEST_DURATION.observe(time.perf_counter() - started, model=self.model, status="ok")
+        self._record_usage(response)
+        
+        content = response.choices[0].message.content.strip()
+        if content and (not expect_json or self._is_json(content)):
+            await llm_response_cache.set(cache_key, content)
+        return content
+    
+    @staticmethod
+    def _is_json(content: str) -> bool:
+        """Check whether a reply parses as JSON."""
+        try:
+            json.loads(content)
+            return True
+        except json.JSONDecodeError:
+            return False
+    
+    async def _summarize_chunks(self, chunks: List[List[str]], last_date: str, refresh: bool = False) -> List[str]:
+        """Condense chunks concurrently, keeping the partial summaries that succeed."""
+        semaphore = asyncio.Semaphore(config.SUMMARY_MAX_CONCURRENCY)
+        
+        async def summarize_chunk(chunk: List[str]) -> str:
+            async with semaphore:
+                return await self._complete(self._create_chunk_prompt(chunk, last_date), refresh=refresh)
+        
+        results = await asyncio.gather(*[summarize_chunk(chunk) for chunk in chunks], return_exceptions=True)
+        
+        partial_summaries = []
+        for index, result in enumerate(results, 1):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to summarize chunk {index}/{len(chunks)}: {result}")
+            elif result:
+                partial_summaries.append(result)
+        return partial_summaries
+    
+    def _prompt_budget(self, last_date: str) -> int:
+        """Tokens left for news once the prompt template and the completion are reserved."""
+        return token_budgeter.prompt_budget - token_budgeter.count(self._create_summarization_prompt([], last_date))
+    
+    def _chunk_budget(self, last_date: str) -> int:
+        """Tokens of news sent in one map-reduce chunk."""
+        return min(config.SUMMARY_CHUNK_TOKENS, self._prompt_budget(last_date))
+    
+    def plan_prompt(self, news_items: List[NewsItem], last_date: str) -> PromptPlan:
+        """Decide how a day's news is sent to the model.
+        
+        Near-duplicate posts are collapsed and low-relevance items dropped
+        first. The mode is "single" with one chunk when the day fits in one
+        prompt, "map_reduce" for days that exceed the context budget, or,
+        with map-reduce disabled, "packed" with one chunk holding the most
+        relevant items that fit in the model's context.
+        """
+        items = [item for item in news_items if item.text.strip()]
+        text_count = len(items)
+        if config.DEDUP_ENABLED:
+            items = near_duplicates.collapse(items)
+        collapsed_count = text_count - len(items)
+        if config.RELEVANCE_FILTER_ENABLED:
+            items, scores = relevance_filter.filter(items)
+        else:
+            scores = relevance_filter.score(items)
+        filtered_count = text_count - collapsed_count - len(items)
+        texts = [item.text for item in items]
+        
+        budget = self._prompt_budget(last_date)
+        if sum(token_budgeter.count(text) + token_budgeter.ITEM_OVERHEAD for text in texts) <= budget:
+            return PromptPlan("single", [texts], collapsed_count, filtered_count)
+        if config.SUMMARY_MAP_REDUCE:
+            # Only days over the context budget are split, into chunks of the chunk budget
+            chunks = token_budgeter.chunk(texts, self._chunk_budget(last_date))
+            return PromptPlan("map_reduce", chunks, collapsed_count, filtered_count)
+        return PromptPlan("packed", [token_budgeter.pack(texts, budget, scores)], collapsed_count, filtered_count)
+    
+    async def _build_prompt(self, news_items: List[NewsItem], last_date: str, refresh: bool = False) -> Optional[str]:
+        """Build the final prompt, map-reducing the day when it exceeds the context budget."""
+        plan = self.plan_prompt(news_items, last_date)
+        mode, chunks = plan.mode, plan.chunks
+        
+        if mode == "packed":
+            logger.warning(f"Map-reduce disabled, summarizing only the {len(chunks[0])} most relevant news items that fit")
+        if mode != "map_reduce":
+            return self._create_summarization_prompt(chunks[0], last_date)
+        
+        chunk_budget = self._chunk_budget(last_date)
+        texts = [text for chunk in chunks for text in chunk]
+        while len(chunks) > 1:
+            logger.info(f"Condensing {len(texts)} texts in {len(chunks)} chunks")
+            texts = await self._summarize_chunks(chunks, last_date, refresh)
+            if not texts:
+                logger.error("Failed to summarize any chunk")
+                return None
             
-            # Extract text from news items
-            news_texts = [item.text for item in news_batch.items if item.text.strip()]
+            next_chunks = token_budgeter.chunk(texts, chunk_budget)
+            if len(next_chunks) >= len(chunks):
+                # Partial summaries no longer shrink; reduce them all at once
+                break
+            chunks = next_chunks
+        
+        return self._fit_reduce_prompt(texts, last_date)
+    
+    def _fit_reduce_prompt(self, partial_summaries: List[str], last_date: str) -> str:
+        """Create the reduce prompt, cutting every partial summary to an equal share if it is over budget."""
+        prompt = self._create_reduce_prompt(partial_summaries, last_date)
+        if token_budgeter.count(prompt) <= token_budgeter.prompt_budget:
+            return prompt
+        
+        # Each part is listed most important first, so cutting its tail loses the least
+        template_tokens = token_budgeter.count(self._create_reduce_prompt([], last_date))
+        header_tokens = token_budgeter.count(f"Часть {len(partial_summaries)}:\n\n\n")
+        share = max(1, (token_budgeter.prompt_budget - template_tokens) // len(partial_summaries) - header_tokens)
+        logger.warning(f"Reduce prompt over budget, cutting {len(partial_summaries)} partial summaries to {share} tokens each")
+        return self._create_reduce_prompt(
+            [token_budgeter.truncate(part, share) for part in partial_summaries], last_date
+        )
+    
+    @timed
+    async def summarize_news(self, news_batch: NewsBatch, refresh: bool = False) -> Optional[Summary]:
+        """Summarize a batch of news items; ``refresh`` bypasses cached LLM replies."""
+        try:
+            logger.info(f"Summarizing {len(news_batch.items)} news items")
             
-            if not news_texts:
+            if not any(item.text.strip() for item in news_batch.items):
                 logger.warning("No text content found in news items")
                 return None
             
-            # Limit text length to avoid token limits
-            max_text_length = 8000  # Approximate token limit
-            combined_text = "\n\n".join(news_texts)
-            if len(combined_text) > max_text_length:
-                # Truncate to fit within limits
-                combined_text = combined_text[:max_text_length] + "..."
-                news_texts = [combined_text]
-            
-            # Create prompt with date
+            # Create prompt with date, condensing busy days chunk by chunk
             last_date = news_batch.end_date.strftime("%Y-%m-%d")
-            prompt = self._create_summarization_prompt(news_texts, last_date)
+            prompt = await self._build_prompt(news_batch.items, last_date, refresh)
+            if not prompt:
+                return None
             
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional financial news analyst."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0
-            )
-            
-            # Parse response
-            content = response.choices[0].message.content.strip()
+            content = await self._complete(prompt, refresh=refresh, expect_json=True)
             
             # Try to parse as JSON
             try:
@@ -126,17 +321,30 @@ class NewsSummarizer:
             
         except Exception as e:
             logger.error(f"Failed to summarize news: {e}")
+            mark_error()
             return None
     
+    def _record_usage(self, response):
+        """Count the prompt and completion tokens reported for a completion."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for token_type in ("prompt_tokens", "completion_tokens"):
+            tokens = getattr(usage, token_type, None)
+            if isinstance(tokens, int):
+                OPENAI_TOKENS.inc(tokens, model=self.model, type=token_type.split("_")[0])
+    
     def save_summary(self, summary: Summary) -> bool:
         """Save summary to Redis cache."""
         try:
-            # Save to Redis
-            redis_key = f"summary:{summary.date.strftime('%Y%m%d')}"
-            redis_client.set(redis_key, summary.model_dump(), expire=86400 * 30)  # 30 days
-            
-            # Update latest summary
-            redis_client.set("latest_summary", summary.model_dump(), expire=86400 * 7)  # 7 days
+            # Save the dated summary and update the latest one in one transaction
+            redis_key = summary_key(summary.date)
+            changed_keys = [redis_key, LATEST_SUMMARY.key()]
+            with redis_client.pipeline() as pipe:
+                pipe.set(redis_key, summary, expire=SUMMARY.ttl)
+                pipe.set(LATEST_SUMMARY.key(), summary, expire=LATEST_SUMMARY.ttl)
+                pipe.publish(SummaryCache.CHANNEL, SummaryCache.invalidation_message(changed_keys))
+            summary_cache.invalidate(changed_keys)
             
             logger.info(f"Saved summary for {summary.date} to cache")
             return True
@@ -148,13 +356,7 @@ class NewsSummarizer:
     def get_summary_for_date(self, target_date: datetime) -> Optional[Summary]:
         """Get summary for a specific date from cache."""
         try:
-            redis_key = f"summary:{target_date.strftime('%Y%m%d')}"
-            data = redis_client.get_json(redis_key)
-            
-            if data:
-                return Summary(**data)
-            
-            return None
+            return summary_cache.read(summary_key(target_date))
             
         except Exception as e:
             logger.error(f"Failed to get summary for date {target_date}: {e}")
@@ -163,12 +365,7 @@ class NewsSummarizer:
     def get_latest_summary(self) -> Optional[Summary]:
         """Get the latest summary from cache."""
         try:
-            data = redis_client.get_json("latest_summary")
-            
-            if data:
-                return Summary(**data)
-            
-            return None
+            return summary_cache.read(LATEST_SUMMARY.key())
             
         except Exception as e:
             logger.error(f"Failed to get latest summary: {e}")
@@ -0,0 +1,116 @@
+"""Token counting and prompt budgeting for the summarization model."""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from ..utils.config import config
+from ..utils.logger import logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+@lru_cache(maxsize=4096)
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens in a text from its UTF-8 size.
+
+    English averages about four bytes per token; Cyrillic letters take two
+    bytes and tokenize at roughly two letters per token, so three bytes per
+    token stays on the safe side for the channel's mixed text.
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+class TokenBudgeter:
+    """Count tokens for a model and fit news texts into its context window."""
+
+    # Tokens each item adds to a prompt beyond its text (bullet and newline)
+    ITEM_OVERHEAD = 3
+
+    def __init__(self, model: str, context_tokens: int, reserved_tokens: int):
+        """Initialize the budgeter, using tiktoken when it is installed."""
+        self.model = model
+        self.context_tokens = context_tokens
+        self.reserved_tokens = reserved_tokens
+        self._encoding = None
+
+        if tiktoken is None:
+            logger.info("tiktoken is not installed, estimating token counts from text size")
+        else:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+
+        # Cache per instance so repeated items are only tokenized once
+        self.count = lru_cache(maxsize=4096)(self._count)
+
+    def _count(self, text: str) -> int:
+        """Count the tokens in a text."""
+        if self._encoding is None:
+            return estimate_tokens(text)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    @property
+    def prompt_budget(self) -> int:
+        """Tokens available for the prompt once the completion is reserved."""
+        return self.context_tokens - self.reserved_tokens
+
+    def truncate(self, text: str, budget: int) -> str:
+        """Cut a text to at most ``budget`` tokens."""
+        if self.count(text) <= budget:
+            return text
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:budget])
+        # Shrink proportionally until the estimate fits
+        while text and self.count(text) > budget:
+            text = text[:max(0, len(text) * budget // self.count(text) - 1)]
+        return text
+
+    def pack(self, texts: Sequence[str], budget: int, priorities: Optional[Sequence[float]] = None) -> List[str]:
+        """Select whole texts, highest priority first, that fit in ``budget`` tokens.
+
+        Texts that do not fit are skipped so that smaller, lower-priority
+        ones can still use the remaining room. The selection keeps the
+        original order.
+        """
+        order = range(len(texts))
+        if priorities is not None:
+            order = sorted(order, key=lambda index: priorities[index], reverse=True)
+
+        selected = set()
+        used = 0
+        for index in order:
+            tokens = self.count(texts[index]) + self.ITEM_OVERHEAD
+            if used + tokens <= budget:
+                selected.add(index)
+                used += tokens
+        return [text for index, text in enumerate(texts) if index in selected]
+
+    def chunk(self, texts: Sequence[str], budget: int) -> List[List[str]]:
+        """Split texts, in order, into chunks of at most ``budget`` tokens."""
+        chunks = []
+        current = []
+        used = 0
+        for text in texts:
+            tokens = self.count(text) + self.ITEM_OVERHEAD
+            if tokens > budget:
+                # A single oversized item is cut to fit a chunk on its own
+                text = self.truncate(text, budget - self.ITEM_OVERHEAD)
+                tokens = self.count(text) + self.ITEM_OVERHEAD
+            if current and used + tokens > budget:
+                chunks.append(current)
+                current = []
+                used = 0
+            current.append(text)
+            used += tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+
+# Global token budgeter instance
+token_budgeter = TokenBudgeter(config.OPENAI_MODEL, config.OPENAI_CONTEXT_TOKENS, config.SUMMARY_MAX_TOKENS)
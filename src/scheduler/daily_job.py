@@ -10,7 +10,9 @@ from apscheduler.triggers.cron import CronTrigger
 
 from ..utils.config import config
 from ..utils.logger import logger
-from ..utils.redis_client import redis_client
+from ..utils.redis_keys import LATEST_SUMMARY
+from ..utils.summary_cache import summary_cache
+from ..utils.timing import mark_error, timed
 
 
 class DailyJobScheduler:
@@ -21,6 +23,7 @@ class DailyJobScheduler:
         self.scheduler = AsyncIOScheduler(timezone=config.SCHEDULER_TIMEZONE)
         self.project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
     
+    @timed
     async def dump_news_job(self):
         """Daily job to run standalone dumper process at 21:15."""
         try:
@@ -34,26 +37,25 @@ class DailyJobScheduler:
                 logger.info("Daily news dump job completed successfully")
             else:
                 logger.error("Daily news dump job failed")
+                mark_error()
             
         except Exception as e:
             logger.error(f"Daily news dump job failed: {e}")
+            mark_error()
     
+    @timed
     async def push_summary_job(self):
         """Daily job to push summaries to subscribers at 21:20."""
         try:
             logger.info("Starting daily summary push job at 21:20")
             
             # Get latest summary from Redis
-            from ..models.schemas import Summary
-            summary_data = redis_client.get_json("latest_summary")
+            summary = await summary_cache.read_async(LATEST_SUMMARY.key())
             
-            if not summary_data:
+            if not summary:
                 logger.warning("No summary available to push to subscribers")
                 return
             
-            # Create Summary object
-            summary = Summary(**summary_data)
-            
             # Send summary to all subscribers
             logger.info(f"Pushing summary to subscribers: {summary.summary_text[:50]}...")
             from ..telegram_bot.bot import bot
@@ -63,6 +65,7 @@ class DailyJobScheduler:
             
         except Exception as e:
             logger.error(f"Daily summary push job failed: {e}")
+            mark_error()
     
     async def run_standalone_dumper(self):
         """Run the standalone dumper process."""
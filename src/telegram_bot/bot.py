@@ -9,7 +9,12 @@ from telegram.error import TelegramError
 
 from ..utils.config import config
 from ..utils.logger import logger
-from ..utils.redis_client import redis_client
+from ..utils.metrics import PUSH_MESSAGES
+from ..utils.timing import mark_error, timed
+from ..utils.redis_client import async_redis_client
+from ..utils.redis_keys import LATEST_SUMMARY, SUBSCRIBERS, summary_key, user_key
+from ..utils.stats_snapshot import stats_snapshot
+from ..utils.summary_cache import summary_cache
 from ..llm_module.summarizer import NewsSummarizer
 from ..dumper.telegram_dumper import TelegramDumper
 from ..models.schemas import Summary
@@ -34,30 +39,65 @@ class MarketTwitsBot:
         escape_chars = r'_*[]()~`>#+-=|{}.!'
         return ''.join('\\' + char if char in escape_chars else char for char in text)
     
-    def get_latest_summary_from_redis(self):
+    async def get_latest_summary_from_redis(self):
         """Get latest summary from Redis."""
         try:
-            summary_data = redis_client.get_json("latest_summary")
-            if summary_data:
-                return Summary(**summary_data)
-            return None
+            return await summary_cache.read_async(LATEST_SUMMARY.key())
         except Exception as e:
             logger.error(f"Failed to get latest summary from Redis: {e}")
             return None
     
-    def get_summary_for_date_from_redis(self, target_date: datetime):
+    async def get_summary_for_date_from_redis(self, target_date: datetime):
         """Get summary for specific date from Redis."""
         try:
-            date_str = target_date.strftime('%Y%m%d')
-            redis_key = f"summary:{date_str}"
-            summary_data = redis_client.get_json(redis_key)
-            if summary_data:
-                return Summary(**summary_data)
+            return await summary_cache.read_async(summary_key(target_date))
+        except Exception as e:
+            logger.error(f"Failed to get summary for {target_date} from Redis: {e}")
             return None
+    
+    async def get_summary_for_date_or_latest_from_redis(self, target_date: datetime):
+        """Get summary for specific date from Redis, falling back to the latest one."""
+        try:
+            date_summary, latest_summary = await summary_cache.read_many_async(
+                [summary_key(target_date), LATEST_SUMMARY.key()]
+            )
+            return date_summary or latest_summary
         except Exception as e:
             logger.error(f"Failed to get summary for {target_date} from Redis: {e}")
             return None
     
+    async def _get_stats_snapshot(self) -> dict:
+        """Get the stats snapshot from Redis, building it from the news store if missing."""
+        snapshot = await stats_snapshot.get_async()
+        if snapshot is None:
+            logger.info("Stats snapshot missing, rebuilding from news store")
+            await asyncio.to_thread(self.dumper.refresh_stats_snapshot)
+            snapshot = await stats_snapshot.get_async()
+        if snapshot is None:
+            raise RuntimeError("Stats snapshot unavailable")
+        return snapshot
+    
+    async def _build_stats_message(self) -> str:
+        """Build the statistics message from the stats snapshot."""
+        snapshot = await self._get_stats_snapshot()
+        
+        # Get recent news count (last 7 days)
+        recent_count = stats_snapshot.recent_count(snapshot, days=7)
+        last_news_date = snapshot["last_news_date"]
+        
+        return f"""
+📊 <b>MarketTwits Statistics</b>
+
+📰 <b>News Data:</b>
+• Total news items: {snapshot["total_count"]:,}
+• Last 7 days: {recent_count:,}
+• Last updated: {last_news_date.strftime('%Y-%m-%d %H:%M') if last_news_date else 'Never'}
+
+👥 <b>Subscribers:</b> {snapshot["subscribers"]:,}
+
+🤖 <b>Bot Status:</b> ✅ Active
+            """
+    
     async def _handle_update(self, update: Update):
         """Handle incoming updates."""
         try:
@@ -139,13 +179,11 @@ class MarketTwitsBot:
         """Handle summary callback query."""
         try:
             if query.data == "latest_summary":
-                summary = self.get_latest_summary_from_redis()
+                summary = await self.get_latest_summary_from_redis()
             else:
                 # For summarization, we want news from the previous day by default
                 yesterday = datetime.now() - timedelta(days=1)
-                summary = self.get_summary_for_date_from_redis(yesterday)
-                if not summary:
-                    summary = self.get_latest_summary_from_redis()
+                summary = await self.get_summary_for_date_or_latest_from_redis(yesterday)
             
             if not summary:
                 await query.edit_message_text(
@@ -175,31 +213,9 @@ class MarketTwitsBot:
     async def _handle_callback_stats(self, query):
         """Handle stats callback query."""
         try:
-            total_news = self.dumper.get_news_count()
-            all_news = self.dumper.get_all_news()
-            
-            # Get recent news count (last 7 days)
-            from datetime import timedelta
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_news = [item for item in all_news if item.date >= week_ago]
-            
-            # Get subscriber count
-            subscribers = redis_client.get_set_members("subscribers")
+            stats_message = await self._build_stats_message()
             
-            stats_message = f"""
-📊 <b>MarketTwits Statistics</b>
-
-📰 <b>News Data:</b>
-• Total news items: {total_news:,}
-• Last 7 days: {len(recent_news):,}
-• Last updated: {all_news[-1].date.strftime('%Y-%m-%d %H:%M') if all_news else 'Never'}
-
-👥 <b>Subscribers:</b> {len(subscribers):,}
-
-🤖 <b>Bot Status:</b> ✅ Active
-            """
-            
-            await query.edit_message_text(stats_message, parse_mode='Markdown')
+            await query.edit_message_text(stats_message, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling callback stats: {e}")
@@ -238,8 +254,8 @@ class MarketTwitsBot:
         username = user.username
         
         # Check if user is already subscribed
-        redis_key = f"user:{user_id}"
-        existing_user = redis_client.get_json(redis_key)
+        redis_key = user_key(user_id)
+        existing_user = await async_redis_client.get_json(redis_key)
         
         if existing_user:
             message = f"👋 Welcome back, {user.first_name}!\n\n"
@@ -253,8 +269,9 @@ class MarketTwitsBot:
                 "subscribed_at": datetime.utcnow().isoformat(),
                 "is_active": True
             }
-            redis_client.set(redis_key, user_data)
-            redis_client.add_to_set("subscribers", str(user_id))
+            async with async_redis_client.pipeline() as pipe:
+                pipe.set(redis_key, user_data)
+                pipe.add_to_set(SUBSCRIBERS.key(), str(user_id))
             
             message = f"🎉 Welcome to MarketTwits Summarizer, {user.first_name}!\n\n"
             message += "You've been automatically subscribed to daily market summaries.\n\n"
@@ -304,8 +321,8 @@ class MarketTwitsBot:
         username = user.username
         
         # Check if already subscribed
-        redis_key = f"user:{user_id}"
-        existing_user = redis_client.get_json(redis_key)
+        redis_key = user_key(user_id)
+        existing_user = await async_redis_client.get_json(redis_key)
         
         if existing_user and existing_user.get("is_active", False):
             await update.message.reply_text("✅ You're already subscribed to daily summaries!")
@@ -317,8 +334,9 @@ class MarketTwitsBot:
                 "subscribed_at": datetime.utcnow().isoformat(),
                 "is_active": True
             }
-            redis_client.set(redis_key, user_data)
-            redis_client.add_to_set("subscribers", str(user_id))
+            async with async_redis_client.pipeline() as pipe:
+                pipe.set(redis_key, user_data)
+                pipe.add_to_set(SUBSCRIBERS.key(), str(user_id))
             
             await update.message.reply_text(
                 "🎉 Successfully subscribed to daily market summaries!\n\n"
@@ -332,9 +350,9 @@ class MarketTwitsBot:
         user_id = user.id
         
         # Unsubscribe the user
-        redis_key = f"user:{user_id}"
-        redis_client.delete(redis_key)
-        redis_client.redis_client.srem("subscribers", str(user_id))
+        async with async_redis_client.pipeline() as pipe:
+            pipe.delete(user_key(user_id))
+            pipe.remove_from_set(SUBSCRIBERS.key(), str(user_id))
         
         await update.message.reply_text(
             "😢 You've been unsubscribed from daily summaries.\n\n"
@@ -460,11 +478,9 @@ class MarketTwitsBot:
             if summary_type == "today":
                 # For summarization, we want news from the previous day by default
                 yesterday = datetime.now() - timedelta(days=1)
-                summary = self.get_summary_for_date_from_redis(yesterday)
-                if not summary:
-                    summary = self.get_latest_summary_from_redis()
+                summary = await self.get_summary_for_date_or_latest_from_redis(yesterday)
             else:
-                summary = self.get_latest_summary_from_redis()
+                summary = await self.get_latest_summary_from_redis()
             
             if not summary:
                 await update.message.reply_text(
@@ -494,29 +510,7 @@ class MarketTwitsBot:
     async def stats_command(self, update: Update):
         """Handle /stats command."""
         try:
-            total_news = self.dumper.get_news_count()
-            all_news = self.dumper.get_all_news()
-            
-            # Get recent news count (last 7 days)
-            from datetime import timedelta
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_news = [item for item in all_news if item.date >= week_ago]
-            
-            # Get subscriber count
-            subscribers = redis_client.get_set_members("subscribers")
-            
-            stats_message = f"""
-📊 <b>MarketTwits Statistics</b>
-
-📰 <b>News Data:</b>
-• Total news items: {total_news:,}
-• Last 7 days: {len(recent_news):,}
-• Last updated: {all_news[-1].date.strftime('%Y-%m-%d %H:%M') if all_news else 'Never'}
-
-👥 <b>Subscribers:</b> {len(subscribers):,}
-
-🤖 <b>Bot Status:</b> ✅ Active
-            """
+            stats_message = await self._build_stats_message()
             
             await update.message.reply_text(stats_message, parse_mode='HTML')
             
@@ -524,10 +518,11 @@ class MarketTwitsBot:
             logger.error(f"Error getting stats: {e}")
             await update.message.reply_text("❌ Couldn't fetch statistics right now.")
     
+    @timed
     async def send_summary_to_subscribers(self, summary):
         """Send summary to all subscribers."""
         try:
-            subscribers = redis_client.get_set_members("subscribers")
+            subscribers = await async_redis_client.get_set_members(SUBSCRIBERS.key())
             
             if not subscribers:
                 logger.info("No subscribers to notify")
@@ -545,6 +540,7 @@ class MarketTwitsBot:
             
             # Send to all subscribers
             success_count = 0
+            inactive_users = []
             for user_id_str in subscribers:
                 try:
                     user_id = int(user_id_str)
@@ -554,17 +550,25 @@ class MarketTwitsBot:
                         parse_mode='HTML'
                     )
                     success_count += 1
+                    PUSH_MESSAGES.inc(status="success")
                 except TelegramError as e:
+                    PUSH_MESSAGES.inc(status="failure")
                     logger.warning(f"Failed to send message to user {user_id_str}: {e}")
                     # Remove inactive users
                     if "chat not found" in str(e).lower() or "user is deactivated" in str(e).lower():
-                        redis_client.redis_client.srem("subscribers", user_id_str)
-                        redis_client.delete(f"user:{user_id_str}")
+                        inactive_users.append(user_id_str)
+            
+            if inactive_users:
+                async with async_redis_client.pipeline() as pipe:
+                    pipe.remove_from_set(SUBSCRIBERS.key(), *inactive_users)
+                    pipe.delete(*[user_key(user_id_str) for user_id_str in inactive_users])
+                logger.info(f"Removed {len(inactive_users)} inactive subscribers")
             
             logger.info(f"Sent summary to {success_count}/{len(subscribers)} subscribers")
             
         except Exception as e:
             logger.error(f"Error sending summary to subscribers: {e}")
+            mark_error()
     
     async def _poll_updates(self):
         """Poll for updates from Telegram."""
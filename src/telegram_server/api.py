@@ -1,9 +1,12 @@
 """FastAPI server for Telegram bot endpoints."""
 
+import asyncio
+import time
 from datetime import datetime
 from typing import List
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from ..models.schemas import (
     SubscriptionRequest, 
@@ -13,8 +16,13 @@ from ..models.schemas import (
 )
 from ..utils.config import config
 from ..utils.logger import logger
-from ..utils.redis_client import redis_client
+from ..utils.metrics import HTTP_REQUEST_DURATION, metrics
+from ..utils.timing import merge_snapshots, timings
+from ..utils.redis_client import async_redis_client
+from ..utils.redis_keys import DUMPER_METRICS, DUMPER_TIMINGS, LATEST_SUMMARY, SUBSCRIBERS, summary_key, user_key
+from ..utils.summary_cache import summary_cache
 from ..llm_module.summarizer import NewsSummarizer
+from ..llm_module.token_budget import token_budgeter
 from ..models.schemas import Summary
 
 
@@ -38,6 +46,26 @@ app.add_middleware(
 summarizer = NewsSummarizer()
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record request latency by route template."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The matched route is only known once routing has run
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -49,13 +77,41 @@ async def health_check():
     """Health check endpoint."""
     try:
         # Test Redis connection
-        redis_client.redis_client.ping()
-        return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+        if not await async_redis_client.ping():
+            raise ConnectionError("Redis ping failed")
+        return {
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "redis_pool": async_redis_client.pool_stats()
+        }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Metrics in the Prometheus text exposition format."""
+    # The nightly pipeline runs in the standalone dumper process, which leaves its samples in Redis
+    dumper_samples = await async_redis_client.get_json(DUMPER_METRICS.key())
+    return PlainTextResponse(metrics.render(dumper_samples), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/timings")
+async def get_timings():
+    """Wall time, call and error counts per instrumented function, including standalone dumper runs."""
+    dumper_rows = await async_redis_client.get_json(DUMPER_TIMINGS.key()) or []
+    return {"timings": merge_snapshots(timings.snapshot(), dumper_rows)}
+
+
+@app.delete("/timings")
+async def reset_timings():
+    """Reset the recorded timings."""
+    timings.reset()
+    await async_redis_client.delete(DUMPER_TIMINGS.key())
+    return {"message": "Timings reset"}
+
+
 @app.post("/subscribe", response_model=dict)
 async def subscribe_user(request: SubscriptionRequest):
     """Subscribe a user to receive daily summaries."""
@@ -68,12 +124,10 @@ async def subscribe_user(request: SubscriptionRequest):
             username=request.username
         )
         
-        # Save to Redis
-        redis_key = f"user:{request.user_id}"
-        redis_client.set(redis_key, subscription.model_dump())
-        
-        # Add to subscribers set
-        redis_client.add_to_set("subscribers", str(request.user_id))
+        # Save the user and add them to the subscribers set in one transaction
+        async with async_redis_client.pipeline() as pipe:
+            pipe.set(user_key(request.user_id), subscription)
+            pipe.add_to_set(SUBSCRIBERS.key(), str(request.user_id))
         
         logger.info(f"Successfully subscribed user {request.user_id}")
         
@@ -94,12 +148,10 @@ async def unsubscribe_user(user_id: int):
     try:
         logger.info(f"Unsubscribing user {user_id}")
         
-        # Remove from Redis
-        redis_key = f"user:{user_id}"
-        redis_client.delete(redis_key)
-        
-        # Remove from subscribers set
-        redis_client.redis_client.srem("subscribers", str(user_id))
+        # Remove the user and their subscribers set entry in one transaction
+        async with async_redis_client.pipeline() as pipe:
+            pipe.delete(user_key(user_id))
+            pipe.remove_from_set(SUBSCRIBERS.key(), str(user_id))
         
         logger.info(f"Successfully unsubscribed user {user_id}")
         
@@ -118,7 +170,7 @@ async def unsubscribe_user(user_id: int):
 async def get_subscribers():
     """Get list of all subscribers."""
     try:
-        subscribers = redis_client.get_set_members("subscribers")
+        subscribers = await async_redis_client.get_set_members(SUBSCRIBERS.key())
         return [int(user_id) for user_id in subscribers if user_id.isdigit()]
     except Exception as e:
         logger.error(f"Failed to get subscribers: {e}")
@@ -131,18 +183,15 @@ async def get_latest_summary():
     try:
         logger.info("Fetching latest summary from Redis")
         
-        # Get latest summary from Redis
-        summary_data = redis_client.get_json("latest_summary")
+        # Get latest summary through the in-process cache
+        summary = await summary_cache.read_async(LATEST_SUMMARY.key())
         
-        if not summary_data:
+        if not summary:
             return SummaryResponse(
                 success=False,
                 message="No summary available yet"
             )
         
-        # Convert to Summary object
-        summary = Summary(**summary_data)
-        
         return SummaryResponse(
             success=True,
             summary=summary,
@@ -167,19 +216,14 @@ async def get_summary_by_date(date: str):
         logger.info(f"Fetching summary for {date} from Redis")
         
         # Get summary from Redis by date
-        date_str = target_date.strftime('%Y%m%d')
-        redis_key = f"summary:{date_str}"
-        summary_data = redis_client.get_json(redis_key)
+        summary = await summary_cache.read_async(summary_key(target_date))
         
-        if not summary_data:
+        if not summary:
             return SummaryResponse(
                 success=False,
                 message=f"No summary available for {date}"
             )
         
-        # Convert to Summary object
-        summary = Summary(**summary_data)
-        
         return SummaryResponse(
             success=True,
             summary=summary,
@@ -197,25 +241,21 @@ async def get_summary_by_date(date: str):
 async def get_summary():
     """Get summary for today or latest available from Redis."""
     try:
-        # Try to get today's summary first
+        # Fetch today's summary and the latest one in a single round trip
         today = datetime.now()
-        date_str = today.strftime('%Y%m%d')
-        redis_key = f"summary:{date_str}"
-        summary_data = redis_client.get_json(redis_key)
+        today_summary, latest_summary = await summary_cache.read_many_async(
+            [summary_key(today), LATEST_SUMMARY.key()]
+        )
         
-        # If no summary for today, get the latest
-        if not summary_data:
-            summary_data = redis_client.get_json("latest_summary")
+        # If no summary for today, use the latest
+        summary = today_summary or latest_summary
         
-        if not summary_data:
+        if not summary:
             return SummaryResponse(
                 success=False,
                 message="No summary available"
             )
         
-        # Convert to Summary object
-        summary = Summary(**summary_data)
-        
         return SummaryResponse(
             success=True,
             summary=summary,
@@ -240,7 +280,7 @@ async def get_all_news(days_ago: int = 1, limit: int = 100):
         
         # Get news for the target date (same logic as summarization)
         dumper = TelegramDumper()
-        news_batch = dumper.get_news_for_date(target_date.date())
+        news_batch = dumper.get_news_for_date(target_date.date(), limit=limit)
         
         if not news_batch or not news_batch.items:
             return {
@@ -250,12 +290,12 @@ async def get_all_news(days_ago: int = 1, limit: int = 100):
                 "total_count": 0
             }
         
-        # Get limited number of items
-        news_items = news_batch.items[:limit]
+        # Only the first `limit` items were read from the store
+        news_items = news_batch.items
         
         return {
             "success": True,
-            "total_count": len(news_batch.items),
+            "total_count": dumper.get_news_count_for_date(target_date.date()),
             "returned_count": len(news_items),
             "date": target_date.date().isoformat(),
             "news_items": [item.model_dump() for item in news_items],
@@ -278,14 +318,9 @@ async def get_news_count(days_ago: int = 1):
         # For summarization, we want news from the previous day by default
         target_date = datetime.now() - timedelta(days=days_ago)
         
-        # Get news for the target date (same logic as summarization)
+        # Count news for the target date from the store index
         dumper = TelegramDumper()
-        news_batch = dumper.get_news_for_date(target_date.date())
-        
-        if not news_batch:
-            count = 0
-        else:
-            count = len(news_batch.items)
+        count = dumper.get_news_count_for_date(target_date.date())
         
         return {
             "success": True,
@@ -313,7 +348,7 @@ async def get_news_preview(days_ago: int = 1, limit: int = 10):
         
         # Get news for the target date
         dumper = TelegramDumper()
-        news_batch = dumper.get_news_for_date(target_date.date())
+        news_batch = dumper.get_news_for_date(target_date.date(), limit=limit)
         
         if not news_batch or not news_batch.items:
             return {
@@ -323,8 +358,8 @@ async def get_news_preview(days_ago: int = 1, limit: int = 10):
                 "total_count": 0
             }
         
-        # Get limited number of items for preview
-        preview_items = news_batch.items[:limit]
+        # Only the first `limit` items were read from the store
+        preview_items = news_batch.items
         
         # Show what would be sent to summarization
         news_texts = [item.text for item in preview_items if item.text.strip()]
@@ -333,7 +368,7 @@ async def get_news_preview(days_ago: int = 1, limit: int = 10):
             "success": True,
             "message": f"Preview of {len(preview_items)} news items for summarization",
             "date": target_date.date().isoformat(),
-            "total_available": len(news_batch.items),
+            "total_available": dumper.get_news_count_for_date(target_date.date()),
             "preview_count": len(preview_items),
             "news_items": [
                 {
@@ -367,7 +402,8 @@ async def get_summarization_preview(days_ago: int = 1):
         
         # Get news for the target date
         dumper = TelegramDumper()
-        news_batch = dumper.get_news_for_date(target_date.date())
+        # A whole-day read is a large HGETALL plus validation; keep it off the event loop
+        news_batch = await asyncio.to_thread(dumper.get_news_for_date, target_date.date())
         
         if not news_batch or not news_batch.items:
             return {
@@ -388,17 +424,19 @@ async def get_summarization_preview(days_ago: int = 1):
                 "news_count": 0
             }
         
-        # Limit text length to avoid token limits (same logic as summarizer)
-        max_text_length = 8000
-        combined_text = "\n\n".join(news_texts)
-        if len(combined_text) > max_text_length:
-            combined_text = combined_text[:max_text_length] + "..."
-            news_texts = [combined_text]
-        
-        # Create prompt preview
+        # Budget the prompt the same way the summarizer does
         summarizer = NewsSummarizer()
         last_date = target_date.strftime("%Y-%m-%d")
-        prompt = summarizer._create_summarization_prompt(news_texts, last_date)
+        plan = summarizer.plan_prompt(news_batch.items, last_date)
+        mode, chunks = plan.mode, plan.chunks
+        if mode == "map_reduce":
+            # Busy days are condensed chunk by chunk; show the first chunk's prompt
+            prompt = summarizer._create_chunk_prompt(chunks[0], last_date)
+        else:
+            prompt = summarizer._create_summarization_prompt(chunks[0], last_date)
+        included_count = sum(len(chunk) for chunk in chunks)
+        # Items left after collapsing and filtering; only the budget cuts below this
+        selected_count = len(news_texts) - plan.collapsed_count - plan.filtered_count
         
         return {
             "success": True,
@@ -406,8 +444,14 @@ async def get_summarization_preview(days_ago: int = 1):
             "date": target_date.date().isoformat(),
             "news_count": len(news_batch.items),
             "text_count": len(news_texts),
-            "total_text_length": len(combined_text),
-            "truncated": len(combined_text) > max_text_length,
+            "total_text_length": sum(len(text) for text in news_texts),
+            "mode": mode,
+            "chunk_count": len(chunks),
+            "collapsed_count": plan.collapsed_count,
+            "filtered_count": plan.filtered_count,
+            "included_count": included_count,
+            "prompt_tokens": token_budgeter.count(prompt),
+            "truncated": included_count < selected_count,
             "prompt_preview": prompt,
             "sample_news": [
                 {
@@ -425,8 +469,11 @@ async def get_summarization_preview(days_ago: int = 1):
 
 
 @app.post("/news/generate-summary")
-async def generate_summary_now(days_ago: int = 1):
-    """Generate summary for a specific date without caching (real-time)."""
+async def generate_summary_now(days_ago: int = 1, refresh: bool = False):
+    """Generate summary for a specific date without caching (real-time).
+    
+    With ``refresh`` the model is asked again instead of reusing cached replies.
+    """
     try:
         from datetime import datetime, timedelta
         from ..dumper.telegram_dumper import TelegramDumper
@@ -439,7 +486,8 @@ async def generate_summary_now(days_ago: int = 1):
         
         # Get news for the target date
         dumper = TelegramDumper()
-        news_batch = dumper.get_news_for_date(target_date.date())
+        # A whole-day read is a large HGETALL plus validation; keep it off the event loop
+        news_batch = await asyncio.to_thread(dumper.get_news_for_date, target_date.date())
         
         if not news_batch or not news_batch.items:
             return {
@@ -450,7 +498,7 @@ async def generate_summary_now(days_ago: int = 1):
         
         # Create summary using AI
         summarizer = NewsSummarizer()
-        summary = await summarizer.summarize_news(news_batch)
+        summary = await summarizer.summarize_news(news_batch, refresh=refresh)
         
         if not summary:
             return {
@@ -0,0 +1,43 @@
+"""Crash-safe file writing helpers."""
+
+import os
+import tempfile
+
+
+def fsync_directory(path: str):
+    """Flush a directory entry so renames inside it survive a crash."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: bytes):
+    """Replace a file with new contents via a synced temp file and rename.
+
+    Readers see either the old or the new contents, never a truncated file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    fsync_directory(directory)
+
+
+def append_synced(path: str, data: bytes):
+    """Append data to a file and flush it to disk."""
+    with open(path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
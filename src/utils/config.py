@@ -24,10 +24,22 @@ class Config:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
     
-    # Redis Configuration
+    # Redis Configuration (REDIS_BACKEND=memory keeps data in process, for tests and local runs)
+    REDIS_BACKEND: str = os.getenv("REDIS_BACKEND", "redis")
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "5"))
+    REDIS_SOCKET_KEEPALIVE: bool = os.getenv("REDIS_SOCKET_KEEPALIVE", "true").lower() == "true"
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+    REDIS_RETRY_ATTEMPTS: int = int(os.getenv("REDIS_RETRY_ATTEMPTS", "3"))
+    REDIS_RETRY_BACKOFF_BASE: float = float(os.getenv("REDIS_RETRY_BACKOFF_BASE", "0.1"))
+    REDIS_RETRY_BACKOFF_CAP: float = float(os.getenv("REDIS_RETRY_BACKOFF_CAP", "2"))
+    REDIS_SERIALIZER: str = os.getenv("REDIS_SERIALIZER", "orjson")
+    REDIS_COMPRESSION: str = os.getenv("REDIS_COMPRESSION", "zlib")
+    REDIS_COMPRESSION_THRESHOLD: int = int(os.getenv("REDIS_COMPRESSION_THRESHOLD", "4096"))
     
     # Server Configuration
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -36,10 +48,46 @@ class Config:
     # Scheduler Configuration
     SCHEDULER_TIMEZONE: str = os.getenv("SCHEDULER_TIMEZONE", "Europe/Vilnius")
     
+    # Model context window and tokens reserved for the summary completion
+    OPENAI_CONTEXT_TOKENS: int = int(os.getenv("OPENAI_CONTEXT_TOKENS", "16385"))
+    SUMMARY_MAX_TOKENS: int = int(os.getenv("SUMMARY_MAX_TOKENS", "500"))
+    
+    # Cache of LLM responses keyed by a hash of the request
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "604800"))
+    
+    # Near-duplicate collapsing of posts (max SimHash distance in bits)
+    DEDUP_ENABLED: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_MAX_DISTANCE: int = int(os.getenv("DEDUP_MAX_DISTANCE", "8"))
+    
+    # Local relevance pre-filter applied before prompts are built
+    RELEVANCE_FILTER_ENABLED: bool = os.getenv("RELEVANCE_FILTER_ENABLED", "true").lower() == "true"
+    RELEVANCE_MIN_SCORE: float = float(os.getenv("RELEVANCE_MIN_SCORE", "-1.0"))
+    
+    # Map-reduce summarization of days that exceed one prompt
+    SUMMARY_MAP_REDUCE: bool = os.getenv("SUMMARY_MAP_REDUCE", "true").lower() == "true"
+    SUMMARY_CHUNK_TOKENS: int = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+    SUMMARY_MAX_CONCURRENCY: int = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+    
+    # In-process summary cache
+    SUMMARY_CACHE_SIZE: int = int(os.getenv("SUMMARY_CACHE_SIZE", "64"))
+    SUMMARY_CACHE_TTL: int = int(os.getenv("SUMMARY_CACHE_TTL", "300"))
+    
     # File paths
     DATA_DIR: str = os.getenv("DATA_DIR", "data")
     LOGS_DIR: str = os.getenv("LOGS_DIR", "logs")
     
+    # Logging configuration
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE_LEVEL: str = os.getenv("LOG_FILE_LEVEL", "DEBUG")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_ENQUEUE: bool = os.getenv("LOG_ENQUEUE", "true").lower() == "true"
+    LOG_MODULE_LEVELS: str = os.getenv("LOG_MODULE_LEVELS", "")
+    REDIS_DEBUG_LOG_SAMPLE_RATE: int = int(os.getenv("REDIS_DEBUG_LOG_SAMPLE_RATE", "100"))
+    
+    # News storage configuration (0 disables automatic archiving)
+    NEWS_ARCHIVE_AFTER_DAYS: int = int(os.getenv("NEWS_ARCHIVE_AFTER_DAYS", "0"))
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate that all required configuration is present."""
@@ -1,22 +1,90 @@
 """Logging configuration for the MarketTwits Summarizer."""
 
+import itertools
 import os
 import sys
+from typing import Dict
 from loguru import logger
 from .config import config
 
 
+class LogSampler:
+    """Let through one in every ``rate`` occurrences of a high-frequency log line.
+
+    Check ``sample()`` before calling the logger so that skipped lines cost
+    neither message formatting nor loguru's record creation.
+    """
+
+    def __init__(self, rate: int = 1):
+        """Initialize the sampler (a rate of 1 or less keeps every line)."""
+        self.rate = max(1, rate)
+        self._counter = itertools.count()
+
+    def sample(self) -> bool:
+        """Return whether the current occurrence should be logged."""
+        if self.rate == 1:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """Parse "module=LEVEL,other.module=LEVEL" into a mapping."""
+    levels = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        module, _, level = item.partition("=")
+        if not level.strip():
+            raise ValueError(f"Invalid module log level '{item.strip()}', expected module=LEVEL")
+        levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+def _effective_level(module: str, default: str, module_levels: Dict[str, str]) -> str:
+    """Resolve a module's level the way loguru's filter dict does: longest matching prefix wins."""
+    matches = [name for name in module_levels if module == name or module.startswith(name + ".")]
+    return module_levels[max(matches, key=len)] if matches else default
+
+
+def level_enabled(level: str, module: str) -> bool:
+    """Return whether the console or log file sink keeps ``level`` lines from ``module``."""
+    module_levels = parse_module_levels(config.LOG_MODULE_LEVELS)
+    level_no = logger.level(level).no
+    return any(
+        level_no >= logger.level(_effective_level(module, default, module_levels)).no
+        for default in (config.LOG_LEVEL, config.LOG_FILE_LEVEL)
+    )
+
+
+def _sink_options(level: str, module_levels: Dict[str, str]) -> dict:
+    """Build the level, filter and format options shared by every sink."""
+    # The sink level must let through anything a module override asks for;
+    # the filter then applies the sink default to every other module
+    lowest = min([level, *module_levels.values()], key=lambda name: logger.level(name).no)
+    options = {
+        "level": lowest,
+        "filter": {"": level, **module_levels},
+        "enqueue": config.LOG_ENQUEUE
+    }
+    if config.LOG_FORMAT == "json":
+        options["serialize"] = True
+    return options
+
+
 def setup_logger():
     """Set up the logger with appropriate configuration."""
     # Remove default handler
     logger.remove()
     
+    module_levels = parse_module_levels(config.LOG_MODULE_LEVELS)
+    plain_format = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+    
     # Add console handler with color
     logger.add(
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO",
-        colorize=True
+        colorize=config.LOG_FORMAT != "json",
+        **_sink_options(config.LOG_LEVEL, module_levels)
     )
     
     # Add file handler for all logs
@@ -25,22 +93,22 @@ def setup_logger():
     
     logger.add(
         log_file,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG",
+        format=plain_format,
         rotation="1 day",
         retention="30 days",
-        compression="zip"
+        compression="zip",
+        **_sink_options(config.LOG_FILE_LEVEL, module_levels)
     )
     
     # Add error file handler
     error_log_file = os.path.join(config.LOGS_DIR, "errors.log")
     logger.add(
         error_log_file,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="ERROR",
+        format=plain_format,
         rotation="1 day",
         retention="90 days",
-        compression="zip"
+        compression="zip",
+        **_sink_options("ERROR", {})
     )
     
     return logger
@@ -0,0 +1,307 @@
+"""In-memory stand-in for Redis, selected with REDIS_BACKEND=memory."""
+
+import asyncio
+import fnmatch
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Commands a pipeline may queue; everything else is a plain attribute
+PIPELINE_COMMANDS = (
+    "set", "get", "mget", "delete", "exists", "expire", "hset", "hgetall", "hincrby",
+    "sadd", "srem", "scard", "smembers", "publish"
+)
+
+
+class MemoryStore:
+    """Process-wide key space shared by the sync and async in-memory clients.
+
+    Values follow redis-py's ``decode_responses=True`` behaviour: strings are
+    stored as strings, hashes as dicts of strings and sets as sets of strings.
+    Expired keys are dropped lazily when they are next accessed.
+    """
+
+    def __init__(self):
+        """Create an empty key space."""
+        self.data: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+        self.lock = threading.RLock()
+        self.subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def _live(self, key: str) -> bool:
+        """Drop the key if it has expired and report whether it exists."""
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _container(self, key: str, factory):
+        """Get the hash or set stored at a key, creating it if missing."""
+        if not self._live(key):
+            self.data[key] = factory()
+        return self.data[key]
+
+    def ping(self) -> bool:
+        """Report that the store is reachable."""
+        return True
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        """Store a string value."""
+        with self.lock:
+            self.data[key] = str(value)
+            self.expires.pop(key, None)
+            if ex:
+                self.expires[key] = time.monotonic() + ex
+            return True
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a string value."""
+        with self.lock:
+            return self.data[key] if self._live(key) else None
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several string values."""
+        with self.lock:
+            return [self.get(key) for key in keys]
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys and return how many existed."""
+        with self.lock:
+            deleted = 0
+            for key in keys:
+                if self._live(key):
+                    del self.data[key]
+                    deleted += 1
+                self.expires.pop(key, None)
+            return deleted
+
+    def exists(self, *keys: str) -> int:
+        """Count the given keys that exist."""
+        with self.lock:
+            return sum(1 for key in keys if self._live(key))
+
+    def expire(self, key: str, seconds: int) -> bool:
+        """Set a time-to-live on an existing key."""
+        with self.lock:
+            if not self._live(key):
+                return False
+            self.expires[key] = time.monotonic() + seconds
+            return True
+
+    def ttl(self, key: str) -> int:
+        """Get the remaining time-to-live (-1 without expiry, -2 if missing)."""
+        with self.lock:
+            if not self._live(key):
+                return -2
+            expires_at = self.expires.get(key)
+            return -1 if expires_at is None else max(0, round(expires_at - time.monotonic()))
+
+    def hset(self, name: str, mapping: dict) -> int:
+        """Set hash fields and return how many were new."""
+        with self.lock:
+            hash_value = self._container(name, dict)
+            added = sum(1 for field in mapping if str(field) not in hash_value)
+            hash_value.update({str(field): str(value) for field, value in mapping.items()})
+            return added
+
+    def hgetall(self, name: str) -> dict:
+        """Get all fields of a hash."""
+        with self.lock:
+            return dict(self.data[name]) if self._live(name) else {}
+
+    def hincrby(self, name: str, field: str, amount: int = 1) -> int:
+        """Increment an integer hash field."""
+        with self.lock:
+            hash_value = self._container(name, dict)
+            value = int(hash_value.get(field, 0)) + amount
+            hash_value[field] = str(value)
+            return value
+
+    def sadd(self, name: str, *values) -> int:
+        """Add members to a set and return how many were new."""
+        with self.lock:
+            members = self._container(name, set)
+            new = {str(value) for value in values} - members
+            members.update(new)
+            return len(new)
+
+    def srem(self, name: str, *values) -> int:
+        """Remove members from a set and return how many existed."""
+        with self.lock:
+            if not self._live(name):
+                return 0
+            members = self.data[name]
+            removed = {str(value) for value in values} & members
+            members.difference_update(removed)
+            if not members:
+                self.delete(name)
+            return len(removed)
+
+    def scard(self, name: str) -> int:
+        """Count the members of a set."""
+        with self.lock:
+            return len(self.data[name]) if self._live(name) else 0
+
+    def smembers(self, name: str) -> set:
+        """Get the members of a set."""
+        with self.lock:
+            return set(self.data[name]) if self._live(name) else set()
+
+    def keys(self, pattern: str = "*") -> List[str]:
+        """List keys matching a glob pattern."""
+        with self.lock:
+            return [key for key in list(self.data) if self._live(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        """Iterate over keys matching a glob pattern."""
+        return iter(self.keys(match))
+
+    def memory_usage(self, key: str, samples: Optional[int] = None) -> Optional[int]:
+        """Approximate the bytes a key and its value take."""
+        with self.lock:
+            if not self._live(key):
+                return None
+            value = self.data[key]
+            if isinstance(value, dict):
+                size = sum(len(field) + len(item) for field, item in value.items())
+            elif isinstance(value, set):
+                size = sum(len(member) for member in value)
+            else:
+                size = len(value)
+            return len(key) + size
+
+    def publish(self, channel: str, message: str) -> int:
+        """Deliver a message to the subscribers of a channel."""
+        with self.lock:
+            queues = list(self.subscribers.get(channel, []))
+        payload = {"type": "message", "channel": channel, "data": message, "pattern": None}
+        for loop, queue in queues:
+            loop.call_soon_threadsafe(queue.put_nowait, payload)
+        return len(queues)
+
+    def flushall(self):
+        """Remove every key."""
+        with self.lock:
+            self.data.clear()
+            self.expires.clear()
+
+
+class MemoryPipeline:
+    """Queued commands applied to the store in one step."""
+
+    def __init__(self, store: MemoryStore):
+        """Create an empty pipeline."""
+        self._store = store
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        """Queue a store command instead of running it."""
+        if name not in PIPELINE_COMMANDS:
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        """Run the queued commands atomically."""
+        with self._store.lock:
+            results = [getattr(self._store, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+    def reset(self):
+        """Discard queued commands."""
+        self._commands = []
+
+
+class MemoryRedis:
+    """Synchronous client over the in-memory store, mirroring redis.Redis."""
+
+    def __init__(self, store: MemoryStore):
+        """Bind the client to a store."""
+        self._store = store
+
+    def __getattr__(self, name: str):
+        """Forward commands to the store."""
+        return getattr(self._store, name)
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        """Create a pipeline."""
+        return MemoryPipeline(self._store)
+
+
+class AsyncMemoryPipeline(MemoryPipeline):
+    """Pipeline whose execution is awaited, mirroring redis.asyncio pipelines."""
+
+    async def execute(self) -> List[Any]:
+        """Run the queued commands atomically."""
+        return MemoryPipeline.execute(self)
+
+    async def reset(self):
+        """Discard queued commands."""
+        MemoryPipeline.reset(self)
+
+
+class AsyncMemoryPubSub:
+    """Pub/sub subscription on the in-memory store."""
+
+    def __init__(self, store: MemoryStore):
+        """Create a subscription without channels."""
+        self._store = store
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: List[str] = []
+
+    async def subscribe(self, *channels: str):
+        """Start receiving messages published on the channels."""
+        entry = (asyncio.get_running_loop(), self._queue)
+        with self._store.lock:
+            for channel in channels:
+                self._store.subscribers.setdefault(channel, []).append(entry)
+                self._channels.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> Optional[dict]:
+        """Wait up to ``timeout`` seconds for the next message."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        """Stop receiving messages."""
+        with self._store.lock:
+            for channel in self._channels:
+                self._store.subscribers[channel] = [
+                    entry for entry in self._store.subscribers[channel] if entry[1] is not self._queue
+                ]
+        self._channels = []
+
+
+class AsyncMemoryRedis:
+    """Asyncio client over the in-memory store, mirroring redis.asyncio.Redis."""
+
+    def __init__(self, store: MemoryStore):
+        """Bind the client to a store."""
+        self._store = store
+
+    def __getattr__(self, name: str):
+        """Forward commands to the store as coroutines."""
+        command = getattr(self._store, name)
+
+        async def run(*args, **kwargs):
+            return command(*args, **kwargs)
+        return run
+
+    def pipeline(self, transaction: bool = True) -> AsyncMemoryPipeline:
+        """Create a pipeline."""
+        return AsyncMemoryPipeline(self._store)
+
+    def pubsub(self) -> AsyncMemoryPubSub:
+        """Create a pub/sub subscription."""
+        return AsyncMemoryPubSub(self._store)
+
+
+# Key space shared by every in-memory client in the process
+memory_store = MemoryStore()
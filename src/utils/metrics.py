@@ -0,0 +1,260 @@
+"""Prometheus-style metrics collected in process and rendered for /metrics."""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from a Redis round trip up to a slow HTTP call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets for long-running steps such as fetching a channel or calling the LLM
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format a label set as {name="value",...}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, keeping integers free of a decimal point."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """A named metric with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        """Initialize the metric without samples."""
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Order label values by the declared label names."""
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        """Render the metric's sample lines."""
+        raise NotImplementedError
+
+    def export(self) -> list:
+        """Dump the samples as JSON-friendly [label values, value...] entries."""
+        raise NotImplementedError
+
+    def merge(self, entries: list):
+        """Add exported samples, e.g. from another process, to this metric."""
+        raise NotImplementedError
+
+    def copy(self) -> "Metric":
+        """Return an independent metric holding the same samples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric with its HELP and TYPE header."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        """Initialize the counter."""
+        super().__init__(name, description, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the count for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Get the current count for a label set."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        """Render one line per label set."""
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+    def export(self) -> list:
+        """Dump one [label values, count] entry per label set."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, entries: list):
+        """Add exported counts to this counter."""
+        with self._lock:
+            for key, value in entries:
+                key = tuple(key)
+                self._values[key] = self._values.get(key, 0) + value
+
+    def copy(self) -> "Counter":
+        """Return an independent counter with the same counts."""
+        counter = Counter(self.name, self.description, self.label_names)
+        counter.merge(self.export())
+        return counter
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize the histogram with sorted upper bounds."""
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum and count
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        """Get the number of observations for a label set."""
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        """Render bucket, sum and count lines per label set."""
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def export(self) -> list:
+        """Dump one [label values, bucket counts, sum] entry per label set."""
+        with self._lock:
+            return [[list(key), list(counts), total[0]] for key, (counts, total) in self._values.items()]
+
+    def merge(self, entries: list):
+        """Add exported observations to this histogram, skipping entries with other buckets."""
+        with self._lock:
+            for key, counts, total in entries:
+                if len(counts) != len(self.buckets) + 1:
+                    continue
+                own_counts, own_total = self._values.setdefault(tuple(key), ([0] * (len(self.buckets) + 1), [0.0]))
+                for index, count in enumerate(counts):
+                    own_counts[index] += count
+                own_total[0] += total
+
+    def copy(self) -> "Histogram":
+        """Return an independent histogram with the same observations."""
+        histogram = Histogram(self.name, self.description, self.label_names, self.buckets)
+        histogram.merge(self.export())
+        return histogram
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in the text exposition format."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, refusing duplicate names."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, description, labels))
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def export(self) -> Dict[str, list]:
+        """Dump every metric's samples by metric name."""
+        return {name: metric.export() for name, metric in self._metrics.items()}
+
+    def merge(self, exported: Dict[str, list]):
+        """Add another registry's exported samples to the matching metrics."""
+        for name, entries in exported.items():
+            if name in self._metrics:
+                self._metrics[name].merge(entries)
+
+    def render(self, extra: Optional[Dict[str, list]] = None) -> str:
+        """Render every metric for a Prometheus scrape.
+
+        ``extra`` holds samples exported by another process, such as the
+        standalone dumper; they are added to this process's own samples.
+        """
+        rendered = []
+        for name, metric in self._metrics.items():
+            if extra and name in extra:
+                metric = metric.copy()
+                metric.merge(extra[name])
+            rendered.append(metric.render())
+        return "\n".join(rendered) + "\n"
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+REDIS_COMMANDS = metrics.counter(
+    "redis_commands_total", "Redis commands sent by outcome", ("command", "status")
+)
+REDIS_COMMAND_DURATION = metrics.histogram(
+    "redis_command_duration_seconds", "Redis command latency", ("command",)
+)
+OPENAI_REQUEST_DURATION = metrics.histogram(
+    "openai_request_duration_seconds", "OpenAI chat completion latency", ("model", "status"), SLOW_BUCKETS
+)
+OPENAI_TOKENS = metrics.counter(
+    "openai_tokens_total", "Tokens reported by OpenAI usage", ("model", "type")
+)
+LLM_CACHE_REQUESTS = metrics.counter(
+    "llm_cache_requests_total", "LLM response cache lookups by result", ("result",)
+)
+DUMPER_FETCH_DURATION = metrics.histogram(
+    "dumper_fetch_duration_seconds", "Time to fetch messages from the Telegram channel", ("status",), SLOW_BUCKETS
+)
+DUMPER_MESSAGES = metrics.counter(
+    "dumper_messages_total", "Messages fetched from the Telegram channel"
+)
+PUSH_MESSAGES = metrics.counter(
+    "push_messages_total", "Summary pushes to subscribers by outcome", ("status",)
+)
@@ -1,45 +1,217 @@
 """Redis client for caching and data storage."""
 
-import json
 import pickle
-from typing import Any, Optional, Union
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 import redis
+import redis.asyncio
+import redis.asyncio.retry
+import redis.retry
+from redis.backoff import ExponentialBackoff
+from pydantic import BaseModel
 from .config import config
-from .logger import logger
+from .logger import LogSampler, level_enabled, logger
+from .memory_redis import AsyncMemoryRedis, MemoryRedis, memory_store
+from .metrics import REDIS_COMMAND_DURATION, REDIS_COMMANDS
+from .timing import timings
+from .redis_codec import redis_codec
+
+# Per-command debug lines are sampled so logging cost stays flat under load
+_debug_sampler = LogSampler(config.REDIS_DEBUG_LOG_SAMPLE_RATE)
+_debug_enabled = level_enabled("DEBUG", __name__)
+
+
+def _sampled_debug(message: str, *args):
+    """Log a sampled per-command debug line, formatting it only if it is kept."""
+    if _debug_enabled and _debug_sampler.sample():
+        logger.opt(depth=1).debug(message, *args)
+
+
+def _pool_options(retry_class) -> dict:
+    """Build connection pool options from the Redis settings in Config."""
+    return {
+        "host": config.REDIS_HOST,
+        "port": config.REDIS_PORT,
+        "db": config.REDIS_DB,
+        "decode_responses": True,
+        "max_connections": config.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": config.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": config.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": config.REDIS_SOCKET_KEEPALIVE,
+        "health_check_interval": config.REDIS_HEALTH_CHECK_INTERVAL,
+        "retry": retry_class(
+            ExponentialBackoff(cap=config.REDIS_RETRY_BACKOFF_CAP, base=config.REDIS_RETRY_BACKOFF_BASE),
+            config.REDIS_RETRY_ATTEMPTS
+        )
+    }
+
+
+def _pool_stats(pool) -> dict:
+    """Report connection usage of a pool."""
+    if pool is None:
+        return {"backend": config.REDIS_BACKEND}
+    in_use = len(pool._in_use_connections)
+    idle = len(pool._available_connections)
+    return {
+        "backend": config.REDIS_BACKEND,
+        "max_connections": pool.max_connections,
+        "created_connections": in_use + idle,
+        "in_use_connections": in_use,
+        "idle_connections": idle
+    }
+
+
+def _observe_command(command: str, started: float, status: str):
+    """Record the outcome and latency of one Redis command as a metric and a timing."""
+    elapsed = time.perf_counter() - started
+    REDIS_COMMANDS.inc(command=command, status=status)
+    REDIS_COMMAND_DURATION.observe(elapsed, command=command)
+    timings.record(f"redis.{command}", elapsed, status == "error")
+
+
+class InstrumentedRedis:
+    """Proxy around a redis-py client that records metrics for every command.
+    
+    Pipelines, pub/sub and scans are passed through untouched; pipelines
+    are recorded as a single "pipeline" command when they execute.
+    """
+    
+    UNTIMED = frozenset({"pipeline", "pubsub", "scan_iter", "close", "aclose", "connection_pool"})
+    
+    def __init__(self, client, is_async: bool = False):
+        """Wrap a sync or asyncio redis-py client."""
+        self._client = client
+        self._is_async = is_async
+    
+    def __getattr__(self, name: str):
+        """Return the client attribute, timing it if it is a command."""
+        attr = getattr(self._client, name)
+        if name in self.UNTIMED or not callable(attr):
+            return attr
+        
+        if self._is_async:
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = await attr(*args, **kwargs)
+                except Exception:
+                    _observe_command(name, started, "error")
+                    raise
+                _observe_command(name, started, "ok")
+                return result
+            return timed_async
+        
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception:
+                _observe_command(name, started, "error")
+                raise
+            _observe_command(name, started, "ok")
+            return result
+        return timed
 
 
 class RedisClient:
     """Redis client wrapper for the MarketTwits Summarizer."""
     
     def __init__(self):
-        """Initialize Redis connection."""
-        self.redis_client = redis.Redis(
-            host=config.REDIS_HOST,
-            port=config.REDIS_PORT,
-            db=config.REDIS_DB,
-            decode_responses=True
-        )
-        self._test_connection()
+        """Create the client; the connection is opened on first use or by connect()."""
+        self.pool = None
+        self._redis = None
     
-    def _test_connection(self):
-        """Test Redis connection."""
+    @property
+    def redis_client(self):
+        """Get the underlying redis-py client, connecting on first use."""
+        if self._redis is None:
+            self.connect()
+        return self._redis
+    
+    @redis_client.setter
+    def redis_client(self, client):
+        """Replace the underlying redis-py client."""
+        self._redis = client
+    
+    def connect(self) -> "RedisClient":
+        """Open the configured backend and check that it responds."""
+        if self._redis is not None:
+            return self
+        
+        if config.REDIS_BACKEND == "memory":
+            self._redis = InstrumentedRedis(MemoryRedis(memory_store))
+            logger.info("Using in-memory Redis backend")
+            return self
+        
+        # Pooled connections are health-checked when idle and commands are retried
+        # with backoff on connection errors, so a Redis restart is ridden out
+        pool = redis.ConnectionPool(**_pool_options(redis.retry.Retry))
+        client = redis.Redis(connection_pool=pool)
         try:
-            self.redis_client.ping()
+            client.ping()
             logger.info("Redis connection established successfully")
         except redis.ConnectionError as e:
             logger.error(f"Failed to connect to Redis: {e}")
+            pool.disconnect()
             raise
+        
+        self.pool = pool
+        self._redis = InstrumentedRedis(client)
+        return self
+    
+    def pool_stats(self) -> dict:
+        """Get connection pool metrics."""
+        return _pool_stats(self.pool)
+    
+    @staticmethod
+    def _serialize(value: Any) -> str:
+        """Convert a value to the string stored in Redis."""
+        if isinstance(value, (dict, list, BaseModel)):
+            return redis_codec.encode(value)
+        if not isinstance(value, str):
+            return str(value)
+        return value
+    
+    @staticmethod
+    def _parse_json(key: str, value: Optional[str]) -> Optional[Any]:
+        """Decode a structured value read from Redis."""
+        try:
+            if value:
+                return redis_codec.decode(value)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to parse JSON for key '{key}': {e}")
+            return None
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = True) -> Iterator["RedisPipeline"]:
+        """Queue commands and execute them in one round trip when the block exits.
+        
+        With ``transaction`` the commands run atomically in MULTI/EXEC. Their
+        results are available in ``results`` after the block.
+        """
+        pipeline = RedisPipeline(self.redis_client.pipeline(transaction=transaction))
+        try:
+            yield pipeline
+            started = time.perf_counter()
+            try:
+                pipeline.results = pipeline.pipe.execute()
+            except Exception:
+                _observe_command("pipeline", started, "error")
+                raise
+            _observe_command("pipeline", started, "ok")
+            _sampled_debug("Executed pipeline of {} commands in Redis", len(pipeline.results))
+        finally:
+            pipeline.pipe.reset()
     
     def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         """Set a key-value pair in Redis."""
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value, default=str)
-            elif not isinstance(value, str):
-                value = str(value)
+            value = self._serialize(value)
             
             result = self.redis_client.set(key, value, ex=expire)
-            logger.debug(f"Set key '{key}' in Redis")
+            _sampled_debug("Set key '{}' in Redis", key)
             return result
         except Exception as e:
             logger.error(f"Failed to set key '{key}' in Redis: {e}")
@@ -50,7 +222,7 @@ class RedisClient:
         try:
             value = self.redis_client.get(key)
             if value:
-                logger.debug(f"Retrieved key '{key}' from Redis")
+                _sampled_debug("Retrieved key '{}' from Redis", key)
             return value
         except Exception as e:
             logger.error(f"Failed to get key '{key}' from Redis: {e}")
@@ -58,20 +230,34 @@ class RedisClient:
     
     def get_json(self, key: str) -> Optional[Any]:
         """Get and parse JSON value from Redis."""
+        return self._parse_json(key, self.get(key))
+    
+    def mget_json(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get and parse several JSON values from Redis in one round trip."""
         try:
-            value = self.get(key)
-            if value:
-                return json.loads(value)
-            return None
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON for key '{key}': {e}")
-            return None
+            values = self.redis_client.mget(keys)
+            _sampled_debug("Retrieved {} keys from Redis", len(keys))
+            return [self._parse_json(key, value) for key, value in zip(keys, values)]
+        except Exception as e:
+            logger.error(f"Failed to get keys {keys} from Redis: {e}")
+            return [None] * len(keys)
+    
+    def mset_json(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """Set several values in Redis atomically in one round trip."""
+        try:
+            with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, expire=expire)
+            return all(pipe.results)
+        except Exception as e:
+            logger.error(f"Failed to set keys {list(mapping)} in Redis: {e}")
+            return False
     
     def delete(self, key: str) -> bool:
         """Delete a key from Redis."""
         try:
             result = self.redis_client.delete(key)
-            logger.debug(f"Deleted key '{key}' from Redis")
+            _sampled_debug("Deleted key '{}' from Redis", key)
             return bool(result)
         except Exception as e:
             logger.error(f"Failed to delete key '{key}' from Redis: {e}")
@@ -85,11 +271,44 @@ class RedisClient:
             logger.error(f"Failed to check existence of key '{key}' in Redis: {e}")
             return False
     
+    def expire(self, key: str, seconds: int) -> bool:
+        """Set a time-to-live on a key in Redis."""
+        try:
+            result = self.redis_client.expire(key, seconds)
+            _sampled_debug("Set expiry of {}s on key '{}' in Redis", seconds, key)
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Failed to set expiry on key '{key}' in Redis: {e}")
+            return False
+    
+    def ttl(self, key: str) -> int:
+        """Get the remaining time-to-live of a key (-1 without expiry, -2 if missing)."""
+        try:
+            return self.redis_client.ttl(key)
+        except Exception as e:
+            logger.error(f"Failed to get TTL of key '{key}' from Redis: {e}")
+            return -2
+    
+    def scan_keys(self, pattern: str = "*", count: int = 1000) -> Iterator[str]:
+        """Iterate over keys matching a pattern without blocking the server."""
+        try:
+            yield from self.redis_client.scan_iter(match=pattern, count=count)
+        except Exception as e:
+            logger.error(f"Failed to scan keys matching '{pattern}' in Redis: {e}")
+    
+    def memory_usage(self, key: str) -> Optional[int]:
+        """Get the number of bytes a key and its value take in Redis."""
+        try:
+            return self.redis_client.memory_usage(key)
+        except Exception as e:
+            logger.error(f"Failed to get memory usage of key '{key}' in Redis: {e}")
+            return None
+    
     def set_hash(self, name: str, mapping: dict) -> bool:
         """Set a hash in Redis."""
         try:
             result = self.redis_client.hset(name, mapping=mapping)
-            logger.debug(f"Set hash '{name}' in Redis")
+            _sampled_debug("Set hash '{}' in Redis", name)
             return bool(result)
         except Exception as e:
             logger.error(f"Failed to set hash '{name}' in Redis: {e}")
@@ -100,7 +319,7 @@ class RedisClient:
         try:
             result = self.redis_client.hgetall(name)
             if result:
-                logger.debug(f"Retrieved hash '{name}' from Redis")
+                _sampled_debug("Retrieved hash '{}' from Redis", name)
             return result
         except Exception as e:
             logger.error(f"Failed to get hash '{name}' from Redis: {e}")
@@ -110,22 +329,325 @@ class RedisClient:
         """Add values to a set in Redis."""
         try:
             result = self.redis_client.sadd(name, *values)
-            logger.debug(f"Added {result} values to set '{name}' in Redis")
+            _sampled_debug("Added {} values to set '{}' in Redis", result, name)
             return result
         except Exception as e:
             logger.error(f"Failed to add values to set '{name}' in Redis: {e}")
             return 0
     
+    def remove_from_set(self, name: str, *values) -> int:
+        """Remove values from a set in Redis."""
+        try:
+            result = self.redis_client.srem(name, *values)
+            _sampled_debug("Removed {} values from set '{}' in Redis", result, name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to remove values from set '{name}' in Redis: {e}")
+            return 0
+    
+    def count_set_members(self, name: str) -> int:
+        """Get the number of members of a set in Redis."""
+        try:
+            return self.redis_client.scard(name)
+        except Exception as e:
+            logger.error(f"Failed to count members of set '{name}' in Redis: {e}")
+            return 0
+    
+    def publish(self, channel: str, message: str) -> int:
+        """Publish a message on a Redis pub/sub channel."""
+        try:
+            result = self.redis_client.publish(channel, message)
+            _sampled_debug("Published message on channel '{}' to {} subscribers", channel, result)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to publish message on channel '{channel}': {e}")
+            return 0
+    
     def get_set_members(self, name: str) -> set:
         """Get all members of a set from Redis."""
         try:
             result = self.redis_client.smembers(name)
-            logger.debug(f"Retrieved {len(result)} members from set '{name}' in Redis")
+            _sampled_debug("Retrieved {} members from set '{}' in Redis", len(result), name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to get members from set '{name}' in Redis: {e}")
+            return set()
+
+
+class RedisPipeline:
+    """Commands queued on a Redis pipeline, mirroring the RedisClient methods.
+    
+    Commands are only sent when the owning ``pipeline()`` block exits, so
+    the queueing methods return nothing; ``results`` then holds the reply
+    of every queued command in order.
+    """
+    
+    def __init__(self, pipe):
+        """Wrap a redis-py pipeline."""
+        self.pipe = pipe
+        self.results: List[Any] = []
+    
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        """Queue setting a key-value pair."""
+        self.pipe.set(key, RedisClient._serialize(value), ex=expire)
+    
+    def delete(self, *keys: str):
+        """Queue deleting keys."""
+        self.pipe.delete(*keys)
+    
+    def expire(self, key: str, seconds: int):
+        """Queue setting a time-to-live on a key."""
+        self.pipe.expire(key, seconds)
+    
+    def set_hash(self, name: str, mapping: dict):
+        """Queue setting hash fields."""
+        self.pipe.hset(name, mapping=mapping)
+    
+    def get_hash(self, name: str):
+        """Queue reading a hash."""
+        self.pipe.hgetall(name)
+    
+    def add_to_set(self, name: str, *values):
+        """Queue adding values to a set."""
+        self.pipe.sadd(name, *values)
+    
+    def remove_from_set(self, name: str, *values):
+        """Queue removing values from a set."""
+        self.pipe.srem(name, *values)
+    
+    def count_set_members(self, name: str):
+        """Queue counting the members of a set."""
+        self.pipe.scard(name)
+    
+    def publish(self, channel: str, message: str):
+        """Queue publishing a message on a pub/sub channel."""
+        self.pipe.publish(channel, message)
+
+
+class AsyncRedisClient:
+    """Asyncio Redis client wrapper with the same surface as RedisClient.
+    
+    Used from async handlers and jobs so Redis round trips do not block the
+    event loop. Connections come from a shared pool and are opened lazily on
+    the first command.
+    """
+    
+    def __init__(self):
+        """Create the client; the connection pool is created on first use."""
+        self.pool = None
+        self._redis = None
+    
+    @property
+    def redis_client(self):
+        """Get the underlying redis-py client, creating the pool on first use."""
+        if self._redis is None:
+            if config.REDIS_BACKEND == "memory":
+                self._redis = InstrumentedRedis(AsyncMemoryRedis(memory_store), is_async=True)
+            else:
+                self.pool = redis.asyncio.ConnectionPool(**_pool_options(redis.asyncio.retry.Retry))
+                self._redis = InstrumentedRedis(redis.asyncio.Redis(connection_pool=self.pool), is_async=True)
+        return self._redis
+    
+    @redis_client.setter
+    def redis_client(self, client):
+        """Replace the underlying redis-py client."""
+        self._redis = client
+    
+    async def connect(self) -> "AsyncRedisClient":
+        """Open the configured backend and check that it responds."""
+        try:
+            await self.redis_client.ping()
+            logger.info("Async Redis connection established successfully")
+            return self
+        except redis.ConnectionError as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
+    
+    def pool_stats(self) -> dict:
+        """Get connection pool metrics."""
+        return _pool_stats(self.pool)
+    
+    async def ping(self) -> bool:
+        """Check that Redis is reachable."""
+        try:
+            return bool(await self.redis_client.ping())
+        except Exception as e:
+            logger.error(f"Failed to ping Redis: {e}")
+            return False
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator["RedisPipeline"]:
+        """Queue commands and execute them in one round trip when the block exits.
+        
+        With ``transaction`` the commands run atomically in MULTI/EXEC. Their
+        results are available in ``results`` after the block.
+        """
+        pipeline = RedisPipeline(self.redis_client.pipeline(transaction=transaction))
+        try:
+            yield pipeline
+            started = time.perf_counter()
+            try:
+                pipeline.results = await pipeline.pipe.execute()
+            except Exception:
+                _observe_command("pipeline", started, "error")
+                raise
+            _observe_command("pipeline", started, "ok")
+            _sampled_debug("Executed pipeline of {} commands in Redis", len(pipeline.results))
+        finally:
+            await pipeline.pipe.reset()
+    
+    async def close(self):
+        """Close all pooled connections."""
+        try:
+            if self.pool is not None:
+                await self.pool.disconnect()
+        except Exception as e:
+            logger.error(f"Failed to close Redis connection pool: {e}")
+    
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Set a key-value pair in Redis."""
+        try:
+            result = await self.redis_client.set(key, RedisClient._serialize(value), ex=expire)
+            _sampled_debug("Set key '{}' in Redis", key)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to set key '{key}' in Redis: {e}")
+            return False
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value from Redis."""
+        try:
+            value = await self.redis_client.get(key)
+            if value:
+                _sampled_debug("Retrieved key '{}' from Redis", key)
+            return value
+        except Exception as e:
+            logger.error(f"Failed to get key '{key}' from Redis: {e}")
+            return None
+    
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Get and parse JSON value from Redis."""
+        return RedisClient._parse_json(key, await self.get(key))
+    
+    async def mget_json(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get and parse several JSON values from Redis in one round trip."""
+        try:
+            values = await self.redis_client.mget(keys)
+            _sampled_debug("Retrieved {} keys from Redis", len(keys))
+            return [RedisClient._parse_json(key, value) for key, value in zip(keys, values)]
+        except Exception as e:
+            logger.error(f"Failed to get keys {keys} from Redis: {e}")
+            return [None] * len(keys)
+    
+    async def mset_json(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """Set several values in Redis atomically in one round trip."""
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, expire=expire)
+            return all(pipe.results)
+        except Exception as e:
+            logger.error(f"Failed to set keys {list(mapping)} in Redis: {e}")
+            return False
+    
+    async def delete(self, key: str) -> bool:
+        """Delete a key from Redis."""
+        try:
+            result = await self.redis_client.delete(key)
+            _sampled_debug("Deleted key '{}' from Redis", key)
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Failed to delete key '{key}' from Redis: {e}")
+            return False
+    
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in Redis."""
+        try:
+            return bool(await self.redis_client.exists(key))
+        except Exception as e:
+            logger.error(f"Failed to check existence of key '{key}' in Redis: {e}")
+            return False
+    
+    async def expire(self, key: str, seconds: int) -> bool:
+        """Set a time-to-live on a key in Redis."""
+        try:
+            result = await self.redis_client.expire(key, seconds)
+            _sampled_debug("Set expiry of {}s on key '{}' in Redis", seconds, key)
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Failed to set expiry on key '{key}' in Redis: {e}")
+            return False
+    
+    async def set_hash(self, name: str, mapping: dict) -> bool:
+        """Set a hash in Redis."""
+        try:
+            result = await self.redis_client.hset(name, mapping=mapping)
+            _sampled_debug("Set hash '{}' in Redis", name)
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Failed to set hash '{name}' in Redis: {e}")
+            return False
+    
+    async def get_hash(self, name: str) -> Optional[dict]:
+        """Get a hash from Redis."""
+        try:
+            result = await self.redis_client.hgetall(name)
+            if result:
+                _sampled_debug("Retrieved hash '{}' from Redis", name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to get hash '{name}' from Redis: {e}")
+            return None
+    
+    async def add_to_set(self, name: str, *values) -> int:
+        """Add values to a set in Redis."""
+        try:
+            result = await self.redis_client.sadd(name, *values)
+            _sampled_debug("Added {} values to set '{}' in Redis", result, name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to add values to set '{name}' in Redis: {e}")
+            return 0
+    
+    async def remove_from_set(self, name: str, *values) -> int:
+        """Remove values from a set in Redis."""
+        try:
+            result = await self.redis_client.srem(name, *values)
+            _sampled_debug("Removed {} values from set '{}' in Redis", result, name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to remove values from set '{name}' in Redis: {e}")
+            return 0
+    
+    async def count_set_members(self, name: str) -> int:
+        """Get the number of members of a set in Redis."""
+        try:
+            return await self.redis_client.scard(name)
+        except Exception as e:
+            logger.error(f"Failed to count members of set '{name}' in Redis: {e}")
+            return 0
+    
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message on a Redis pub/sub channel."""
+        try:
+            result = await self.redis_client.publish(channel, message)
+            _sampled_debug("Published message on channel '{}' to {} subscribers", channel, result)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to publish message on channel '{channel}': {e}")
+            return 0
+    
+    async def get_set_members(self, name: str) -> set:
+        """Get all members of a set from Redis."""
+        try:
+            result = await self.redis_client.smembers(name)
+            _sampled_debug("Retrieved {} members from set '{}' in Redis", len(result), name)
             return result
         except Exception as e:
             logger.error(f"Failed to get members from set '{name}' in Redis: {e}")
             return set()
 
 
-# Global Redis client instance
+# Global Redis client instances
 redis_client = RedisClient()
+async_redis_client = AsyncRedisClient()
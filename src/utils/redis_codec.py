@@ -0,0 +1,133 @@
+"""Serialization codecs for values stored in Redis."""
+
+import base64
+import json
+import zlib
+from typing import Any
+
+from pydantic import BaseModel
+
+from .config import config
+from .logger import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Encoded values are "~mt1:<serializer><compression>:<payload>", with binary
+# payloads base64-encoded because the clients decode responses as text.
+# Uncompressed JSON is stored untagged, which is also how values written
+# before the codec existed look, so both decode the same way.
+PREFIX = "~mt1:"
+SERIALIZER_TAGS = {"json": "j", "orjson": "j", "msgpack": "m"}
+COMPRESSION_TAGS = {"none": "-", "zlib": "z", "zstd": "s"}
+
+
+class RedisCodec:
+    """Encode structured values with a configurable serializer and compression."""
+
+    def __init__(self, serializer: str = "orjson", compression: str = "zlib", threshold: int = 4096):
+        """Select the serializer and compression, falling back when a library is missing."""
+        if serializer not in SERIALIZER_TAGS:
+            raise ValueError(f"Unknown Redis serializer '{serializer}'")
+        if compression not in COMPRESSION_TAGS:
+            raise ValueError(f"Unknown Redis compression '{compression}'")
+
+        if serializer == "orjson" and orjson is None:
+            logger.warning("orjson is not installed, falling back to json serializer")
+            serializer = "json"
+        if serializer == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed, falling back to json serializer")
+            serializer = "json"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, falling back to zlib compression")
+            compression = "zlib"
+
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+
+    def _dumps(self, value: Any) -> bytes:
+        """Serialize a value with the configured serializer."""
+        if self.serializer == "orjson":
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        if self.serializer == "msgpack":
+            return msgpack.packb(value, default=str)
+        return json.dumps(value, default=str).encode('utf-8')
+
+    @staticmethod
+    def _loads(data: Any, serializer_tag: str) -> Any:
+        """Deserialize a payload written with the given serializer tag."""
+        if serializer_tag == "m":
+            if msgpack is None:
+                raise ValueError("msgpack is required to decode this value")
+            return msgpack.unpackb(data, raw=False)
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress a payload with the configured compression."""
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return zlib.compress(data)
+
+    @staticmethod
+    def _decompress(data: bytes, compression_tag: str) -> bytes:
+        """Decompress a payload written with the given compression tag."""
+        if compression_tag == "s":
+            if zstandard is None:
+                raise ValueError("zstandard is required to decode this value")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if compression_tag == "z":
+            return zlib.decompress(data)
+        return data
+
+    def encode(self, value: Any) -> str:
+        """Encode a dict, list or Pydantic model as a Redis string."""
+        if isinstance(value, BaseModel):
+            value = value.model_dump(mode="json")
+
+        data = self._dumps(value)
+        compression = "none"
+        if self.compression != "none" and len(data) >= self.threshold:
+            data = self._compress(data)
+            compression = self.compression
+
+        serializer_tag = SERIALIZER_TAGS[self.serializer]
+        if serializer_tag == "j" and compression == "none":
+            return data.decode('utf-8')
+
+        payload = base64.b64encode(data).decode('ascii')
+        return f"{PREFIX}{serializer_tag}{COMPRESSION_TAGS[compression]}:{payload}"
+
+    def decode(self, value: str) -> Any:
+        """Decode a Redis string written by encode or as plain JSON."""
+        if not value.startswith(PREFIX):
+            return self._loads(value, "j")
+
+        serializer_tag, compression_tag = value[len(PREFIX)], value[len(PREFIX) + 1]
+        if serializer_tag not in SERIALIZER_TAGS.values() or compression_tag not in COMPRESSION_TAGS.values():
+            raise ValueError(f"Unknown Redis value encoding '{value[:len(PREFIX) + 2]}'")
+
+        data = base64.b64decode(value[len(PREFIX) + 3:])
+        return self._loads(self._decompress(data, compression_tag), serializer_tag)
+
+
+# Global codec instance
+redis_codec = RedisCodec(
+    serializer=config.REDIS_SERIALIZER,
+    compression=config.REDIS_COMPRESSION,
+    threshold=config.REDIS_COMPRESSION_THRESHOLD
+)
@@ -0,0 +1,114 @@
+"""Redis key schema: key names, their TTL policy and memory accounting."""
+
+import fnmatch
+import re
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .config import config
+
+DAY = 86400
+
+
+class KeySpec(NamedTuple):
+    """A family of Redis keys sharing a name pattern and a TTL."""
+
+    pattern: str
+    ttl: Optional[int]
+    description: str
+
+    def key(self, **params) -> str:
+        """Format a concrete key name."""
+        return self.pattern.format(**params)
+
+    @property
+    def glob(self) -> str:
+        """Glob pattern matching every key of the family."""
+        return re.sub(r"\{[^}]*\}", "*", self.pattern)
+
+
+SUMMARY = KeySpec("summary:{date}", 30 * DAY, "Daily summary by date (YYYYMMDD)")
+LATEST_SUMMARY = KeySpec("latest_summary", 7 * DAY, "Most recently generated summary")
+SUMMARY_DATES = KeySpec("summaries", None, "Set of dates with a stored summary")
+USER = KeySpec("user:{user_id}", None, "Subscribed user profile")
+SUBSCRIBERS = KeySpec("subscribers", None, "Set of subscribed user ids")
+NEWS_DAY = KeySpec("news:{date}", 7 * DAY, "Hash of one day's news items by message id")
+LATEST_NEWS_TIMESTAMP = KeySpec("latest_news_timestamp", None, "End date of the last dumped batch")
+STATS = KeySpec("stats", None, "Precomputed statistics snapshot")
+LEGACY_ALL_NEWS = KeySpec("all_news", None, "Legacy news blob, no longer written")
+LLM_RESPONSE = KeySpec("llm_response:{digest}", config.LLM_CACHE_TTL, "Cached LLM completion by request hash")
+DUMPER_TIMINGS = KeySpec("timings:dumper", 7 * DAY, "Timing table accumulated by standalone dumper runs")
+DUMPER_METRICS = KeySpec("metrics:dumper", None, "Metric samples accumulated by standalone dumper runs")
+
+KEY_SPECS = (
+    SUMMARY, LATEST_SUMMARY, SUMMARY_DATES, USER, SUBSCRIBERS,
+    NEWS_DAY, LATEST_NEWS_TIMESTAMP, STATS, LEGACY_ALL_NEWS, LLM_RESPONSE,
+    DUMPER_TIMINGS, DUMPER_METRICS
+)
+
+
+def _day(value: Union[date, datetime]) -> str:
+    """Format a date as used in day-based key names."""
+    return value.strftime('%Y%m%d')
+
+
+def summary_key(value: Union[date, datetime]) -> str:
+    """Key of the summary for a date."""
+    return SUMMARY.key(date=_day(value))
+
+
+def news_day_key(value: Union[date, datetime]) -> str:
+    """Key of the news hash for a date."""
+    return NEWS_DAY.key(date=_day(value))
+
+
+def user_key(user_id: Union[int, str]) -> str:
+    """Key of a user's profile."""
+    return USER.key(user_id=user_id)
+
+
+def spec_for(key: str) -> Optional[KeySpec]:
+    """Find the spec a key belongs to."""
+    for spec in KEY_SPECS:
+        if fnmatch.fnmatchcase(key, spec.glob):
+            return spec
+    return None
+
+
+def key_usage_report(client, sample_size: int = 20, apply_ttl: bool = False) -> List[dict]:
+    """Count keys per spec and estimate their memory from sampled MEMORY USAGE.
+
+    ``client`` is a RedisClient. Keys whose spec declares a TTL but that
+    have none are counted as missing it, and get the declared TTL when
+    ``apply_ttl`` is set. Keys matching no spec are reported as unknown.
+    """
+    rows: Dict[str, dict] = {}
+    for key in client.scan_keys():
+        spec = spec_for(key)
+        name = spec.pattern if spec else "(unknown)"
+        row = rows.setdefault(name, {
+            "pattern": name,
+            "ttl": spec.ttl if spec else None,
+            "keys": 0,
+            "sampled": 0,
+            "sampled_bytes": 0,
+            "missing_ttl": 0
+        })
+        row["keys"] += 1
+
+        if row["sampled"] < sample_size:
+            usage = client.memory_usage(key)
+            if usage is not None:
+                row["sampled"] += 1
+                row["sampled_bytes"] += usage
+
+        if spec and spec.ttl and client.ttl(key) == -1:
+            row["missing_ttl"] += 1
+            if apply_ttl:
+                client.expire(key, spec.ttl)
+
+    for row in rows.values():
+        average = row["sampled_bytes"] / row["sampled"] if row["sampled"] else 0
+        row["estimated_bytes"] = int(average * row["keys"])
+
+    return sorted(rows.values(), key=lambda row: row["estimated_bytes"], reverse=True)
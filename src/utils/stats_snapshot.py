@@ -0,0 +1,89 @@
+"""Precomputed statistics snapshot stored in Redis."""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from .logger import logger
+from .redis_client import async_redis_client, redis_client
+from .redis_keys import STATS, SUBSCRIBERS
+
+
+class StatsSnapshot:
+    """Statistics kept in a single Redis hash so they can be read in one round trip.
+
+    The dumper writes news totals and per-day counts after every saved batch.
+    The subscriber count is read from the subscribers set in the same
+    pipelined round trip, so it never drifts from the actual memberships.
+    """
+    
+    KEY = STATS.key()
+    DAY_PREFIX = "day:"
+    SUBSCRIBERS_KEY = SUBSCRIBERS.key()
+    
+    def record_news(
+        self,
+        day_counts: Dict[str, int],
+        total_count: int,
+        last_updated: Optional[datetime],
+        last_news_date: Optional[datetime]
+    ) -> bool:
+        """Store news totals and the item counts of the given days (YYYY-MM-DD)."""
+        mapping = {f"{self.DAY_PREFIX}{day}": count for day, count in day_counts.items()}
+        mapping["total_count"] = total_count
+        if last_updated is not None:
+            mapping["last_updated"] = last_updated.isoformat()
+        if last_news_date is not None:
+            mapping["last_news_date"] = last_news_date.isoformat()
+        return redis_client.set_hash(self.KEY, mapping)
+    
+    def get(self) -> Optional[dict]:
+        """Get the snapshot, or None if it has not been built yet."""
+        try:
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get_hash(self.KEY)
+                pipe.count_set_members(self.SUBSCRIBERS_KEY)
+            return self._parse(*pipe.results)
+        except Exception as e:
+            logger.error(f"Failed to read stats snapshot: {e}")
+            return None
+    
+    async def get_async(self) -> Optional[dict]:
+        """Get the snapshot without blocking the event loop."""
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.get_hash(self.KEY)
+                pipe.count_set_members(self.SUBSCRIBERS_KEY)
+            return self._parse(*pipe.results)
+        except Exception as e:
+            logger.error(f"Failed to read stats snapshot: {e}")
+            return None
+    
+    def _parse(self, data: Optional[dict], subscribers: int) -> Optional[dict]:
+        """Convert the raw Redis hash into the snapshot dictionary."""
+        if not data or "total_count" not in data:
+            return None
+        
+        daily_counts = {
+            field[len(self.DAY_PREFIX):]: int(value)
+            for field, value in data.items()
+            if field.startswith(self.DAY_PREFIX)
+        }
+        last_news_date = data.get("last_news_date")
+        
+        return {
+            "total_count": int(data["total_count"]),
+            "daily_counts": daily_counts,
+            "last_updated": data.get("last_updated"),
+            "last_news_date": datetime.fromisoformat(last_news_date) if last_news_date else None,
+            "subscribers": subscribers
+        }
+    
+    @staticmethod
+    def recent_count(snapshot: dict, days: int = 7) -> int:
+        """Sum the per-day counts of the last ``days`` calendar days, today included."""
+        first_day = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return sum(count for day, count in snapshot["daily_counts"].items() if day >= first_day)
+
+
+# Global stats snapshot instance
+stats_snapshot = StatsSnapshot()
@@ -0,0 +1,135 @@
+"""In-process read-through cache for summaries stored in Redis."""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from ..models.schemas import Summary
+from .config import config
+from .logger import logger
+from .redis_client import async_redis_client, redis_client
+
+
+class SummaryCache:
+    """TTL/LRU cache of decoded summaries keyed by their Redis key.
+
+    Misses are cached too, for a shorter time, so a burst of requests for a
+    summary that does not exist yet does not reach Redis either. Writers
+    publish the keys they changed on CHANNEL; every long-running process
+    runs ``listen()`` to drop those entries.
+    """
+
+    CHANNEL = "summary_cache:invalidate"
+    MISS_TTL = 30
+
+    def __init__(self, max_size: int = 64, ttl: int = 300):
+        """Initialize an empty cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Summary]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so reads started before it are not cached
+        self._generation = 0
+
+    def _lookup(self, key: str) -> Tuple[bool, Optional[Summary]]:
+        """Return whether the key is cached and its summary."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, summary = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, summary
+
+    def _store(self, key: str, summary: Optional[Summary], generation: int):
+        """Cache a summary read from Redis unless it was invalidated meanwhile."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            ttl = self.ttl if summary is not None else min(self.ttl, self.MISS_TTL)
+            self._entries[key] = (time.monotonic() + ttl, summary)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None):
+        """Drop the given keys from this process's cache, or everything if None."""
+        with self._lock:
+            self._generation += 1
+            if keys is None:
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._entries.pop(key, None)
+
+    @classmethod
+    def invalidation_message(cls, keys: Optional[Iterable[str]] = None) -> str:
+        """Build the pub/sub message announcing changed keys (None for all)."""
+        return json.dumps(list(keys) if keys is not None else None)
+
+    def read(self, key: str) -> Optional[Summary]:
+        """Get a summary, reading through to Redis on a miss."""
+        found, summary = self._lookup(key)
+        if found:
+            return summary
+
+        generation = self._generation
+        data = redis_client.get_json(key)
+        summary = Summary(**data) if data else None
+        self._store(key, summary, generation)
+        return summary
+
+    async def read_many_async(self, keys: List[str]) -> List[Optional[Summary]]:
+        """Get several summaries, fetching all misses from Redis in one round trip."""
+        summaries = {}
+        missing = []
+        for key in keys:
+            found, summary = self._lookup(key)
+            if found:
+                summaries[key] = summary
+            else:
+                missing.append(key)
+
+        if missing:
+            generation = self._generation
+            for key, data in zip(missing, await async_redis_client.mget_json(missing)):
+                summaries[key] = Summary(**data) if data else None
+                self._store(key, summaries[key], generation)
+
+        return [summaries[key] for key in keys]
+
+    async def read_async(self, key: str) -> Optional[Summary]:
+        """Get a summary without blocking the event loop."""
+        return (await self.read_many_async([key]))[0]
+
+    async def listen(self):
+        """Apply invalidations published by other processes until cancelled."""
+        while True:
+            pubsub = async_redis_client.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                # Messages may have been missed while unsubscribed
+                self.invalidate()
+                logger.info("Listening for summary cache invalidations")
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message:
+                        self.invalidate(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Summary cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+# Global summary cache instance
+summary_cache = SummaryCache(max_size=config.SUMMARY_CACHE_SIZE, ttl=config.SUMMARY_CACHE_TTL)
@@ -0,0 +1,157 @@
+"""Lightweight wall-time instrumentation for hot-path functions."""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+
+class TimingRegistry:
+    """In-memory call counts, error counts and wall times per instrumented name."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed: float, error: bool = False):
+        """Record one call of ``name`` that took ``elapsed`` seconds."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {"calls": 0, "errors": 0, "total": 0.0, "min": elapsed, "max": elapsed}
+            stats["calls"] += 1
+            stats["errors"] += error
+            stats["total"] += elapsed
+            stats["min"] = min(stats["min"], elapsed)
+            stats["max"] = max(stats["max"], elapsed)
+
+    def snapshot(self) -> List[dict]:
+        """Get one row per name, slowest total first."""
+        with self._lock:
+            rows = [{"name": name, **stats} for name, stats in self._stats.items()]
+        for row in rows:
+            row["avg"] = row["total"] / row["calls"]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def merge(self, rows: List[dict]):
+        """Fold in the rows of another registry's snapshot."""
+        with self._lock:
+            for row in rows:
+                stats = self._stats.get(row["name"])
+                if stats is None:
+                    stats = self._stats[row["name"]] = {"calls": 0, "errors": 0, "total": 0.0, "min": row["min"], "max": row["max"]}
+                stats["calls"] += row["calls"]
+                stats["errors"] += row["errors"]
+                stats["total"] += row["total"]
+                stats["min"] = min(stats["min"], row["min"])
+                stats["max"] = max(stats["max"], row["max"])
+
+    def reset(self):
+        """Forget every recorded call."""
+        with self._lock:
+            self._stats.clear()
+
+
+def merge_snapshots(*snapshots: List[dict]) -> List[dict]:
+    """Combine snapshots from several processes into one table."""
+    registry = TimingRegistry()
+    for rows in snapshots:
+        registry.merge(rows)
+    return registry.snapshot()
+
+
+# Global timing registry instance
+timings = TimingRegistry()
+
+# Error flag of the innermost timed call or block, set by mark_error()
+_call_failed: contextvars.ContextVar = contextvars.ContextVar("timed_call_failed", default=None)
+
+
+def mark_error():
+    """Count the current timed call or block as an error even though it does not raise.
+
+    For instrumented functions that catch their own exceptions and return a
+    fallback value instead.
+    """
+    failed = _call_failed.get()
+    if failed is not None:
+        failed[0] = True
+
+
+class Timed:
+    """Record the wall time of a block or of every call of a sync or async function.
+
+    Usable as ``with Timed("name"):`` or as a decorator; an exception raised
+    inside, or a call to ``mark_error()``, counts as an error. Blocks have no
+    qualified name to fall back on, so the context manager requires an
+    explicit name.
+    """
+
+    def __init__(self, name: Optional[str] = None, registry: Optional[TimingRegistry] = None):
+        """Initialize the timer; decorated functions default to their qualified name."""
+        self.name = name
+        self.registry = registry or timings
+        self._started: List[tuple] = []
+
+    def __enter__(self) -> "Timed":
+        """Start timing the block."""
+        if self.name is None:
+            raise ValueError("Timed needs a name when used as a context manager")
+        failed = [False]
+        self._started.append((time.perf_counter(), failed, _call_failed.set(failed)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        """Record the block's wall time."""
+        started, failed, token = self._started.pop()
+        _call_failed.reset(token)
+        self.registry.record(self.name, time.perf_counter() - started, exc_type is not None or failed[0])
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        """Wrap a function so every call is recorded."""
+        name = self.name or f"{func.__module__}.{func.__qualname__}"
+        registry = self.registry
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                failed = [False]
+                token = _call_failed.set(failed)
+                started = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException:
+                    registry.record(name, time.perf_counter() - started, True)
+                    raise
+                finally:
+                    _call_failed.reset(token)
+                registry.record(name, time.perf_counter() - started, failed[0])
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            failed = [False]
+            token = _call_failed.set(failed)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                registry.record(name, time.perf_counter() - started, True)
+                raise
+            finally:
+                _call_failed.reset(token)
+            registry.record(name, time.perf_counter() - started, failed[0])
+            return result
+        return wrapper
+
+
+def timed(name: Union[str, Callable, None] = None) -> Union[Timed, Callable]:
+    """Time a function or block: ``@timed``, ``@timed("name")`` or ``with timed("name")``."""
+    if callable(name):
+        return Timed()(name)
+    return Timed(name)
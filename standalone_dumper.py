@@ -14,6 +14,10 @@ from src.utils.logger import logger
 from src.dumper.telegram_dumper import TelegramDumper
 from src.llm_module.summarizer import NewsSummarizer
 from src.utils.redis_client import redis_client
+from src.utils.redis_keys import DUMPER_METRICS, DUMPER_TIMINGS, LATEST_SUMMARY, SUMMARY, SUMMARY_DATES, summary_key
+from src.utils.metrics import metrics
+from src.utils.summary_cache import SummaryCache
+from src.utils.timing import merge_snapshots, timings
 
 
 class StandaloneDumper:
@@ -77,15 +81,15 @@ class StandaloneDumper:
         try:
             # Store by date
             date_str = summary.date.strftime('%Y%m%d')
-            redis_key = f"summary:{date_str}"
-            redis_client.set(redis_key, summary.model_dump())
+            redis_key = summary_key(summary.date)
             
-            # Store as latest summary
-            redis_client.set("latest_summary", summary.model_dump())
-            
-            # Store in summaries list
-            summaries_key = "summaries"
-            redis_client.add_to_set(summaries_key, date_str)
+            # Store by date, as latest summary and in the summaries list in one transaction
+            changed_keys = [redis_key, LATEST_SUMMARY.key()]
+            with redis_client.pipeline() as pipe:
+                pipe.set(redis_key, summary, expire=SUMMARY.ttl)
+                pipe.set(LATEST_SUMMARY.key(), summary, expire=LATEST_SUMMARY.ttl)
+                pipe.add_to_set(SUMMARY_DATES.key(), date_str)
+                pipe.publish(SummaryCache.CHANNEL, SummaryCache.invalidation_message(changed_keys))
             
             logger.info(f"Summary stored with key: {redis_key}")
             return True
@@ -94,6 +98,27 @@ class StandaloneDumper:
             logger.error(f"Failed to store summary in Redis: {e}")
             return False
     
+    def store_timings_in_redis(self) -> bool:
+        """Add this run's timings to the table the API server reports at /timings."""
+        try:
+            stored_rows = redis_client.get_json(DUMPER_TIMINGS.key()) or []
+            rows = merge_snapshots(stored_rows, timings.snapshot())
+            return redis_client.set(DUMPER_TIMINGS.key(), rows, expire=DUMPER_TIMINGS.ttl)
+            
+        except Exception as e:
+            logger.error(f"Failed to store timings in Redis: {e}")
+            return False
+    
+    def store_metrics_in_redis(self) -> bool:
+        """Add this run's metric samples to those the API server renders at /metrics."""
+        try:
+            metrics.merge(redis_client.get_json(DUMPER_METRICS.key()) or {})
+            return redis_client.set(DUMPER_METRICS.key(), metrics.export())
+            
+        except Exception as e:
+            logger.error(f"Failed to store metrics in Redis: {e}")
+            return False
+    
     async def run_daily_process(self):
         """Run the complete daily process."""
         try:
@@ -157,6 +182,10 @@ async def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        # Timings and metrics die with this process, so hand them to the server
+        dumper.store_timings_in_redis()
+        dumper.store_metrics_in_redis()
 
 
 if __name__ == "__main__":
@@ -79,7 +79,7 @@ async def test_bot_methods():
         
         # Test get_latest_summary_from_redis
         print("1. Testing get_latest_summary_from_redis...")
-        summary = bot.get_latest_summary_from_redis()
+        summary = await bot.get_latest_summary_from_redis()
         
         if summary:
             print("✅ Bot successfully retrieved latest summary")
@@ -92,7 +92,7 @@ async def test_bot_methods():
             # Test get_summary_for_date_from_redis
             print("2. Testing get_summary_for_date_from_redis...")
             today = datetime.now()
-            summary = bot.get_summary_for_date_from_redis(today)
+            summary = await bot.get_summary_for_date_from_redis(today)
             
             if summary:
                 print("✅ Bot successfully retrieved summary for today")
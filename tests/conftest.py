@@ -1,14 +1,28 @@
 """Pytest configuration and fixtures."""
 
+import os
 import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, MagicMock
 from datetime import datetime
 
+# Run against the in-memory Redis backend so no server is needed
+os.environ["REDIS_BACKEND"] = "memory"
+
 from src.models.schemas import NewsItem, NewsBatch, Summary
 from src.utils.redis_client import RedisClient
 
 
+@pytest.fixture(autouse=True)
+def clean_redis():
+    """Give every test an empty in-memory Redis and summary cache."""
+    from src.utils.memory_redis import memory_store
+    from src.utils.summary_cache import summary_cache
+    memory_store.flushall()
+    summary_cache.invalidate()
+    yield
+
+
 @pytest.fixture
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -60,11 +74,16 @@ def mock_redis_client():
     mock_client.get_json = Mock(return_value=None)
     mock_client.delete = Mock(return_value=True)
     mock_client.exists = Mock(return_value=False)
+    mock_client.expire = Mock(return_value=True)
     mock_client.set_hash = Mock(return_value=True)
     mock_client.get_hash = Mock(return_value={})
     mock_client.add_to_set = Mock(return_value=1)
     mock_client.get_set_members = Mock(return_value=set())
+    mock_client.remove_from_set = Mock(return_value=1)
+    mock_client.count_set_members = Mock(return_value=0)
     mock_client.ping = Mock()
+    mock_client.pipeline = MagicMock()
+    mock_client.pipeline.return_value.__enter__.return_value.results = []
     return mock_client
 
 
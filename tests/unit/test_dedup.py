@@ -0,0 +1,61 @@
+"""Unit tests for near-duplicate collapsing."""
+
+from datetime import datetime, timedelta
+
+from src.llm_module.dedup import NearDuplicateCollapser, hamming_distance, simhash
+from src.models.schemas import NewsItem
+
+
+def make_item(message_id: int, text: str, minutes: int, views: int = None, forwards: int = None) -> NewsItem:
+    """Create a news item posted some minutes into the day."""
+    date = datetime(2024, 1, 15, 9) + timedelta(minutes=minutes)
+    return NewsItem(message_id=message_id, text=text, date=date, views=views, forwards=forwards)
+
+
+class TestNearDuplicates:
+    """Test cases for SimHash clustering and merging."""
+
+    def test_corrected_figure_keeps_fingerprint_close(self):
+        """Test that a correction lands near the original and unrelated news far away."""
+        original = simhash("ИНФЛЯЦИЯ CPI В США: 3,1% г/г (прогноз 3,2%)")
+        correction = simhash("ИНФЛЯЦИЯ CPI В США: 3,2% г/г (прогноз 3,2%) — ИСПРАВЛЕНО")
+        unrelated = simhash("Трамп пригрозил ввести пошлины на импорт из Китая в 60%")
+
+        assert hamming_distance(original, correction) <= 8
+        assert hamming_distance(original, unrelated) > 8
+
+    def test_collapse_merges_cluster_into_latest(self):
+        """Test that a cluster keeps its latest text and sums its engagement."""
+        items = [
+            make_item(1, "ФРС сохранила ставку на уровне 5,25-5,5%, как и ожидалось рынком", 0, views=100, forwards=2),
+            make_item(2, "Трамп пригрозил ввести пошлины на импорт из Китая в 60%", 5, views=300),
+            make_item(3, "ФРС сохранила ставку на уровне 5,25-5,50% — как и ожидалось", 10, views=50, forwards=1),
+        ]
+        collapsed = NearDuplicateCollapser().collapse(items)
+
+        assert [item.message_id for item in collapsed] == [2, 3]
+        assert collapsed[1].views == 150
+        assert collapsed[1].forwards == 3
+
+    def test_templated_releases_for_different_countries_stay_separate(self):
+        """Test that releases sharing a template but not a country are not collapsed."""
+        items = [
+            make_item(1, "Розничные продажи в США: +0,6% м/м (прогноз +0,3%)", 0),
+            make_item(2, "Розничные продажи в Канаде: -0,2% м/м (прогноз +0,1%)", 1),
+            make_item(3, "PMI в производственном секторе Германии: 45,4 (прогноз 44,0)", 2),
+            make_item(4, "PMI в производственном секторе Франции: 42,1 (прогноз 43,0)", 3),
+        ]
+        assert [item.message_id for item in NearDuplicateCollapser().collapse(items)] == [1, 2, 3, 4]
+
+    def test_correction_is_collapsed(self):
+        """Test that a correction with new figures and an added word joins the original."""
+        items = [
+            make_item(1, "ИНФЛЯЦИЯ CPI В США: 3,1% г/г (прогноз 3,2%)", 0),
+            make_item(2, "ИНФЛЯЦИЯ CPI В США: 3,2% г/г (прогноз 3,2%) — ИСПРАВЛЕНО", 4),
+        ]
+        assert [item.message_id for item in NearDuplicateCollapser().collapse(items)] == [2]
+
+    def test_short_posts_are_not_clustered(self):
+        """Test that posts too short to fingerprint stay separate."""
+        items = [make_item(1, "Ого!", 0), make_item(2, "Ого!", 1)]
+        assert len(NearDuplicateCollapser().collapse(items)) == 2
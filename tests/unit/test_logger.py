@@ -0,0 +1,48 @@
+"""Unit tests for logging configuration helpers."""
+
+import pytest
+from unittest.mock import patch
+
+from src.utils.logger import LogSampler, _sink_options, level_enabled, parse_module_levels
+
+
+class TestLogger:
+    """Test cases for log sampling and per-module levels."""
+
+    def test_sampler_keeps_one_in_rate(self):
+        """Test that a sampler lets through one line per rate."""
+        sampler = LogSampler(10)
+        assert sum(sampler.sample() for _ in range(100)) == 10
+
+    def test_sampler_rate_one_keeps_all(self):
+        """Test that a rate of 1 or less disables sampling."""
+        assert all(LogSampler(0).sample() for _ in range(5))
+
+    def test_parse_module_levels(self):
+        """Test parsing of per-module level overrides."""
+        levels = parse_module_levels("src.utils.redis_client=info, src.dumper=DEBUG,")
+        assert levels == {"src.utils.redis_client": "INFO", "src.dumper": "DEBUG"}
+
+        with pytest.raises(ValueError):
+            parse_module_levels("src.dumper")
+
+    def test_sink_options_allow_module_overrides(self):
+        """Test that module overrides below the sink level still get through."""
+        options = _sink_options("INFO", {"src.dumper": "DEBUG"})
+        assert options["level"] == "DEBUG"
+        assert options["filter"] == {"": "INFO", "src.dumper": "DEBUG"}
+
+    def test_level_enabled_uses_module_overrides(self):
+        """Test that the longest matching module override decides the level."""
+        with patch('src.utils.logger.config') as config:
+            config.LOG_LEVEL = "INFO"
+            config.LOG_FILE_LEVEL = "INFO"
+            config.LOG_MODULE_LEVELS = "src.utils=DEBUG,src.utils.redis_client=WARNING"
+
+            assert level_enabled("DEBUG", "src.utils.timing")
+            assert not level_enabled("DEBUG", "src.utils.redis_client")
+            assert not level_enabled("DEBUG", "src.dumper")
+            assert level_enabled("INFO", "src.dumper")
+
+            config.LOG_FILE_LEVEL = "DEBUG"
+            assert level_enabled("DEBUG", "src.dumper")
@@ -0,0 +1,76 @@
+"""Unit tests for the metrics registry."""
+
+import pytest
+
+from src.utils.metrics import MetricsRegistry
+
+
+class TestMetrics:
+    """Test cases for counters, histograms and rendering."""
+
+    def test_counter_render(self):
+        """Test that counters accumulate per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("pushes_total", "Pushes", ("status",))
+        counter.inc(status="success")
+        counter.inc(2, status="success")
+        counter.inc(status="failure")
+
+        assert counter.value(status="success") == 3
+        output = registry.render()
+        assert "# TYPE pushes_total counter" in output
+        assert 'pushes_total{status="success"} 3' in output
+        assert 'pushes_total{status="failure"} 1' in output
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, sum and count lines of a histogram."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.1, route="/a")
+        histogram.observe(5, route="/a")
+
+        output = registry.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in output
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in output
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+        assert 'latency_seconds_count{route="/a"} 3' in output
+        assert histogram.count(route="/a") == 3
+
+    def test_labels_must_match(self):
+        """Test that wrong labels and duplicate names are rejected."""
+        registry = MetricsRegistry()
+        counter = registry.counter("calls_total", "Calls", ("command",))
+
+        with pytest.raises(ValueError):
+            counter.inc(status="ok")
+        with pytest.raises(ValueError):
+            registry.counter("calls_total", "Calls")
+
+    def test_redis_commands_are_recorded(self):
+        """Test that commands through RedisClient are counted."""
+        from src.utils.metrics import REDIS_COMMANDS
+        from src.utils.redis_client import RedisClient
+
+        before = REDIS_COMMANDS.value(command="set", status="ok")
+        RedisClient().set("metrics:test", "1")
+        assert REDIS_COMMANDS.value(command="set", status="ok") == before + 1
+
+    def test_render_merges_exported_samples(self):
+        """Test that samples exported by another process are added at render time."""
+        dumper = MetricsRegistry()
+        dumper.counter("messages_total", "Messages").inc(5)
+        dumper.histogram("fetch_seconds", "Fetch", ("status",), buckets=(1.0,)).observe(0.5, status="ok")
+
+        server = MetricsRegistry()
+        counter = server.counter("messages_total", "Messages")
+        counter.inc(2)
+        server.histogram("fetch_seconds", "Fetch", ("status",), buckets=(1.0,))
+
+        output = server.render(dumper.export())
+        assert "messages_total 7" in output
+        assert 'fetch_seconds_bucket{status="ok",le="1"} 1' in output
+        assert 'fetch_seconds_count{status="ok"} 1' in output
+        # Rendering does not change the server's own samples
+        assert counter.value() == 2
+        assert "messages_total 2" in server.render()
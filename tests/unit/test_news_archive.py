@@ -0,0 +1,49 @@
+"""Unit tests for the columnar news archive format."""
+
+import pytest
+
+from src.dumper.news_archive import DayArchive
+
+
+class TestDayArchive:
+    """Test cases for DayArchive."""
+
+    @pytest.fixture
+    def records(self):
+        """Create stored records with mixed timezones and missing metadata."""
+        return [
+            {"message_id": 10, "text": "Нефть дорожает", "date": "2024-01-15 09:00:00+00:00",
+             "views": 100, "forwards": None},
+            {"message_id": 11, "text": "", "date": "2024-01-15 12:30:00+03:00",
+             "views": None, "forwards": 0},
+            {"message_id": 12, "text": "ФРС сохранила ставку", "date": "2024-01-15 18:00:00",
+             "views": 300, "forwards": 7}
+        ]
+
+    @pytest.fixture
+    def archive_path(self, tmp_path, records):
+        """Write the records to an archive file."""
+        path = str(tmp_path / "2024-01-15.mtna")
+        DayArchive.write(path, records)
+        return path
+
+    def test_roundtrip(self, archive_path, records):
+        """Test that every record decodes exactly as written."""
+        with DayArchive(archive_path) as archive:
+            assert archive.count == 3
+            assert archive.read() == records
+
+    def test_read_slice(self, archive_path, records):
+        """Test decoding a slice of rows from the middle of the day."""
+        with DayArchive(archive_path) as archive:
+            assert archive.read(1, 3) == records[1:3]
+            assert archive.read(2, 10) == records[2:]
+            assert archive.read(3) == []
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that files without the archive header are refused."""
+        path = tmp_path / "bogus.mtna"
+        path.write_bytes(b"x" * 64)
+
+        with pytest.raises(ValueError):
+            DayArchive(str(path))
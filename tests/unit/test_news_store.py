@@ -0,0 +1,244 @@
+"""Unit tests for the segmented news store."""
+
+import json
+import os
+import pytest
+from datetime import datetime, timezone
+
+from src.dumper.news_store import NewsRecord, NewsStore
+from src.models.schemas import NewsItem
+
+
+class TestNewsStore:
+    """Test cases for NewsStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store in a temporary directory."""
+        return NewsStore(str(tmp_path / "news"))
+
+    @pytest.fixture
+    def sample_items(self):
+        """Create news items spread over two days."""
+        return [
+            NewsItem(
+                message_id=1,
+                text="Oil jumps 3%",
+                date=datetime(2024, 1, 15, 9, 0, tzinfo=timezone.utc),
+                views=100
+            ),
+            NewsItem(
+                message_id=2,
+                text="Fed keeps rates unchanged",
+                date=datetime(2024, 1, 15, 18, 0, tzinfo=timezone.utc),
+                views=200
+            ),
+            NewsItem(
+                message_id=3,
+                text="Asian markets open higher",
+                date=datetime(2024, 1, 16, 1, 0, tzinfo=timezone.utc)
+            )
+        ]
+
+    def test_append_partitions_by_day(self, store, sample_items):
+        """Test that items are written to per-day segments."""
+        written = store.append(sample_items, last_updated=datetime(2024, 1, 16))
+
+        assert written == 3
+        assert store.count() == 3
+        assert store.days() == ["2024-01-15", "2024-01-16"]
+        assert [r["message_id"] for r in store.read_day("2024-01-15")] == [1, 2]
+        assert store.last_updated == "2024-01-16T00:00:00"
+
+    def test_append_skips_duplicates(self, store, sample_items):
+        """Test that re-appending known messages writes nothing."""
+        store.append(sample_items)
+        written = store.append(sample_items + sample_items[:1])
+
+        assert written == 0
+        assert store.count() == 3
+        assert len(store.read_day("2024-01-15")) == 2
+
+    def test_manifest_survives_reopen(self, store, sample_items):
+        """Test that a reopened store sees previously written data."""
+        store.append(sample_items)
+
+        reopened = NewsStore(store.root_dir)
+        assert reopened.count() == 3
+        assert [r["message_id"] for r in reopened.iter_records()] == [1, 2, 3]
+
+    def test_read_day_with_limit(self, store, sample_items):
+        """Test that a limited read returns only the first records of a day."""
+        store.append(sample_items)
+
+        assert [r["message_id"] for r in store.read_day("2024-01-15", limit=1)] == [1]
+        assert store.count_day("2024-01-15") == 2
+        assert store.count_day("2024-01-01") == 0
+
+    def test_index_rebuilt_when_missing(self, store, sample_items):
+        """Test that a segment without an offset index is reindexed on read."""
+        store.append(sample_items)
+        os.remove(store._index_path("2024-01-15"))
+
+        assert [r["message_id"] for r in store.read_day("2024-01-15")] == [1, 2]
+        assert os.path.exists(store._index_path("2024-01-15"))
+
+    def test_message_ids_persisted(self, store, sample_items):
+        """Test that stored message ids survive a reopen and dedup new batches."""
+        store.append(sample_items[:2])
+
+        reopened = NewsStore(store.root_dir)
+        assert reopened.contains(1)
+        assert not reopened.contains(3)
+        assert reopened.append(sample_items) == 1
+
+    def test_watermark_tracks_highest_id(self, store, sample_items):
+        """Test that the watermark is the highest stored message id."""
+        assert store.watermark is None
+
+        store.append([sample_items[2], sample_items[0]])
+        assert store.watermark == 3
+
+        store.append(sample_items)
+        assert NewsStore(store.root_dir).watermark == 3
+
+    def test_message_ids_rebuilt_when_missing(self, store, sample_items):
+        """Test that the id index is rebuilt for stores written without it."""
+        store.append(sample_items)
+        os.remove(store.message_ids.path)
+
+        reopened = NewsStore(store.root_dir)
+        assert len(reopened.message_ids) == 3
+        assert reopened.contains(2)
+
+    def test_iter_day_as_records(self, store, sample_items):
+        """Test streaming a day as lightweight records."""
+        store.append(sample_items)
+
+        records = [NewsRecord.from_dict(data) for data in store.iter_day("2024-01-15")]
+        assert [r.message_id for r in records] == [1, 2]
+        assert records[1].date == sample_items[1].date
+        assert records[1].views == 200
+        assert list(store.iter_day("2024-01-01")) == []
+
+    def test_archive_day_roundtrip(self, store, sample_items):
+        """Test that archived days read back exactly like live segments."""
+        store.append(sample_items)
+        live_records = store.read_day("2024-01-15")
+
+        assert store.archive_days_before("2024-01-16") == 1
+        assert store.is_archived("2024-01-15")
+        assert not os.path.exists(store._segment_path("2024-01-15"))
+        assert store.read_day("2024-01-15") == live_records
+        assert store.read_day("2024-01-15", limit=1) == live_records[:1]
+        assert NewsStore(store.root_dir).read_day("2024-01-15") == live_records
+
+    def test_append_to_archived_day(self, store, sample_items):
+        """Test that late messages for an archived day are merged into its archive."""
+        store.append(sample_items[:1])
+        store.archive_day("2024-01-15")
+
+        assert store.append(sample_items) == 2
+        assert [r["message_id"] for r in store.read_day("2024-01-15")] == [1, 2]
+        assert store.count_day("2024-01-15") == 2
+
+    def test_interrupted_append_is_replayed(self, store, sample_items):
+        """Test that a batch interrupted mid-write is rolled back and re-applied."""
+        store.append(sample_items[:1])
+
+        # Simulate a crash after the batch was logged and partially written
+        batch = sample_items[1:]
+        store._write_pending_batch(batch, {"2024-01-15": batch[:1], "2024-01-16": batch[1:]}, None)
+        with open(store._segment_path("2024-01-15"), 'ab') as f:
+            f.write(b'{"message_id": 2, "te')
+        store.message_ids.add_many([2])
+
+        reopened = NewsStore(store.root_dir)
+
+        assert not os.path.exists(reopened.pending_file)
+        assert reopened.count() == 3
+        assert [r["message_id"] for r in reopened.iter_records()] == [1, 2, 3]
+        assert len(reopened.message_ids) == 3
+
+    def test_replay_after_manifest_saved(self, store, sample_items, monkeypatch):
+        """Test that a batch interrupted after its manifest save is not counted twice."""
+        store.append(sample_items[:1])
+
+        # Simulate a crash between saving the manifest and removing the log
+        real_remove = os.remove
+        def crash_on_log_removal(path):
+            if path == store.pending_file:
+                raise OSError("crashed")
+            real_remove(path)
+        monkeypatch.setattr(os, "remove", crash_on_log_removal)
+        with pytest.raises(OSError):
+            store.append(sample_items)
+        monkeypatch.setattr(os, "remove", real_remove)
+
+        reopened = NewsStore(store.root_dir)
+
+        assert not os.path.exists(reopened.pending_file)
+        assert reopened.count() == 3
+        assert reopened.count_day("2024-01-15") == 2
+        assert reopened.count_day("2024-01-16") == 1
+        assert [r["message_id"] for r in reopened.iter_records()] == [1, 2, 3]
+
+    def test_store_opened_mid_append_does_not_replay(self, store, sample_items, monkeypatch):
+        """Test that a batch another store is still writing is left to its writer."""
+        from src.dumper import news_store
+
+        store.append(sample_items[:1])
+        opened = []
+        real_append_synced = news_store.append_synced
+        def open_second_store(path, data):
+            if not opened:
+                opened.append(NewsStore(store.root_dir))
+            real_append_synced(path, data)
+        monkeypatch.setattr(news_store, "append_synced", open_second_store)
+
+        assert store.append(sample_items) == 2
+
+        assert opened[0].count() == 1
+        reopened = NewsStore(store.root_dir)
+        assert reopened.count() == 3
+        assert [r["message_id"] for r in reopened.iter_records()] == [1, 2, 3]
+        assert not os.path.exists(store.pending_file)
+
+    def test_stale_store_catches_up_before_writing(self, store, sample_items):
+        """Test that a store opened before another's write does not overwrite its counts."""
+        stale = NewsStore(store.root_dir)
+        store.append(sample_items[:2])
+
+        assert stale.append(sample_items) == 1
+        assert stale.count() == 3
+        assert NewsStore(store.root_dir).count_day("2024-01-15") == 2
+
+    def test_no_temp_files_left_behind(self, store, sample_items):
+        """Test that atomic writes leave only the final files in place."""
+        store.append(sample_items)
+        store.archive_day("2024-01-15")
+
+        leftovers = [name for _, _, files in os.walk(store.root_dir) for name in files if name.endswith(".tmp")]
+        assert leftovers == []
+        assert not os.path.exists(store.pending_file)
+
+    def test_read_unknown_day(self, store):
+        """Test reading a day without data."""
+        assert store.read_day("2024-01-01") == []
+
+    def test_migrate_legacy_file(self, store, sample_items, tmp_path):
+        """Test one-shot migration from the legacy all_news.json file."""
+        legacy_file = tmp_path / "all_news.json"
+        legacy_file.write_text(json.dumps({
+            "news_items": [item.model_dump() for item in sample_items],
+            "last_updated": "2024-01-16T12:00:00",
+            "total_count": 3
+        }, default=str))
+
+        migrated = store.migrate_legacy_file(str(legacy_file))
+
+        assert migrated == 3
+        assert store.count() == 3
+        assert not legacy_file.exists()
+        assert os.path.exists(str(legacy_file) + ".migrated")
+        assert store.migrate_legacy_file(str(legacy_file)) == 0
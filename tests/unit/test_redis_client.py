@@ -0,0 +1,104 @@
+"""Unit tests for the Redis client wrappers."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.utils.config import config
+from src.utils.redis_client import AsyncRedisClient, RedisClient
+
+
+class TestAsyncRedisClient:
+    """Test cases for AsyncRedisClient."""
+
+    @pytest.fixture
+    def client(self):
+        """Create an async client with a mocked connection."""
+        client = AsyncRedisClient()
+        client.redis_client = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_set_serializes_json(self, client):
+        """Test that dictionaries are stored as JSON."""
+        client.redis_client.set.return_value = True
+
+        assert await client.set("key", {"a": 1}, expire=60) is True
+        key, value = client.redis_client.set.await_args.args
+        assert key == "key"
+        assert json.loads(value) == {"a": 1}
+        assert client.redis_client.set.await_args.kwargs == {"ex": 60}
+
+    @pytest.mark.asyncio
+    async def test_get_json(self, client):
+        """Test that JSON values are parsed."""
+        client.redis_client.get.return_value = '{"a": 1}'
+
+        assert await client.get_json("key") == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_errors_return_defaults(self, client):
+        """Test that Redis failures are logged and mapped to empty results."""
+        client.redis_client.smembers.side_effect = ConnectionError("down")
+        client.redis_client.ping.side_effect = ConnectionError("down")
+
+        assert await client.get_set_members("subscribers") == set()
+        assert await client.ping() is False
+
+    def test_pool_uses_config(self):
+        """Test that the pool is created lazily, sized from Config."""
+        with patch.object(config, "REDIS_BACKEND", "redis"):
+            client = AsyncRedisClient()
+            assert client.pool is None
+
+            client.redis_client
+            stats = client.pool_stats()
+
+        assert stats["max_connections"] == config.REDIS_MAX_CONNECTIONS
+        assert stats["in_use_connections"] == 0
+        assert client.pool.connection_kwargs["health_check_interval"] == config.REDIS_HEALTH_CHECK_INTERVAL
+
+    @pytest.mark.asyncio
+    async def test_mget_json(self, client):
+        """Test that several JSON values are read in one command."""
+        client.redis_client.mget.return_value = ['{"a": 1}', None]
+
+        assert await client.mget_json(["one", "two"]) == [{"a": 1}, None]
+        client.redis_client.mget.assert_awaited_once_with(["one", "two"])
+
+
+class TestRedisClient:
+    """Test cases for RedisClient on the in-memory backend."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client; conftest selects the in-memory backend."""
+        return RedisClient()
+
+    def test_connects_lazily(self, client):
+        """Test that creating a client does not open a connection."""
+        assert client._redis is None
+
+        assert client.set("key", {"a": 1}, expire=60)
+        assert client.get_json("key") == {"a": 1}
+        assert client.redis_client.ttl("key") == 60
+
+    def test_pipeline_and_bulk_reads(self, client):
+        """Test pipelined writes and multi-key reads."""
+        with client.pipeline() as pipe:
+            pipe.set("user:1", {"user_id": 1})
+            pipe.add_to_set("subscribers", "1")
+            pipe.count_set_members("subscribers")
+
+        assert pipe.results == [True, 1, 1]
+        assert client.mget_json(["user:1", "user:2"]) == [{"user_id": 1}, None]
+
+    def test_debug_lines_skipped_when_debug_disabled(self, client):
+        """Test that per-command debug lines are neither sampled nor logged below DEBUG."""
+        with patch('src.utils.redis_client._debug_enabled', False), \
+                patch('src.utils.redis_client._debug_sampler') as sampler, \
+                patch('src.utils.redis_client.logger') as logger:
+            client.set("key", "value")
+
+        sampler.sample.assert_not_called()
+        logger.opt.assert_not_called()
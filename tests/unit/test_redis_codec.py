@@ -0,0 +1,50 @@
+"""Unit tests for the Redis value codec."""
+
+import json
+import pytest
+from datetime import date
+
+from src.models.schemas import Summary
+from src.utils.redis_codec import PREFIX, RedisCodec
+
+
+class TestRedisCodec:
+    """Test cases for RedisCodec."""
+
+    @pytest.fixture
+    def codec(self):
+        """Create a codec with a small compression threshold."""
+        return RedisCodec(serializer="orjson", compression="zlib", threshold=256)
+
+    def test_small_values_stay_plain_json(self, codec):
+        """Test that small values are stored as untagged JSON."""
+        encoded = codec.encode({"a": 1})
+
+        assert json.loads(encoded) == {"a": 1}
+        assert codec.decode(encoded) == {"a": 1}
+
+    def test_large_values_are_compressed(self, codec):
+        """Test that values above the threshold are compressed and tagged."""
+        value = {"items": ["market news"] * 200}
+        encoded = codec.encode(value)
+
+        assert encoded.startswith(f"{PREFIX}jz:")
+        assert len(encoded) < len(json.dumps(value))
+        assert codec.decode(encoded) == value
+
+    def test_legacy_json_decodes(self, codec):
+        """Test that values written before the codec existed still decode."""
+        legacy = json.dumps({"summary_text": "Old", "date": "2024-01-15"})
+
+        assert codec.decode(legacy)["summary_text"] == "Old"
+
+    def test_encode_model(self, codec):
+        """Test that Pydantic models are stored without a manual model_dump."""
+        summary = Summary(date=date(2024, 1, 15), summary_text="Test", news_count=1)
+
+        assert Summary(**codec.decode(codec.encode(summary))) == summary
+
+    def test_unknown_encoding_rejected(self, codec):
+        """Test that values with an unknown tag are not silently misread."""
+        with pytest.raises(ValueError):
+            codec.decode(f"{PREFIX}xx:abc")
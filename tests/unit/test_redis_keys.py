@@ -0,0 +1,38 @@
+"""Unit tests for the Redis key schema."""
+
+from datetime import datetime
+
+from src.utils import redis_keys
+from src.utils.redis_client import RedisClient
+
+
+class TestRedisKeys:
+    """Test cases for the key schema and usage report."""
+
+    def test_key_helpers(self):
+        """Test that keys are formatted from their specs."""
+        day = datetime(2024, 1, 15, 18, 30)
+
+        assert redis_keys.summary_key(day) == "summary:20240115"
+        assert redis_keys.news_day_key(day.date()) == "news:20240115"
+        assert redis_keys.user_key(42) == "user:42"
+        assert redis_keys.SUMMARY.glob == "summary:*"
+        assert redis_keys.spec_for("summary:20240115") is redis_keys.SUMMARY
+        assert redis_keys.spec_for("something:else") is None
+
+    def test_key_usage_report(self):
+        """Test per-pattern counts, memory estimates and TTL policy checks."""
+        client = RedisClient()
+        client.set(redis_keys.summary_key(datetime(2024, 1, 15)), {"summary_text": "a"})
+        client.set(redis_keys.summary_key(datetime(2024, 1, 16)), {"summary_text": "b"}, expire=60)
+        client.add_to_set(redis_keys.SUBSCRIBERS.key(), "1", "2")
+        client.set("orphan", "x")
+
+        rows = {row["pattern"]: row for row in redis_keys.key_usage_report(client, apply_ttl=True)}
+
+        assert rows["summary:{date}"]["keys"] == 2
+        assert rows["summary:{date}"]["missing_ttl"] == 1
+        assert rows["summary:{date}"]["estimated_bytes"] > 0
+        assert rows["subscribers"]["missing_ttl"] == 0
+        assert rows["(unknown)"]["keys"] == 1
+        assert client.ttl("summary:20240115") == redis_keys.SUMMARY.ttl
@@ -0,0 +1,50 @@
+"""Unit tests for the relevance pre-filter."""
+
+from datetime import datetime
+
+from src.llm_module.relevance import RelevanceFilter
+from src.models.schemas import NewsItem
+
+
+def make_item(message_id: int, text: str, views: int = None, forwards: int = None) -> NewsItem:
+    """Create a news item for scoring."""
+    return NewsItem(message_id=message_id, text=text, date=datetime.now(), views=views, forwards=forwards)
+
+
+class TestRelevanceFilter:
+    """Test cases for rule and engagement scoring."""
+
+    def test_rules_rank_market_news_above_noise(self):
+        """Test that focus topics score above excluded ones."""
+        relevance = RelevanceFilter()
+
+        assert relevance.rule_score("ФРС сохранила ставку, доходность Treasuries растёт") > 0
+        assert relevance.rule_score("Биткоин обновил максимум на фоне притока в крипто-ETF") < 0
+        assert relevance.rule_score("Реклама. Подписывайтесь на наш канал, промокод внутри") <= -5
+
+    def test_engagement_breaks_ties(self):
+        """Test that more viewed and forwarded posts score higher on equal rules."""
+        items = [
+            make_item(1, "Нефть Brent подорожала на 3% после заседания ОПЕК+", views=1000, forwards=5),
+            make_item(2, "Нефть Brent подорожала на 3% после заседания ОПЕК+", views=50000, forwards=900),
+        ]
+        low, high = RelevanceFilter().score(items)
+        assert high > low
+
+    def test_filter_drops_noise_and_keeps_order(self):
+        """Test that low scores are dropped and kept items stay chronological."""
+        items = [
+            make_item(1, "S&P 500 и Nasdaq закрылись на рекордах после отчётности Nvidia"),
+            make_item(2, "Реклама: лучший криптообменник, промокод BTC2024"),
+            make_item(3, "Инфляция CPI в США замедлилась до 3,1%"),
+        ]
+        kept, scores = RelevanceFilter(min_score=0).filter(items)
+
+        assert [item.message_id for item in kept] == [1, 3]
+        assert len(scores) == 2
+
+    def test_filter_keeps_everything_rather_than_nothing(self):
+        """Test that a day where nothing passes is kept whole."""
+        items = [make_item(1, "лол"), make_item(2, "😂😂😂")]
+        kept, _ = RelevanceFilter(min_score=0).filter(items)
+        assert len(kept) == 2
@@ -0,0 +1,70 @@
+"""Unit tests for the stats snapshot."""
+
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+
+from src.utils.stats_snapshot import StatsSnapshot
+
+
+class TestStatsSnapshot:
+    """Test cases for StatsSnapshot."""
+    
+    @pytest.fixture
+    def snapshot(self, mock_redis_client):
+        """Create a snapshot with a mocked Redis client."""
+        with patch('src.utils.stats_snapshot.redis_client', mock_redis_client):
+            yield StatsSnapshot()
+    
+    def test_record_news(self, snapshot, mock_redis_client):
+        """Test that news totals are written as one hash update."""
+        snapshot.record_news(
+            {"2024-01-15": 2},
+            total_count=10,
+            last_updated=datetime(2024, 1, 16),
+            last_news_date=None
+        )
+        
+        mock_redis_client.set_hash.assert_called_once_with("stats", {
+            "day:2024-01-15": 2,
+            "total_count": 10,
+            "last_updated": "2024-01-16T00:00:00"
+        })
+    
+    def test_get_parses_snapshot(self, snapshot, mock_redis_client):
+        """Test reading a snapshot back from its hash."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        pipe = mock_redis_client.pipeline.return_value.__enter__.return_value
+        pipe.results = [{
+            "total_count": "10",
+            "last_news_date": "2024-01-15T18:00:00+00:00",
+            f"day:{today}": "4",
+            "day:2000-01-01": "6"
+        }, 3]
+        
+        result = snapshot.get()
+        
+        assert result["total_count"] == 10
+        assert result["subscribers"] == 3
+        assert result["last_news_date"].hour == 18
+        assert StatsSnapshot.recent_count(result, days=7) == 4
+        pipe.get_hash.assert_called_once_with("stats")
+        pipe.count_set_members.assert_called_once_with("subscribers")
+    
+    def test_recent_count_covers_calendar_days(self):
+        """Test that a week is today and the six days before it."""
+        now = datetime.now()
+        daily_counts = {
+            (now - timedelta(days=offset)).strftime('%Y-%m-%d'): 1
+            for offset in range(8)
+        }
+        
+        assert StatsSnapshot.recent_count({"daily_counts": daily_counts}, days=7) == 7
+        assert StatsSnapshot.recent_count({"daily_counts": daily_counts}, days=1) == 1
+    
+    def test_get_missing_snapshot(self, snapshot, mock_redis_client):
+        """Test that a snapshot without news totals is reported as missing."""
+        pipe = mock_redis_client.pipeline.return_value.__enter__.return_value
+        pipe.results = [{}, 1]
+        
+        assert snapshot.get() is None
@@ -14,8 +14,9 @@ class TestNewsSummarizer:
     @pytest.fixture
     def summarizer(self, mock_redis_client):
         """Create a summarizer instance with mocked dependencies."""
-        with patch('src.llm_module.summarizer.redis_client', mock_redis_client):
-            return NewsSummarizer()
+        with patch('src.llm_module.summarizer.redis_client', mock_redis_client), \
+                patch('src.utils.summary_cache.redis_client', mock_redis_client):
+            yield NewsSummarizer()
     
     @pytest.fixture
     def sample_news_batch(self):
@@ -86,14 +87,15 @@ class TestNewsSummarizer:
         )
         
         result = summarizer.save_summary(summary)
+        pipe = mock_redis_client.pipeline.return_value.__enter__.return_value
         assert result is True
-        assert mock_redis_client.set.call_count == 2  # summary + latest_summary
+        assert pipe.set.call_count == 2  # summary + latest_summary
     
     def test_get_summary_for_date(self, summarizer, mock_redis_client):
         """Test getting summary for specific date."""
         target_date = datetime.now()
         mock_redis_client.get_json.return_value = {
-            "date": target_date.strftime("%Y-%m-%d"),
+            "date": target_date.isoformat(),
             "summary_text": "Test summary",
             "news_count": 1,
             "key_topics": ["test"],
@@ -107,7 +109,7 @@ class TestNewsSummarizer:
     def test_get_latest_summary(self, summarizer, mock_redis_client):
         """Test getting latest summary."""
         mock_redis_client.get_json.return_value = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "date": datetime.now().isoformat(),
             "summary_text": "Latest summary",
             "news_count": 1,
             "key_topics": ["latest"],
@@ -117,3 +119,104 @@ class TestNewsSummarizer:
         result = summarizer.get_latest_summary()
         assert result is not None
         assert result.summary_text == "Latest summary"
+    
+    @pytest.mark.asyncio
+    async def test_summarize_news_map_reduce(self, summarizer, sample_news_batch, mock_openai_client):
+        """Test that a day over the context budget is condensed chunk by chunk and then merged."""
+        from src.utils.config import config
+        
+        with patch.object(summarizer, 'client', mock_openai_client), \
+                patch.object(summarizer, '_prompt_budget', return_value=25), \
+                patch.object(config, 'SUMMARY_CHUNK_TOKENS', 20), \
+                patch.object(config, 'SUMMARY_MAX_CONCURRENCY', 1):
+            result = await summarizer.summarize_news(sample_news_batch)
+        
+        create = mock_openai_client.chat.completions.create
+        assert result is not None
+        assert result.news_count == 2
+        # One call per news item chunk, then the reduce call
+        assert create.call_count == 3
+        final_prompt = create.call_args.kwargs["messages"][1]["content"]
+        assert "Часть 1" in final_prompt and "Часть 2" in final_prompt
+    
+    def test_day_within_context_is_single_prompt(self, summarizer, sample_news_batch):
+        """Test that a day larger than one chunk but within the context is not map-reduced."""
+        from src.utils.config import config
+        
+        with patch.object(config, 'SUMMARY_CHUNK_TOKENS', 20):
+            plan = summarizer.plan_prompt(sample_news_batch.items, "2024-01-15")
+        
+        assert plan.mode == "single"
+        assert len(plan.chunks[0]) == 2
+    
+    def test_plan_counts_collapsed_items(self, summarizer):
+        """Test that collapsed near-duplicates are reported apart from budget cuts."""
+        items = [
+            NewsItem(message_id=index, text="ФРС сохранила ставку на уровне 5,25-5,5%, как и ожидалось", date=datetime(2024, 1, 15, 9, index))
+            for index in range(11)
+        ]
+        
+        plan = summarizer.plan_prompt(items, "2024-01-15")
+        
+        assert plan.mode == "single"
+        assert len(plan.chunks[0]) == 1
+        assert plan.collapsed_count == 10
+        assert plan.filtered_count == 0
+    
+    @pytest.mark.asyncio
+    async def test_identical_requests_use_response_cache(self, summarizer, sample_news_batch, mock_openai_client):
+        """Test that a repeated summarization over the same news skips OpenAI."""
+        with patch.object(summarizer, 'client', mock_openai_client):
+            first = await summarizer.summarize_news(sample_news_batch)
+            second = await summarizer.summarize_news(sample_news_batch)
+        
+        assert first.summary_text == second.summary_text == "Test summary"
+        assert mock_openai_client.chat.completions.create.call_count == 1
+    
+    def test_reduce_prompt_fits_budget(self, summarizer):
+        """Test that partial summaries that did not shrink are cut to fit the reduce prompt."""
+        from src.llm_module.token_budget import TokenBudgeter
+        
+        template = summarizer._create_reduce_prompt([], "2024-01-15")
+        budgeter = TokenBudgeter("gpt-3.5-turbo", 0, 100)
+        budgeter.context_tokens = budgeter.count(template) + 300
+        partial_summaries = [f"{index}. " + "Рынки растут на ожиданиях снижения ставок. " * 40 for index in range(1, 5)]
+        
+        with patch('src.llm_module.summarizer.token_budgeter', budgeter):
+            prompt = summarizer._fit_reduce_prompt(partial_summaries, "2024-01-15")
+        
+        assert budgeter.count(prompt) <= budgeter.prompt_budget
+        assert all(f"Часть {index}:\n{index}. Рынки" in prompt for index in range(1, 5))
+    
+    @pytest.mark.asyncio
+    async def test_max_tokens_read_at_call_time(self, summarizer, sample_news_batch, mock_openai_client):
+        """Test that the completion limit follows the current config."""
+        from src.utils.config import config
+        
+        with patch.object(summarizer, 'client', mock_openai_client), \
+                patch.object(config, 'SUMMARY_MAX_TOKENS', 123):
+            await summarizer.summarize_news(sample_news_batch)
+        
+        assert mock_openai_client.chat.completions.create.call_args.kwargs["max_tokens"] == 123
+    
+    @pytest.mark.asyncio
+    async def test_refresh_bypasses_response_cache(self, summarizer, sample_news_batch, mock_openai_client):
+        """Test that an explicit regeneration asks the model again and caches the new reply."""
+        with patch.object(summarizer, 'client', mock_openai_client):
+            await summarizer.summarize_news(sample_news_batch)
+            await summarizer.summarize_news(sample_news_batch, refresh=True)
+            await summarizer.summarize_news(sample_news_batch)
+        
+        assert mock_openai_client.chat.completions.create.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_unparsable_reply_not_cached(self, summarizer, sample_news_batch, mock_openai_client):
+        """Test that a final reply that is not JSON is used but not cached."""
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = "Not JSON"
+        
+        with patch.object(summarizer, 'client', mock_openai_client):
+            first = await summarizer.summarize_news(sample_news_batch)
+            await summarizer.summarize_news(sample_news_batch)
+        
+        assert first.summary_text == "Not JSON"
+        assert mock_openai_client.chat.completions.create.call_count == 2
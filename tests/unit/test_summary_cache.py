@@ -0,0 +1,62 @@
+"""Unit tests for the in-process summary cache."""
+
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+
+from src.utils.summary_cache import SummaryCache
+
+
+class TestSummaryCache:
+    """Test cases for SummaryCache."""
+
+    @pytest.fixture
+    def cache(self, mock_redis_client):
+        """Create a cache reading through a mocked Redis client."""
+        with patch('src.utils.summary_cache.redis_client', mock_redis_client):
+            yield SummaryCache(max_size=2, ttl=60)
+
+    @pytest.fixture
+    def summary_data(self):
+        """Create stored summary data."""
+        return {
+            "date": datetime.now().isoformat(),
+            "summary_text": "Cached summary",
+            "news_count": 1,
+            "key_topics": ["test"]
+        }
+
+    def test_read_through_once(self, cache, mock_redis_client, summary_data):
+        """Test that repeated reads are served from memory."""
+        mock_redis_client.get_json.return_value = summary_data
+
+        assert cache.read("latest_summary").summary_text == "Cached summary"
+        assert cache.read("latest_summary").summary_text == "Cached summary"
+        mock_redis_client.get_json.assert_called_once_with("latest_summary")
+
+    def test_misses_are_cached(self, cache, mock_redis_client):
+        """Test that a missing summary is not looked up again immediately."""
+        assert cache.read("summary:20240115") is None
+        assert cache.read("summary:20240115") is None
+        mock_redis_client.get_json.assert_called_once()
+
+    def test_invalidate(self, cache, mock_redis_client, summary_data):
+        """Test that invalidated keys are read from Redis again."""
+        cache.read("latest_summary")
+        mock_redis_client.get_json.return_value = summary_data
+
+        cache.invalidate(["latest_summary"])
+
+        assert cache.read("latest_summary").summary_text == "Cached summary"
+        assert mock_redis_client.get_json.call_count == 2
+
+    def test_lru_eviction(self, cache, mock_redis_client):
+        """Test that the least recently used entry is evicted."""
+        cache.read("summary:1")
+        cache.read("summary:2")
+        cache.read("summary:1")
+        cache.read("summary:3")
+
+        cache.read("summary:1")
+        cache.read("summary:2")
+        assert mock_redis_client.get_json.call_count == 4
@@ -0,0 +1,102 @@
+"""Unit tests for the Telegram dumper's news reads."""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from src.dumper.news_store import NewsStore
+from src.dumper.telegram_dumper import TelegramDumper
+from src.models.schemas import NewsBatch, NewsItem
+from src.utils.redis_client import redis_client
+from src.utils.redis_keys import news_day_key
+from src.utils.stats_snapshot import stats_snapshot
+
+
+class TestTelegramDumper:
+    """Test cases for TelegramDumper reads over the news store and Redis."""
+
+    @pytest.fixture
+    def dumper(self, tmp_path):
+        """Create a dumper over a temporary data directory without a Telegram client."""
+        with patch('src.dumper.telegram_dumper.config.DATA_DIR', str(tmp_path)), \
+                patch('src.dumper.telegram_dumper.TelegramClient', MagicMock()):
+            yield TelegramDumper()
+
+    @pytest.fixture
+    def day(self):
+        """The day the sample news was posted."""
+        return datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+    @pytest.fixture
+    def saved_items(self, dumper, day):
+        """Save a day of news fetched newest first, as Telegram returns it."""
+        items = [
+            NewsItem(message_id=message_id, text=f"News {message_id}", date=day.replace(hour=message_id))
+            for message_id in (12, 11, 10)
+        ]
+        dumper.save_news_batch(NewsBatch(items=items, start_date=day, end_date=day, total_count=len(items)))
+        return items
+
+    def test_limit_picks_same_items_with_and_without_redis(self, dumper, day, saved_items):
+        """Test that reads are in message id order whichever path serves them."""
+        from_redis = dumper.get_news_for_date(day)
+        redis_client.delete(news_day_key(day))
+        from_store = dumper.get_news_for_date(day)
+
+        assert [item.message_id for item in from_redis.items] == [10, 11, 12]
+        assert [item.message_id for item in from_store.items] == [10, 11, 12]
+        assert [item.message_id for item in dumper.get_news_for_date(day, limit=2).items] == [10, 11]
+
+    def test_partial_redis_hash_falls_back_to_store(self, dumper, day, saved_items):
+        """Test that a hash missing items is not taken for the whole day."""
+        redis_client.delete(news_day_key(day))
+        redis_client.set_hash(news_day_key(day), {"10": saved_items[2].model_dump_json()})
+
+        batch = dumper.get_news_for_date(day)
+        assert [item.message_id for item in batch.items] == [10, 11, 12]
+
+    @pytest.fixture
+    def two_days(self, dumper, day):
+        """Save news over two days, each day written out of date order."""
+        items = [
+            NewsItem(message_id=2, text="Fed keeps rates", date=day.replace(hour=18)),
+            NewsItem(message_id=1, text="Oil jumps 3%", date=day.replace(hour=9)),
+            NewsItem(message_id=4, text="Europe opens lower", date=day.replace(day=16, hour=8)),
+            NewsItem(message_id=3, text="Asia opens higher", date=day.replace(day=16, hour=1))
+        ]
+        # Separate appends keep each day's segment in this write order
+        for item in items:
+            dumper.store.append([item])
+        return items
+
+    def test_iter_news_bounds(self, dumper, day, two_days):
+        """Test that since is inclusive and until is exclusive."""
+        since = day.replace(hour=9)
+        until = day.replace(day=16, hour=8)
+
+        assert sorted(item.message_id for item in dumper.iter_news(since=since, until=until)) == [1, 2, 3]
+        assert sorted(record.message_id for record in dumper.iter_news(since=day.replace(day=16), as_tuples=True)) == [3, 4]
+        assert list(dumper.iter_news(until=day)) == []
+
+    def test_count_news(self, dumper, day, two_days):
+        """Test counting the whole store and a date range."""
+        assert dumper.count_news() == 4
+        assert dumper.count_news(since=day.replace(hour=12)) == 3
+        assert dumper.count_news(since=day, until=day.replace(day=16)) == 2
+
+    def test_get_recent_news_is_newest_by_date(self, dumper, two_days):
+        """Test that recent news is the newest posts, not the last ones written."""
+        assert [item.message_id for item in dumper.get_recent_news(3)] == [2, 3, 4]
+        assert [item.message_id for item in dumper.get_recent_news(1)] == [4]
+        assert len(dumper.get_recent_news(10)) == 4
+
+    def test_stats_rebuild_sees_other_writers(self, dumper, day, saved_items):
+        """Test that a dumper opened before another process wrote rebuilds current totals."""
+        # The standalone dumper process writes through its own store
+        NewsStore(dumper.store.root_dir).append([NewsItem(message_id=13, text="News 13", date=day.replace(hour=13))])
+        redis_client.delete(stats_snapshot.KEY)
+
+        assert dumper.refresh_stats_snapshot()
+        snapshot = stats_snapshot.get()
+        assert snapshot["total_count"] == 4
+        assert snapshot["daily_counts"] == {"2024-01-15": 4}
@@ -0,0 +1,103 @@
+"""Unit tests for timing instrumentation."""
+
+import asyncio
+
+import pytest
+
+from src.utils.timing import TimingRegistry, Timed, mark_error, merge_snapshots, timed
+
+
+class TestTiming:
+    """Test cases for the timing decorator, context manager and registry."""
+
+    def test_decorates_sync_and_async_functions(self):
+        """Test that calls and errors are recorded for both kinds of functions."""
+        registry = TimingRegistry()
+
+        @Timed("sync", registry)
+        def add(a, b):
+            return a + b
+
+        @Timed("async", registry)
+        async def fail():
+            raise RuntimeError("boom")
+
+        assert add(1, 2) == 3
+        with pytest.raises(RuntimeError):
+            asyncio.run(fail())
+
+        rows = {row["name"]: row for row in registry.snapshot()}
+        assert rows["sync"]["calls"] == 1 and rows["sync"]["errors"] == 0
+        assert rows["async"]["calls"] == 1 and rows["async"]["errors"] == 1
+
+    def test_context_manager_and_default_name(self):
+        """Test block timing and the qualified-name default of bare @timed."""
+        registry = TimingRegistry()
+        with Timed("block", registry):
+            pass
+        with Timed("block", registry):
+            pass
+
+        row = registry.snapshot()[0]
+        assert row["name"] == "block"
+        assert row["calls"] == 2
+        assert row["min"] <= row["avg"] <= row["max"]
+
+        @timed
+        def helper():
+            return "ok"
+
+        assert helper() == "ok"
+        assert helper.__name__ == "helper"
+
+    def test_mark_error_counts_swallowed_failures(self):
+        """Test that functions returning a fallback value can still count an error."""
+        registry = TimingRegistry()
+
+        @Timed("fetch", registry)
+        async def fetch(fail):
+            try:
+                if fail:
+                    raise ConnectionError("down")
+                return ["message"]
+            except ConnectionError:
+                mark_error()
+                return []
+
+        assert asyncio.run(fetch(True)) == []
+        assert asyncio.run(fetch(False)) == ["message"]
+        with Timed("block", registry):
+            mark_error()
+        mark_error()  # Outside any timed call it does nothing
+
+        rows = {row["name"]: row for row in registry.snapshot()}
+        assert rows["fetch"]["calls"] == 2 and rows["fetch"]["errors"] == 1
+        assert rows["block"]["errors"] == 1
+
+    def test_context_manager_requires_name(self):
+        """Test that an unnamed block is refused instead of recorded under None."""
+        registry = TimingRegistry()
+        with pytest.raises(ValueError):
+            with Timed(registry=registry):
+                pass
+        assert registry.snapshot() == []
+
+    def test_merge_snapshots(self):
+        """Test combining tables recorded by separate processes."""
+        server, dumper = TimingRegistry(), TimingRegistry()
+        server.record("dump_news", 1.0)
+        dumper.record("dump_news", 3.0, error=True)
+        dumper.record("summarize", 2.0)
+
+        rows = {row["name"]: row for row in merge_snapshots(server.snapshot(), dumper.snapshot())}
+        assert rows["dump_news"]["calls"] == 2 and rows["dump_news"]["errors"] == 1
+        assert rows["dump_news"]["min"] == 1.0 and rows["dump_news"]["max"] == 3.0
+        assert rows["dump_news"]["avg"] == 2.0
+        assert rows["summarize"]["calls"] == 1
+
+    def test_reset(self):
+        """Test that reset forgets every name."""
+        registry = TimingRegistry()
+        registry.record("name", 0.1)
+        registry.reset()
+        assert registry.snapshot() == []
@@ -0,0 +1,41 @@
+"""Unit tests for the token budgeter."""
+
+import pytest
+
+from src.llm_module.token_budget import TokenBudgeter, estimate_tokens
+
+
+class TestTokenBudgeter:
+    """Test cases for token counting, packing and chunking."""
+
+    @pytest.fixture
+    def budgeter(self):
+        """Create a budgeter that uses the size-based estimate."""
+        budgeter = TokenBudgeter("gpt-3.5-turbo", context_tokens=1000, reserved_tokens=200)
+        budgeter._encoding = None
+        return budgeter
+
+    def test_estimate_counts_cyrillic_higher(self):
+        """Test that Cyrillic text is estimated at more tokens than ASCII of equal length."""
+        assert estimate_tokens("рынок" * 10) > estimate_tokens("market" * 10)
+
+    def test_prompt_budget(self, budgeter):
+        """Test that the completion is reserved from the context."""
+        assert budgeter.prompt_budget == 800
+
+    def test_pack_prefers_priority_and_keeps_order(self, budgeter):
+        """Test that high-priority items are kept in their original order."""
+        texts = ["a" * 30, "b" * 30, "c" * 30]
+        per_item = budgeter.count(texts[0]) + budgeter.ITEM_OVERHEAD
+
+        packed = budgeter.pack(texts, per_item * 2, priorities=[1, 5, 3])
+        assert packed == ["b" * 30, "c" * 30]
+
+    def test_chunk_splits_and_truncates(self, budgeter):
+        """Test that chunks respect the budget and oversized items are cut."""
+        chunks = budgeter.chunk(["x" * 30, "y" * 30, "z" * 300], 30)
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        for chunk in chunks:
+            assert sum(budgeter.count(text) + budgeter.ITEM_OVERHEAD for text in chunk) <= 30
+        assert chunks[1][0].startswith("z")